@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+DOCX 쓰기 벤치마크
+
+zipfile로 모든 파트를 다시 압축하는 기존 방식과, 압축된 항목을 그대로 복사하고
+치환된 파트만 압축하는 방식(receipt_core.zipcopy)의 영수증 1장당 시간을 비교합니다.
+로고/직인 이미지가 들어간 템플릿을 흉내 내려면 --image-kb로 이미지 파트를 추가합니다.
+
+사용법 (tax_return/ 폴더에서):
+    python benchmarks/bench_docx_write.py                  # 샘플 템플릿, 50장
+    python benchmarks/bench_docx_write.py --image-kb 2048  # 2MB 이미지 추가
+"""
+
+import os
+import sys
+import time
+import zipfile
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from receipt_core.template import CompiledTemplate  # noqa: E402
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SAMPLE_TEMPLATE = os.path.join(PROJECT_DIR, "donation_receipt_template.docx")
+
+
+def legacy_save(template, context, output_path):
+    """이전 CompiledTemplate.save (모든 파트 재압축, 비교용)"""
+    rendered = template.render_parts(context)
+    with zipfile.ZipFile(template.path) as src, zipfile.ZipFile(output_path, "w") as zf:
+        for info in src.infolist():
+            zf.writestr(info, rendered.get(info.filename) or src.read(info.filename))
+
+
+def with_image(template_path, target_path, size_kb):
+    """이미지 파트(압축이 잘 안 되는 바이트)를 추가한 템플릿"""
+    with zipfile.ZipFile(template_path) as src, zipfile.ZipFile(target_path, "w") as dst:
+        for info in src.infolist():
+            dst.writestr(info, src.read(info.filename))
+        dst.writestr("word/media/seal.png", os.urandom(size_kb * 1024), compress_type=zipfile.ZIP_DEFLATED)
+
+
+def per_receipt(save, count, output_path):
+    start = time.perf_counter()
+    for _ in range(count):
+        save(output_path)
+    return (time.perf_counter() - start) / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DOCX 쓰기 벤치마크")
+    parser.add_argument("--count", type=int, default=50, help="영수증 수")
+    parser.add_argument("--image-kb", type=int, default=0, help="추가할 이미지 크기 (KB)")
+    args = parser.parse_args()
+
+    context = {"receipt_no": "26-001", "name": "홍길동", "total": "1,200,000"}
+    context.update({f"month_{i}": "100,000" for i in range(1, 13)})
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        template_path = SAMPLE_TEMPLATE
+        if args.image_kb:
+            template_path = os.path.join(temp_dir, "template.docx")
+            with_image(SAMPLE_TEMPLATE, template_path, args.image_kb)
+
+        template = CompiledTemplate(template_path)
+        output_path = os.path.join(temp_dir, "out.docx")
+        print(f"템플릿: {os.path.getsize(template_path) / 1024:,.0f} KB, 파트 {len(template.entries)}개 "
+              f"(치환 파트 {len(template.parts)}개)")
+
+        new = per_receipt(lambda path: template.save(context, path), args.count, output_path)
+        old = per_receipt(lambda path: legacy_save(template, context, path), args.count, output_path)
+        print(f"  전체 재압축:   {old * 1000:8.1f} ms/장")
+        print(f"  압축 항목 복사: {new * 1000:8.1f} ms/장 ({old / new:.0f}배)")
+
+
+if __name__ == "__main__":
+    main()
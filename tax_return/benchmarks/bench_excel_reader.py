@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Excel 읽기 백엔드 벤치마크
+
+pd.read_excel 기본 설정(전체 컬럼)과 receipt_core.reader의 백엔드별
+필요 컬럼 읽기 시간을 비교합니다. 실제 파일처럼 필요 없는 컬럼(비고 등)을 덧붙여 측정합니다.
+마지막으로 열 단위 캐시(receipt_core.columnar)에서 다시 읽는 시간도 측정합니다.
+
+사용법 (tax_return/ 폴더에서):
+    python benchmarks/bench_excel_reader.py                   # 5만 행
+    python benchmarks/bench_excel_reader.py --rows 200000
+    python benchmarks/bench_excel_reader.py --extra-columns 0  # 필요한 컬럼만 있는 파일
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from receipt_core.dataset import REQUIRED_COLUMNS, DonorDataset  # noqa: E402
+from receipt_core.reader import READERS, read_income_summary, _has_calamine  # noqa: E402
+from synthetic import make_income_summary  # noqa: E402
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Excel 읽기 백엔드 벤치마크")
+    parser.add_argument("--rows", type=int, default=50_000, help="가상 데이터 행 수")
+    parser.add_argument("--extra-columns", type=int, default=6, help="덧붙일 불필요 컬럼 수")
+    args = parser.parse_args()
+
+    raw = make_income_summary(args.rows)
+    for i in range(args.extra_columns):
+        raw[f"비고{i + 1}"] = "메모"
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "2025_income_summary.xlsx")
+        raw.to_excel(path, index=False)
+        print(f"가상 데이터: {args.rows:,}행, 컬럼 {len(raw.columns)}개 "
+              f"({os.path.getsize(path) / (1024 * 1024):.1f} MB)")
+
+        baseline, base_time = timed(pd.read_excel, path)
+        print(f"  pd.read_excel (전체): {base_time:8.2f}초")
+        expected = baseline[REQUIRED_COLUMNS]
+
+        for name in READERS:
+            if name == "calamine" and not _has_calamine():
+                print(f"  {name:<20} 설치 안 됨 (pip install python-calamine)")
+                continue
+            df, elapsed = timed(read_income_summary, path, REQUIRED_COLUMNS, reader=name)
+            pd.testing.assert_frame_equal(df, expected, check_dtype=False)
+            print(f"  {name:<20} {elapsed:8.2f}초 ({base_time / elapsed:.1f}배)")
+
+        # 첫 로드에서 캐시 생성, 두 번째 로드는 캐시에서 읽음
+        first, first_time = timed(lambda: DonorDataset.load(path).df)
+        cached, cached_time = timed(lambda: DonorDataset.load(path).df)
+        pd.testing.assert_frame_equal(cached, first)
+        print(f"  {'load (캐시 생성)':<20} {first_time:8.2f}초")
+        print(f"  {'load (열 단위 캐시)':<20} {cached_time:8.3f}초 ({base_time / cached_time:.0f}배)")
+
+
+if __name__ == "__main__":
+    main()
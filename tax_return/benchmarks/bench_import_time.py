@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+MCP 서버 시작 시간 벤치마크
+
+Claude Desktop은 세션마다 서버 프로세스를 새로 띄우므로, 새 프로세스에서 다음을 측정합니다.
+- import: `import mcp_server.server` 시간과 그때 불러온 무거운 라이브러리
+  (비교용으로 pandas/docxtpl/openpyxl을 먼저 불러오는 예전 방식도 측정)
+- initialize: 서버를 stdio로 실행해 initialize 응답을 받을 때까지의 시간
+- 첫 도구 호출: initialize 직후 list_donation_recipients 응답까지의 시간 (예열 켬/끔)
+
+사용법 (tax_return/ 폴더에서):
+    python benchmarks/bench_import_time.py             # 5회씩 측정, 중앙값
+    python benchmarks/bench_import_time.py --runs 10
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY_MODULES = ("pandas", "numpy", "docxtpl", "openpyxl", "lxml", "jinja2")
+
+IMPORT_SCRIPT = """
+import sys, time, json
+start = time.perf_counter()
+{preload}
+import mcp_server.server
+print(json.dumps({{"seconds": time.perf_counter() - start,
+                  "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def measure_import(preload=""):
+    script = IMPORT_SCRIPT.format(preload=preload, heavy=HEAVY_MODULES)
+    output = subprocess.run([sys.executable, "-c", script], cwd=PROJECT_DIR,
+                            capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def send(process, message):
+    process.stdin.write(json.dumps(message) + "\n")
+    process.stdin.flush()
+
+
+def receive(process, request_id):
+    """응답 id가 request_id인 줄이 올 때까지 읽기 (진행률 알림 등은 건너뜀)"""
+    for line in process.stdout:
+        message = json.loads(line)
+        if message.get("id") == request_id:
+            return message
+    raise RuntimeError("서버가 응답 없이 종료되었습니다")
+
+
+def measure_session(warmup, think_seconds, data_file):
+    """서버 실행 -> initialize -> (대기) -> 첫 도구 호출, 각 구간 시간"""
+    env = dict(os.environ, DATA_DIR=PROJECT_DIR, RECEIPT_WARMUP="1" if warmup else "0")
+    start = time.perf_counter()
+    process = subprocess.Popen([sys.executable, "-m", "mcp_server.server"], cwd=PROJECT_DIR, env=env,
+                               stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                               text=True)
+    try:
+        send(process, {"jsonrpc": "2.0", "id": 1, "method": "initialize", "params": {
+            "protocolVersion": "2025-06-18", "capabilities": {},
+            "clientInfo": {"name": "bench", "version": "0"},
+        }})
+        receive(process, 1)
+        initialized = time.perf_counter() - start
+        send(process, {"jsonrpc": "2.0", "method": "notifications/initialized"})
+
+        # 사용자가 첫 질문을 입력하는 시간
+        time.sleep(think_seconds)
+        call_start = time.perf_counter()
+        send(process, {"jsonrpc": "2.0", "id": 2, "method": "tools/call",
+                       "params": {"name": "list_donation_recipients", "arguments": {"data_file": data_file}}})
+        receive(process, 2)
+        first_call = time.perf_counter() - call_start
+    finally:
+        process.stdin.close()
+        process.wait(timeout=30)
+    return initialized, first_call
+
+
+def median_ms(values):
+    return statistics.median(values) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MCP 서버 시작 시간 벤치마크")
+    parser.add_argument("--runs", type=int, default=5, help="측정 횟수 (중앙값 사용)")
+    parser.add_argument("--think", type=float, default=1.0,
+                        help="initialize 후 첫 도구 호출까지 기다릴 시간 (초)")
+    parser.add_argument("--data-file", default="sample_income_summary.xlsx",
+                        help="첫 도구 호출에 사용할 데이터 파일 (tax_return/ 기준)")
+    args = parser.parse_args()
+
+    lazy = [measure_import() for _ in range(args.runs)]
+    eager = [measure_import("import pandas, docxtpl, openpyxl") for _ in range(args.runs)]
+    print("import mcp_server.server")
+    print(f"  지연 import:     {median_ms([r['seconds'] for r in lazy]):8.0f} ms "
+          f"(불러온 라이브러리: {', '.join(lazy[0]['loaded']) or '없음'})")
+    print(f"  예전 방식 재현:  {median_ms([r['seconds'] for r in eager]):8.0f} ms")
+
+    for warmup in (False, True):
+        sessions = [measure_session(warmup, args.think, args.data_file) for _ in range(args.runs)]
+        print(f"stdio 세션 (예열 {'켬' if warmup else '끔'}, 첫 호출 전 {args.think:g}초 대기)")
+        print(f"  initialize 응답: {median_ms([s[0] for s in sessions]):8.0f} ms")
+        print(f"  첫 도구 호출:    {median_ms([s[1] for s in sessions]):8.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+헌금 데이터 로더 벤치마크
+
+기존 iterrows 방식과 열 단위 로더(receipt_core.dataset)를 비교합니다.
+
+사용법 (tax_return/ 폴더에서):
+    python benchmarks/bench_load_data.py                 # 10만 행, 메모리 내 비교
+    python benchmarks/bench_load_data.py --rows 20000    # 행 수 지정
+    python benchmarks/bench_load_data.py --xlsx          # xlsx 파일 읽기까지 포함
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from receipt_core.dataset import normalize_donors, load_data  # noqa: E402
+from synthetic import make_income_summary  # noqa: E402
+
+
+def legacy_normalize(df):
+    """이전 load_data의 행 단위 처리 (비교용)"""
+    df = df[df["이름"] != "합계"].copy()
+    for col in [f"{i}월" for i in range(1, 13)] + ["연간 총합"]:
+        if col in df.columns:
+            df[col] = df[col].fillna(0).astype(int)
+
+    expanded_rows = []
+    for _, row in df.iterrows():
+        name = row["이름"]
+        if "," in str(name):
+            for individual_name in [n.strip() for n in str(name).split(",")]:
+                new_row = row.copy()
+                new_row["이름"] = individual_name
+                expanded_rows.append(new_row)
+        else:
+            expanded_rows.append(row)
+
+    result_df = pd.DataFrame(expanded_rows)
+    return result_df.sort_values("이름", kind="stable").reset_index(drop=True)
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="헌금 데이터 로더 벤치마크")
+    parser.add_argument("--rows", type=int, default=100_000, help="가상 데이터 행 수")
+    parser.add_argument("--xlsx", action="store_true", help="xlsx 파일 읽기까지 측정")
+    parser.add_argument("--skip-legacy", action="store_true", help="기존 방식 측정 생략")
+    args = parser.parse_args()
+
+    raw = make_income_summary(args.rows)
+    print(f"가상 데이터: {args.rows:,}행")
+
+    new_df, new_time = timed(normalize_donors, raw)
+    print(f"  열 단위 로더:   {new_time:8.3f}초 ({len(new_df):,}명)")
+
+    if not args.skip_legacy:
+        old_df, old_time = timed(legacy_normalize, raw)
+        print(f"  iterrows 방식: {old_time:8.3f}초 ({old_time / new_time:.0f}배)")
+        pd.testing.assert_frame_equal(old_df, new_df, check_dtype=False)
+        print("  결과 동일: OK")
+
+    if args.xlsx:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "2025_income_summary.xlsx")
+            raw.to_excel(path, index=False)
+            _, load_time = timed(load_data, path)
+            print(f"  xlsx 읽기 포함: {load_time:8.3f}초")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+스트리밍 읽기 메모리 벤치마크
+
+DataFrame 로더(load_data)와 스트리밍 리더(receipt_core.stream.iter_donors)의
+최대 메모리 사용량(tracemalloc 기준)을 행 수별로 비교합니다.
+렌더링은 한 명씩 처리되므로 읽기 단계의 메모리가 전체 실행의 최대치를 좌우합니다.
+
+사용법 (tax_return/ 폴더에서):
+    python benchmarks/bench_stream_memory.py                      # 1천/1만/5만 행
+    python benchmarks/bench_stream_memory.py --rows 1000 200000   # 행 수 지정
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from receipt_core.dataset import load_data  # noqa: E402
+from receipt_core.stream import iter_donors  # noqa: E402
+from synthetic import make_income_summary  # noqa: E402
+
+
+def measure(func):
+    tracemalloc.start()
+    start = time.perf_counter()
+    count = func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return count, elapsed, peak / (1024 * 1024)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="스트리밍 읽기 메모리 벤치마크")
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000, 10_000, 50_000],
+                        help="가상 데이터 행 수 (여러 개 지정 가능)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for rows in args.rows:
+            path = os.path.join(temp_dir, f"{rows}_income_summary.xlsx")
+            make_income_summary(rows).to_excel(path, index=False)
+
+            count, df_time, df_peak = measure(lambda: len(load_data(path)))
+            _, stream_time, stream_peak = measure(lambda: sum(1 for _ in iter_donors(path)))
+
+            print(f"{rows:>8,}행 ({count:,}명)")
+            print(f"  DataFrame: {df_peak:8.1f} MB  {df_time:7.2f}초")
+            print(f"  스트리밍:  {stream_peak:8.1f} MB  {stream_time:7.2f}초")
+
+
+if __name__ == "__main__":
+    main()
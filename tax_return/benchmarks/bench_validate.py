@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+데이터 검증 벤치마크
+
+기존 셀/행 단위 반복 검사와 컬럼 단위 검증 규칙(receipt_core.validation)을 비교합니다.
+일부 셀에 문자열, 음수, 틀린 연간 총합을 섞어 경고 메시지까지 같은지 확인합니다.
+
+사용법 (tax_return/ 폴더에서):
+    python benchmarks/bench_validate.py                 # 10만 행
+    python benchmarks/bench_validate.py --rows 20000    # 행 수 지정
+"""
+
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from receipt_core.validation import data_warnings  # noqa: E402
+from synthetic import make_income_summary  # noqa: E402
+
+
+def legacy_warnings(df):
+    """이전 validate_data의 반복 검사 (비교용)"""
+    warnings = []
+    month_cols = [f"{i}월" for i in range(1, 13)] + ["연간 총합"]
+    for col in month_cols:
+        for idx, value in df[col].items():
+            if pd.notna(value) and not isinstance(value, (int, float)):
+                warnings.append(f"행 {idx+2}: '{col}' 컬럼에 숫자가 아닌 값")
+            if isinstance(value, (int, float)) and value < 0:
+                warnings.append(f"행 {idx+2}: '{col}' 컬럼에 음수 값")
+
+    month_only_cols = [f"{i}월" for i in range(1, 13)]
+    for idx, row in df.iterrows():
+        monthly_sum = sum(row[col] if pd.notna(row[col]) and isinstance(row[col], (int, float)) else 0
+                          for col in month_only_cols)
+        annual_total = row["연간 총합"] if pd.notna(row["연간 총합"]) else 0
+        if abs(monthly_sum - annual_total) > 1:
+            warnings.append(f"행 {idx+2}: 월별 합계({int(monthly_sum)})와 연간 총합({int(annual_total)})이 다름")
+
+    all_names = []
+    for name in df["이름"].dropna():
+        if "," in str(name):
+            all_names.extend([n.strip() for n in str(name).split(",")])
+        else:
+            all_names.append(str(name))
+    duplicates = [name for name in set(all_names) if all_names.count(name) > 1]
+    if duplicates:
+        warnings.append(f"중복된 이름 {len(duplicates)}건 (상세 내용은 파일에서 확인)")
+    return warnings
+
+
+def make_dirty(rows, seed=0):
+    """잘못된 값이 섞인 가상 데이터"""
+    rng = np.random.default_rng(seed)
+    raw = make_income_summary(rows)
+    raw["3월"] = raw["3월"].astype(object)
+    raw.loc[rng.choice(rows, rows // 1000, replace=False), "3월"] = "확인 필요"
+    raw.loc[rng.choice(rows, rows // 1000, replace=False), "5월"] = -10000
+    raw.loc[rng.choice(rows, rows // 1000, replace=False), "연간 총합"] += 500
+    raw.loc[rng.choice(rows, rows // 100, replace=False), "이름"] = "교인000000"
+    return raw
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="데이터 검증 벤치마크")
+    parser.add_argument("--rows", type=int, default=100_000, help="가상 데이터 행 수")
+    parser.add_argument("--skip-legacy", action="store_true", help="기존 방식 측정 생략")
+    args = parser.parse_args()
+
+    raw = make_dirty(args.rows)
+    print(f"가상 데이터: {args.rows:,}행")
+
+    new, new_time = timed(data_warnings, raw)
+    print(f"  컬럼 단위 검증: {new_time:8.3f}초 (경고 {len(new):,}건)")
+
+    if not args.skip_legacy:
+        old, old_time = timed(legacy_warnings, raw)
+        print(f"  반복 검사:     {old_time:8.3f}초 ({old_time / new_time:.0f}배)")
+        assert old == new, "경고 메시지가 다릅니다"
+        print("  결과 동일: OK")
+
+
+if __name__ == "__main__":
+    main()
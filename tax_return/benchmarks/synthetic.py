@@ -0,0 +1,24 @@
+"""벤치마크용 가상 헌금 데이터 생성"""
+
+import numpy as np
+import pandas as pd
+
+
+def make_income_summary(rows, couple_ratio=0.1, seed=0):
+    """YYYY_income_summary.xlsx와 같은 형식의 가상 데이터"""
+    rng = np.random.default_rng(seed)
+    names = np.array([f"교인{i:06d}" for i in range(rows)], dtype=object)
+
+    # 일부는 부부 이름 (쉼표 구분)
+    couples = rng.random(rows) < couple_ratio
+    names[couples] = [f"{n}, 배우자{i:06d}" for i, n in zip(np.flatnonzero(couples), names[couples])]
+
+    df = pd.DataFrame({"이름": names})
+    for month in range(1, 13):
+        amounts = rng.integers(0, 30, rows) * 10000
+        # 빈 칸(NaN)도 섞음
+        df[f"{month}월"] = np.where(rng.random(rows) < 0.2, np.nan, amounts)
+    df["연간 총합"] = df[[f"{m}월" for m in range(1, 13)]].sum(axis=1)
+
+    summary = {"이름": "합계", **{col: df[col].sum() for col in df.columns[1:]}}
+    return pd.concat([df, pd.DataFrame([summary])], ignore_index=True)
@@ -16,6 +16,8 @@
     python generate_receipts.py --history           # 발행 이력 조회
     python generate_receipts.py --history -n 강신애  # 특정인 이력 조회
     python generate_receipts.py --pdf               # PDF로 변환
+    python generate_receipts.py --pdf --pdf-engine native  # Word/LibreOffice 없이 PDF 생성
+    python generate_receipts.py --jobs 4            # 4개 프로세스로 병렬 생성 (0: CPU 코어 수)
 """
 
 import argparse
@@ -23,10 +25,17 @@ import os
 import re
 import glob
 import sys
-import subprocess
-from datetime import datetime
-import pandas as pd
-from docxtpl import DocxTemplate
+
+from receipt_core.template import format_amount
+from receipt_core.dataset import DonorDataset
+from receipt_core.diff import diff_donors, reissue_names
+from receipt_core.pdf import convert_many, converter_available
+from receipt_core.batch import render_receipts, resolve_jobs
+from receipt_core.ledger import open_ledger, ledger_exists
+from receipt_core.manifest import RenderManifest, context_hash, render_options
+from receipt_core.receipt_index import file_sha256
+from receipt_core.watch import watch
+from receipt_core.stream import stream_receipts
 
 # 설정 기본값
 DEFAULT_CONFIG = {
@@ -36,6 +45,10 @@ DEFAULT_CONFIG = {
     },
     "receipt": {
         "prefix": ""
+    },
+    "pdf": {
+        "engine": "office",
+        "layout": "receipt_layout.yaml"
     }
 }
 
@@ -73,6 +86,8 @@ CONFIG = load_config()
 TEMPLATE_FILE = CONFIG["files"]["template"]
 OUTPUT_DIR = CONFIG["files"]["output_dir"]
 RECEIPT_PREFIX = CONFIG["receipt"].get("prefix", "")
+PDF_ENGINE = CONFIG["pdf"].get("engine", "office")
+PDF_LAYOUT = CONFIG["pdf"].get("layout", "receipt_layout.yaml")
 
 
 def validate_template(template_file):
@@ -86,71 +101,36 @@ def validate_template(template_file):
 
 
 def validate_data_file(file_path):
-    """데이터 파일 유효성 검사"""
+    """데이터 파일 유효성 검사 (통과하면 파싱된 DonorDataset, 실패하면 None 반환)"""
     if not os.path.exists(file_path):
         print(f"❌ 오류: 데이터 파일이 없습니다: {file_path}")
-        return False
+        return None
 
     try:
-        df = pd.read_excel(file_path)
+        dataset = DonorDataset.load(file_path)
     except Exception as e:
         print(f"❌ 오류: 데이터 파일을 읽을 수 없습니다: {file_path}")
         print(f"   원인: {e}")
-        return False
+        return None
+
+    # 열 단위 캐시에서 읽었으면 원본 대신 정규화된 표로 검사
+    df = dataset.raw if dataset.raw is not None else dataset.df
 
     # 필수 컬럼 확인
     missing_cols = [col for col in REQUIRED_COLUMNS if col not in df.columns]
     if missing_cols:
         print(f"❌ 오류: 필수 컬럼이 없습니다: {', '.join(missing_cols)}")
         print(f"   필수 컬럼: {', '.join(REQUIRED_COLUMNS)}")
-        return False
-
-    # 금액 데이터 검증
-    month_cols = [f"{i}월" for i in range(1, 13)] + ["연간 총합"]
-    for col in month_cols:
-        if col in df.columns:
-            # 숫자가 아닌 값 확인 (NaN 제외)
-            non_numeric = df[col].dropna().apply(lambda x: not isinstance(x, (int, float)))
-            if non_numeric.any():
-                print(f"⚠️  경고: '{col}' 컬럼에 숫자가 아닌 값이 있습니다.")
+        return None
 
-            # 음수 값 확인
-            negative = df[col].dropna().apply(lambda x: isinstance(x, (int, float)) and x < 0)
-            if negative.any():
-                print(f"⚠️  경고: '{col}' 컬럼에 음수 값이 있습니다.")
-
-    return True
+    # 금액 데이터 검증 (숫자가 아닌 값은 NaN 제외, 캐시에서 읽었으면 처음 읽을 때 저장한 결과)
+    for col, kinds in dataset.amount_issues.items():
+        if "non_numeric" in kinds:
+            print(f"⚠️  경고: '{col}' 컬럼에 숫자가 아닌 값이 있습니다.")
+        if "negative" in kinds:
+            print(f"⚠️  경고: '{col}' 컬럼에 음수 값이 있습니다.")
 
-
-def convert_to_pdf(docx_path):
-    """DOCX를 PDF로 변환"""
-    pdf_path = docx_path.replace(".docx", ".pdf")
-
-    # 방법 1: docx2pdf 라이브러리 시도
-    try:
-        from docx2pdf import convert
-        convert(docx_path, pdf_path)
-        return pdf_path
-    except ImportError:
-        pass
-    except Exception:
-        pass
-
-    # 방법 2: LibreOffice 사용 (macOS/Linux)
-    try:
-        result = subprocess.run([
-            "soffice", "--headless", "--convert-to", "pdf",
-            "--outdir", os.path.dirname(docx_path) or ".",
-            docx_path
-        ], capture_output=True, text=True, timeout=30)
-        if result.returncode == 0 and os.path.exists(pdf_path):
-            return pdf_path
-    except (FileNotFoundError, subprocess.TimeoutExpired):
-        pass
-
-    # 방법 3: macOS에서 textutil + cupsfilter (제한적)
-    # 실패 시 None 반환
-    return None
+    return dataset
 
 
 def find_latest_data_file():
@@ -187,130 +167,328 @@ def get_issue_year(data_year):
     return (data_year + 1) % 100
 
 
-def format_amount(amount):
-    """금액을 천 단위 콤마 포맷으로 변환"""
-    if pd.isna(amount) or amount == 0:
-        return ""
-    return f"{int(amount):,}"
-
-
 def get_ledger_path(issue_year):
     """발행대장 파일 경로 반환"""
     return f"발행대장_{2000 + issue_year}.xlsx"
 
 
-def load_or_create_ledger(ledger_path):
-    """발행대장 로드 또는 생성"""
-    if os.path.exists(ledger_path):
-        return pd.read_excel(ledger_path)
-    else:
-        return pd.DataFrame(columns=["발급번호", "이름", "연간총합", "발행일시", "파일경로", "비고"])
+def show_history(ledger_path, filter_name=None):
+    """발행 이력 조회"""
+    if not ledger_exists(ledger_path):
+        print("발행 이력이 없습니다.")
+        return
 
+    with open_ledger(ledger_path) as ledger:
+        if filter_name:
+            rows = ledger.rows(filter_name).fetchall()
+            if not rows:
+                print(f"'{filter_name}'의 발행 이력이 없습니다.")
+                return
+            print(f"'{filter_name}' 발행 이력:")
+        else:
+            rows = ledger.rows()
+            print(f"전체 발행 이력 ({ledger.count()}건):")
 
-def save_ledger(df, ledger_path):
-    """발행대장 저장"""
-    df.to_excel(ledger_path, index=False)
+        for receipt_no, name, total, issued_at, _, note in rows:
+            note = f" ({note})" if note else ""
+            print(f"  {receipt_no} | {name} | {format_amount(total)}원 | {issued_at}{note}")
 
 
-def add_to_ledger(ledger_df, receipt_no, name, total, file_path, note=""):
-    """발행대장에 기록 추가"""
-    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+def show_diff(old_file, df):
+    """이전 버전 데이터와 비교 결과 출력"""
+    old_dataset = validate_data_file(old_file)
+    if old_dataset is None:
+        sys.exit(1)
 
-    # 기존 기록 확인 (동일 발급번호)
-    existing = ledger_df[ledger_df["발급번호"] == receipt_no]
-    if not existing.empty:
-        note = "재발행"
+    diff = diff_donors(old_dataset.df, df)
+    print(f"비교: {old_file} → 현재 데이터")
+
+    for donor in diff["added"]:
+        print(f"  + 추가: {donor['name']} ({format_amount(donor['total'])}원)")
+    for donor in diff["removed"]:
+        print(f"  - 삭제: {donor['name']} ({format_amount(donor['total'])}원)")
+    for donor in diff["changed"]:
+        months = ", ".join(
+            f"{m['month']} {format_amount(m['before'])}→{format_amount(m['after'])}" for m in donor["months"]
+        )
+        print(f"  * 변경: {donor['name']} ({format_amount(donor['total_before'])}원 → "
+              f"{format_amount(donor['total_after'])}원) {months}")
+    if diff["renumbered"]:
+        print(f"  발급번호 순번 변경: {len(diff['renumbered'])}명 (추가/삭제로 뒤 번호가 밀림)")
+
+    reissue = reissue_names(diff)
+    print(f"\n추가 {len(diff['added'])}명, 삭제 {len(diff['removed'])}명, "
+          f"변경 {len(diff['changed'])}명, 동일 {diff['unchanged']}명")
+    if reissue:
+        print(f"재발행: python generate_receipts.py -n {','.join(reissue)}")
+
+
+def use_native_pdf(args, template_file):
+    """native PDF 사용 여부 (레이아웃/글꼴 문제는 렌더링 전에 한 번만 알리고 종료)"""
+    if not (args.pdf and args.pdf_engine == "native"):
+        return False
+    try:
+        from receipt_core.pdf_native import get_pdf_renderer
+        get_pdf_renderer(args.layout, template_file)
+    except ImportError as e:
+        # 없는 모듈 이름으로 안내 (reportlab, yaml -> pyyaml)
+        module = (e.name or "reportlab").split(".")[0]
+        package = {"yaml": "pyyaml"}.get(module, module)
+        print(f"❌ 오류: native PDF에는 {package} 패키지가 필요합니다. (pip install {package})")
+        sys.exit(1)
+    except Exception as e:
+        print(f"❌ 오류: PDF 레이아웃을 사용할 수 없습니다: {e}")
+        sys.exit(1)
+    return True
 
-    new_row = pd.DataFrame([{
-        "발급번호": receipt_no,
-        "이름": name,
-        "연간총합": total,
-        "발행일시": now,
-        "파일경로": file_path,
-        "비고": note
-    }])
 
-    return pd.concat([ledger_df, new_row], ignore_index=True)
+def organization_fields(data_year):
+    """native PDF 레이아웃에 들어갈 단체 정보"""
+    organization = CONFIG.get("organization") or {}
+    return {
+        "year": data_year or "",
+        "org_name": organization.get("name", ""),
+        "org_representative": organization.get("representative", ""),
+        "org_business_number": organization.get("business_number", ""),
+        "org_address": organization.get("address", ""),
+    }
 
 
-def show_history(ledger_path, filter_name=None):
-    """발행 이력 조회"""
-    if not os.path.exists(ledger_path):
-        print("발행 이력이 없습니다.")
-        return
+def stream_issue(args, data_file, data_year, template_file):
+    """대용량 목록 발행: 한 행씩 읽어 렌더링하고 발행대장에 묶음 단위로 기록"""
+    conflicts = [flag for flag, used in (("--list", args.list), ("--diff", args.diff),
+                                         ("--incremental", args.incremental), ("--watch", args.watch))
+                 if used]
+    if conflicts:
+        print(f"❌ 오류: --stream은 {', '.join(conflicts)}와 함께 쓸 수 없습니다.")
+        sys.exit(1)
+    if not os.path.exists(data_file):
+        print(f"❌ 오류: 데이터 파일이 없습니다: {data_file}")
+        sys.exit(1)
+
+    issue_year = get_issue_year(data_year) if data_year else 26
+    ledger_path = get_ledger_path(issue_year)
+    names = {n.strip() for n in args.names.split(",")} if args.names else None
+    native_pdf = use_native_pdf(args, template_file)
+    print(f"데이터 파일: {data_file} (발급연도: {issue_year}, 스트리밍)")
+
+    convert_pdf = None
+    if args.pdf and not native_pdf:
+        if converter_available():
+            convert_pdf = lambda generated: convert_many(generated, workers=resolve_jobs(args.jobs))
+        else:
+            print("  ⚠️  PDF 변환 실패: docx2pdf 또는 LibreOffice가 필요합니다.")
+
+    count = 0
+    pdf_count = 0
+    found = set()
+    try:
+        events = stream_receipts(
+            data_file, template_file, OUTPUT_DIR, ledger_path, issue_year, RECEIPT_PREFIX,
+            names=names, jobs=args.jobs, native_pdf=native_pdf, layout_path=args.layout,
+            extra_fields=organization_fields(data_year) if native_pdf else None,
+            convert_pdf=convert_pdf,
+        )
+        for event in events:
+            if names is not None:
+                found.add(event["name"])
+            if event["error"]:
+                print(f"  ❌ 실패: {event['name']} - {event['error']}")
+                continue
+            count += 1
+            if event["pdf_path"]:
+                pdf_count += 1
+            elif args.pdf and convert_pdf:
+                print(f"  ⚠️  PDF 변환 실패: {event['name']}")
+            print(f"  생성: {event['name']} ({event['receipt_no']})")
+    except ValueError as e:
+        print(f"❌ 오류: {e}")
+        sys.exit(1)
+
+    if names is not None and names - found:
+        print(f"⚠️  찾을 수 없는 이름: {', '.join(sorted(names - found))}")
+
+    print(f"\n완료! {OUTPUT_DIR}/ 폴더에 {count}개 DOCX 생성됨")
+    if args.pdf and pdf_count > 0:
+        print(f"       {pdf_count}개 PDF 변환됨")
+    print(f"발행대장: {ledger_path}")
+
+
+def select_targets(df, names):
+    """-n 옵션으로 발행 대상 필터링 (대상이 없으면 None)"""
+    if not names:
+        print(f"전체 대상: {len(df)}명")
+        return df
+
+    # 쉼표로 구분된 이름 파싱
+    target_names = [n.strip() for n in names.split(",")]
+    df_filtered = df[df["이름"].isin(target_names)]
+
+    # 찾지 못한 이름 확인
+    found_names = set(df_filtered["이름"].tolist())
+    not_found = set(target_names) - found_names
+    if not_found:
+        print(f"⚠️  찾을 수 없는 이름: {', '.join(not_found)}")
+
+    if df_filtered.empty:
+        print("발행 대상이 없습니다.")
+        return None
+
+    print(f"선택된 대상: {len(df_filtered)}명")
+    return df_filtered
+
+
+def issue_receipts(args, dataset, df, template_file, data_year, issue_year, ledger_path, incremental=None):
+    """대상자 표(df: dataset.df에서 고른 행)의 영수증 생성, 발행대장 기록, PDF 변환 (생성한 개수 반환)"""
+    if incremental is None:
+        incremental = args.incremental
+
+    # 출력 폴더 생성
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+
+    # 전체 데이터에서 발급번호 매핑 (일관성 유지)
+    receipt_no_map = dataset.receipt_no_map(issue_year, RECEIPT_PREFIX)
+
+    count = 0
 
-    df = pd.read_excel(ledger_path)
+    native_pdf = use_native_pdf(args, template_file)
+    extra_fields = organization_fields(data_year)
+
+    # 증분 발행: 이전 실행과 입력이 같은 대상자는 건너뜀
+    manifest = RenderManifest(OUTPUT_DIR)
+    template_hash = file_sha256(template_file)
+    options = render_options(native_pdf, args.layout)
+
+    # 렌더링 작업 목록 (발급번호는 부모 프로세스에서 결정)
+    targets = []
+    items = []
+    table = dataset.table
+    # df는 dataset.df 전체이거나 고른 행이므로, 인덱스 라벨이 아니라 dataset.df 안의 행 위치로 조회
+    positions = range(len(table)) if df is dataset.df else dataset.df.index.get_indexer(df.index)
+    for position in positions:
+        name = table.names[position]
+        receipt_no = receipt_no_map.get(name, f"{RECEIPT_PREFIX}{issue_year}-000")
+        total_amount = int(table.totals[position])
+        safe_name = name.replace("/", "_").replace("\\", "_")
+
+        output_path = os.path.join(OUTPUT_DIR, f"기부금영수증_{safe_name}.docx")
+        context = table.context(position, receipt_no)
+        if native_pdf:
+            context.update(extra_fields)
+        targets.append((name, receipt_no, total_amount, output_path, context_hash(context)))
+        items.append((context, output_path))
+
+    if incremental:
+        unchanged = manifest.unchanged_outputs(
+            [(t[3], t[4], t[1]) for t in targets], template_hash, options, need_pdf=args.pdf)
+        keep = [i for i, t in enumerate(targets) if t[3] not in unchanged]
+        skipped = len(targets) - len(keep)
+        targets = [targets[i] for i in keep]
+        items = [items[i] for i in keep]
+        if skipped:
+            print(f"변경 없음: {skipped}명 건너뜀")
+
+    if resolve_jobs(args.jobs) > 1:
+        print(f"병렬 작업자: {resolve_jobs(args.jobs)}개")
+
+    # 결과는 입력 순서대로 돌아옴
+    generated = {}
+    ledger_records = []
+    pdf_count = 0
+    results = render_receipts(template_file, items, jobs=args.jobs,
+                              native_pdf=native_pdf, layout_path=args.layout)
+    for (name, receipt_no, total_amount, output_path, row_hash), result in zip(targets, results):
+        if result["error"]:
+            print(f"  ❌ 실패: {name} - {result['error']}")
+            continue
+
+        manifest.record(output_path, row_hash, template_hash, receipt_no, options)
+        generated[output_path] = name
+        if result["pdf_path"]:
+            pdf_count += 1
+
+        # 발행대장 기록 대상
+        ledger_records.append((receipt_no, name, total_amount, output_path))
+
+        print(f"  생성: {name} ({receipt_no})")
+        count += 1
+
+    # 발행대장 저널에 기록 후 엑셀로 내보내기 (일괄 처리 끝에 한 번)
+    with open_ledger(ledger_path) as ledger:
+        ledger.append_many(ledger_records)
+        ledger.export_xlsx()
+    manifest.save()
+
+    # PDF 변환 (여러 파일을 묶어서 한 번에 변환)
+    if args.pdf and not native_pdf and generated:
+        if not converter_available():
+            print("  ⚠️  PDF 변환 실패: docx2pdf 또는 LibreOffice가 필요합니다.")
+            print("     설치: pip install docx2pdf (Word 필요) 또는 brew install libreoffice")
+        else:
+            print(f"PDF 변환 중... ({len(generated)}개)")
+            pdf_results = convert_many(generated, workers=resolve_jobs(args.jobs))
+            for docx_path, pdf_path in pdf_results.items():
+                if pdf_path:
+                    pdf_count += 1
+                else:
+                    print(f"  ⚠️  PDF 변환 실패: {generated[docx_path]}")
+
+    print(f"\n완료! {OUTPUT_DIR}/ 폴더에 {count}개 DOCX 생성됨")
+    if args.pdf and pdf_count > 0:
+        print(f"       {pdf_count}개 PDF 변환됨")
+    print(f"발행대장: {ledger_path}")
 
-    if filter_name:
-        df = df[df["이름"] == filter_name]
-        if df.empty:
-            print(f"'{filter_name}'의 발행 이력이 없습니다.")
+    return count
+
+
+def watch_and_issue(args, data_file, data_year, template_file, dataset):
+    """데이터/템플릿 파일이 바뀔 때마다 바뀐 대상자만 다시 발행"""
+    auto_detect = not args.data and not args.year
+    state = {"data_file": data_file, "data_year": data_year, "dataset": dataset}
+
+    def run():
+        issue_year = get_issue_year(state["data_year"]) if state["data_year"] else 26
+        df = select_targets(state["dataset"].df, args.names)
+        if df is not None:
+            issue_receipts(args, state["dataset"], df, template_file, state["data_year"],
+                           issue_year, get_ledger_path(issue_year), incremental=True)
+
+    def on_change(changed):
+        print(f"\n변경 감지: {', '.join(sorted(os.path.basename(p) for p in changed))}")
+        if auto_detect:
+            latest_file, latest_year = find_latest_data_file()
+            if not latest_file:
+                print("⚠️  데이터 파일이 없습니다. 다시 저장되기를 기다립니다.")
+                return
+            state["data_file"], state["data_year"] = latest_file, latest_year
+        if not validate_template(template_file):
             return
-        print(f"'{filter_name}' 발행 이력:")
+
+        previous = state["dataset"]
+        current = validate_data_file(state["data_file"])
+        if current is None:
+            return
+
+        # 이전에 읽은 데이터와 비교해 바뀐 대상자 알림
+        if os.path.abspath(previous.file_path) == os.path.abspath(current.file_path):
+            diff = diff_donors(previous.df, current.df)
+            print(f"추가 {len(diff['added'])}명, 삭제 {len(diff['removed'])}명, 변경 {len(diff['changed'])}명")
+        state["dataset"] = current
+        run()
+
+    run()
+
+    if auto_detect:
+        patterns = [os.path.join(os.getcwd(), "*_income_summary.xlsx")]
     else:
-        print(f"전체 발행 이력 ({len(df)}건):")
-
-    for _, row in df.iterrows():
-        note = f" ({row['비고']})" if pd.notna(row['비고']) and row['비고'] else ""
-        print(f"  {row['발급번호']} | {row['이름']} | {format_amount(row['연간총합'])}원 | {row['발행일시']}{note}")
-
-
-def load_data(file_path):
-    """Excel 파일에서 데이터 로드 및 이름 분리"""
-    df = pd.read_excel(file_path)
-
-    # 마지막 행(합계)은 제외
-    df = df[df["이름"] != "합계"].copy()
-
-    # NaN을 0으로 처리
-    month_cols = [f"{i}월" for i in range(1, 13)]
-    for col in month_cols + ["연간 총합"]:
-        if col in df.columns:
-            df[col] = df[col].fillna(0).astype(int)
-
-    # 쉼표로 구분된 이름 분리하여 확장
-    expanded_rows = []
-    for _, row in df.iterrows():
-        name = row["이름"]
-        if "," in name:
-            names = [n.strip() for n in name.split(",")]
-            for individual_name in names:
-                new_row = row.copy()
-                new_row["이름"] = individual_name
-                expanded_rows.append(new_row)
-        else:
-            expanded_rows.append(row)
-
-    result_df = pd.DataFrame(expanded_rows)
-    result_df = result_df.sort_values("이름").reset_index(drop=True)
-
-    return result_df
-
-
-def create_receipt(template_path, name, monthly_amounts, total_amount, receipt_no, output_path):
-    """템플릿 기반 DOCX 영수증 생성"""
-    template = DocxTemplate(template_path)
-
-    context = {
-        "receipt_no": receipt_no,
-        "name": name,
-        "month_1": format_amount(monthly_amounts.get("1월", 0)),
-        "month_2": format_amount(monthly_amounts.get("2월", 0)),
-        "month_3": format_amount(monthly_amounts.get("3월", 0)),
-        "month_4": format_amount(monthly_amounts.get("4월", 0)),
-        "month_5": format_amount(monthly_amounts.get("5월", 0)),
-        "month_6": format_amount(monthly_amounts.get("6월", 0)),
-        "month_7": format_amount(monthly_amounts.get("7월", 0)),
-        "month_8": format_amount(monthly_amounts.get("8월", 0)),
-        "month_9": format_amount(monthly_amounts.get("9월", 0)),
-        "month_10": format_amount(monthly_amounts.get("10월", 0)),
-        "month_11": format_amount(monthly_amounts.get("11월", 0)),
-        "month_12": format_amount(monthly_amounts.get("12월", 0)),
-        "total": format_amount(total_amount),
-    }
+        patterns = [glob.escape(os.path.abspath(data_file))]
+    patterns.append(glob.escape(os.path.abspath(template_file)))
 
-    template.render(context)
-    template.save(output_path)
+    print("\n파일 변경 감시 중... (Ctrl+C로 종료)")
+    try:
+        watch(patterns, on_change)
+    except KeyboardInterrupt:
+        print("\n감시 종료")
 
 
 def main():
@@ -329,13 +507,27 @@ def main():
                         help="발행 이력 조회")
     parser.add_argument("--pdf", action="store_true",
                         help="PDF로 변환 (DOCX도 유지)")
+    parser.add_argument("--pdf-engine", choices=["office", "native"], default=PDF_ENGINE,
+                        help="PDF 생성 방식 (office: Word/LibreOffice 변환, native: 직접 렌더링)")
+    parser.add_argument("--layout", default=PDF_LAYOUT,
+                        help="native PDF 레이아웃 파일 (예: receipt_layout.yaml)")
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="병렬 작업자 수 (기본 1, 0이면 CPU 코어 수)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="데이터/템플릿이 바뀐 대상자만 다시 발행")
+    parser.add_argument("--diff", metavar="OLD_FILE",
+                        help="이전 버전 데이터 파일과 비교 (재발행 대상 확인)")
+    parser.add_argument("--stream", action="store_true",
+                        help="대용량 목록을 한 행씩 읽어 발행 (메모리 사용량 일정, 파일 행 순서대로 생성)")
+    parser.add_argument("--watch", action="store_true",
+                        help="데이터/템플릿 파일이 바뀔 때마다 바뀐 대상자만 다시 발행 (Ctrl+C로 종료)")
     args = parser.parse_args()
 
     # 템플릿 파일 결정
     template_file = args.template if args.template else TEMPLATE_FILE
 
-    # 템플릿 파일 확인 (history 모드가 아닐 때만)
-    if not args.history and not args.list:
+    # 템플릿 파일 확인 (조회 모드가 아닐 때만)
+    if not args.history and not args.list and not args.diff:
         if not validate_template(template_file):
             sys.exit(1)
 
@@ -354,8 +546,14 @@ def main():
             print("   또는 --data 옵션으로 파일을 지정하세요.")
             sys.exit(1)
 
-    # 데이터 파일 유효성 검사
-    if not validate_data_file(data_file):
+    # 대용량 목록은 전체 표를 읽지 않고 스트리밍으로 발행
+    if args.stream and not args.history:
+        stream_issue(args, data_file, data_year, template_file)
+        return
+
+    # 데이터 파일 유효성 검사 (파일은 여기서 한 번만 읽음)
+    dataset = validate_data_file(data_file)
+    if dataset is None:
         sys.exit(1)
 
     # 발급 연도 계산
@@ -373,90 +571,32 @@ def main():
         return
 
     # 데이터 로드
-    df = load_data(data_file)
+    df = dataset.df
     print(f"데이터 파일: {data_file} (발급연도: {issue_year})")
 
+    # 이전 버전과 비교
+    if args.diff:
+        show_diff(args.diff, df)
+        return
+
     # 목록만 출력
     if args.list:
-        print(f"총 {len(df)}명:")
-        for idx, row in df.iterrows():
-            print(f"  {idx+1:3d}. {row['이름']} ({format_amount(row['연간 총합'])}원)")
+        table = dataset.table
+        print(f"총 {len(table)}명:")
+        for idx, (name, total) in enumerate(zip(table.names, table.total_text)):
+            print(f"  {idx+1:3d}. {name} ({total}원)")
         return
 
-    # 대상 필터링
-    if args.names:
-        # 쉼표로 구분된 이름 파싱
-        target_names = [n.strip() for n in args.names.split(",")]
-        df_filtered = df[df["이름"].isin(target_names)]
-
-        # 찾지 못한 이름 확인
-        found_names = set(df_filtered["이름"].tolist())
-        not_found = set(target_names) - found_names
-        if not_found:
-            print(f"⚠️  찾을 수 없는 이름: {', '.join(not_found)}")
-
-        if df_filtered.empty:
-            print("발행 대상이 없습니다.")
-            return
-
-        df = df_filtered
-        print(f"선택된 대상: {len(df)}명")
-    else:
-        print(f"전체 대상: {len(df)}명")
-
-    # 출력 폴더 생성
-    os.makedirs(OUTPUT_DIR, exist_ok=True)
-
-    # 전체 데이터에서 발급번호 매핑 (일관성 유지)
-    df_all = load_data(data_file)
-    receipt_no_map = {row["이름"]: f"{RECEIPT_PREFIX}{issue_year}-{idx+1:03d}" for idx, row in df_all.iterrows()}
-
-    # 발행대장 로드
-    ledger_df = load_or_create_ledger(ledger_path)
-
-    month_cols = [f"{i}월" for i in range(1, 13)]
-    count = 0
-    pdf_count = 0
-    pdf_failed = False
-
-    for _, row in df.iterrows():
-        name = row["이름"]
-        receipt_no = receipt_no_map.get(name, f"{RECEIPT_PREFIX}{issue_year}-000")
-        monthly_amounts = {col: row[col] for col in month_cols}
-        total_amount = row["연간 총합"]
-        safe_name = name.replace("/", "_").replace("\\", "_")
-
-        output_path = os.path.join(OUTPUT_DIR, f"기부금영수증_{safe_name}.docx")
-
-        try:
-            create_receipt(template_file, name, monthly_amounts, total_amount, receipt_no, output_path)
-        except Exception as e:
-            print(f"  ❌ 실패: {name} - {e}")
-            continue
-
-        # PDF 변환
-        if args.pdf:
-            pdf_path = convert_to_pdf(output_path)
-            if pdf_path:
-                pdf_count += 1
-            elif not pdf_failed:
-                pdf_failed = True
-                print("  ⚠️  PDF 변환 실패: docx2pdf 또는 LibreOffice가 필요합니다.")
-                print("     설치: pip install docx2pdf (Word 필요) 또는 brew install libreoffice")
-
-        # 발행대장에 기록
-        ledger_df = add_to_ledger(ledger_df, receipt_no, name, total_amount, output_path)
-
-        print(f"  생성: {name} ({receipt_no})")
-        count += 1
+    # 파일이 바뀔 때마다 다시 발행
+    if args.watch:
+        watch_and_issue(args, data_file, data_year, template_file, dataset)
+        return
 
-    # 발행대장 저장
-    save_ledger(ledger_df, ledger_path)
+    df = select_targets(df, args.names)
+    if df is None:
+        return
 
-    print(f"\n완료! {OUTPUT_DIR}/ 폴더에 {count}개 DOCX 생성됨")
-    if args.pdf and pdf_count > 0:
-        print(f"       {pdf_count}개 PDF 변환됨")
-    print(f"발행대장: {ledger_path}")
+    issue_receipts(args, dataset, df, template_file, data_year, issue_year, ledger_path)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,60 @@
+"""
+MCP 도구 실행기
+
+도구 처리(pandas/docx 파일 입출력)는 이벤트 루프를 막지 않도록 스레드에서 실행합니다.
+조회/검증 같은 읽기 도구는 읽기 풀에서 동시에 실행하고,
+영수증 생성/발행대장 기록 같은 쓰기 도구는 작업자 1개짜리 쓰기 풀에서 순서대로 실행합니다.
+(백그라운드 전체 발행 작업도 같은 쓰기 풀을 사용)
+"""
+
+import os
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+# 동시에 실행할 읽기 도구 수
+READ_WORKERS = max(1, int(os.environ.get("RECEIPT_READ_WORKERS", "4")))
+
+read_executor = ThreadPoolExecutor(max_workers=READ_WORKERS, thread_name_prefix="receipt-read")
+write_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="receipt-write")
+
+
+async def _run(executor, func, *args, **kwargs):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, functools.partial(func, *args, **kwargs))
+
+
+async def run_read(func, *args, **kwargs):
+    """읽기 도구 실행 (다른 읽기 도구와 동시에 실행됨)"""
+    return await _run(read_executor, func, *args, **kwargs)
+
+
+async def run_write(func, *args, **kwargs):
+    """쓰기 도구 실행 (앞선 쓰기 작업이 끝난 뒤 순서대로 실행됨)"""
+    return await _run(write_executor, func, *args, **kwargs)
+
+
+# 쓰기 풀에 예약되었지만 아직 시작하지 않은 작업의 key
+_pending = set()
+_pending_lock = threading.Lock()
+
+
+def submit_write_once(key, func, *args, **kwargs):
+    """쓰기 풀에 작업 예약 (같은 key의 작업이 아직 시작 전이면 새로 예약하지 않고 None 반환)
+
+    여러 번 요청되어도 한 번만 하면 되는 뒷정리(발행대장 내보내기 등)를 앞선 쓰기 작업 뒤로 미룹니다.
+    """
+    with _pending_lock:
+        if key in _pending:
+            return None
+        _pending.add(key)
+
+    def run():
+        # 시작한 뒤에 들어온 요청은 이 작업이 놓칠 수 있으므로 다시 예약할 수 있게 함
+        with _pending_lock:
+            _pending.discard(key)
+        return func(*args, **kwargs)
+
+    return write_executor.submit(run)
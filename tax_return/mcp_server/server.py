@@ -12,20 +12,30 @@ import sys
 # 상위 디렉토리의 모듈을 import할 수 있도록 경로 추가
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from fastmcp import FastMCP
+from fastmcp import FastMCP, Context
+from fastmcp.server.middleware import Middleware
 
 from .tools.receipt import (
     list_recipients,
     generate_receipt,
+    generate_receipts,
     generate_all_receipts,
     preview_receipt,
 )
 from .tools.validate import validate_data, validate_template
 from .tools.history import get_history, get_person_history
+from .tools.diff import diff_data
+from .tools.watch import start_watcher, get_watch_status
+from .tools.jobs import start_generate_all_job, wait_for_job, cancel_job
+from .executor import run_read, run_write
+from .warmup import start_warmup
 
 # 환경 변수에서 데이터 디렉토리 읽기
 DATA_DIR = os.environ.get("DATA_DIR", os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+# 데이터/템플릿 변경 시 자동 재발행 (선택)
+WATCH_ENABLED = os.environ.get("RECEIPT_WATCH", "").lower() in ("1", "true", "yes")
+
 # MCP 서버 생성
 mcp = FastMCP(
     name="oikos-receipt",
@@ -33,17 +43,31 @@ mcp = FastMCP(
 
 사용 가능한 기능:
 - 대상자 목록 조회: list_recipients()
-- 영수증 생성: generate_receipt(name) 또는 generate_all_receipts()
+- 영수증 생성: generate_receipt(name), 여러 명은 generate_donation_receipts(names), 전체는 generate_all_receipts()
 - 데이터 검증: validate_data()
 - 발행 이력 조회: get_history()
+- 데이터 버전 비교: diff_donation_data(old_file) (재발행 대상 확인)
+- 대상자가 많을 때 전체 생성: start_receipt_generation_job() 후 get_receipt_job_status(job_id)
 
 개인정보 보호를 위해 상세 정보(이름, 금액)는 로컬 파일에서 확인하세요."""
 )
 
 
+class WarmupMiddleware(Middleware):
+    """initialize 응답을 보낸 뒤 무거운 라이브러리를 백그라운드에서 미리 불러옴"""
+
+    async def on_initialize(self, context, call_next):
+        result = await call_next(context)
+        start_warmup()
+        return result
+
+
+mcp.add_middleware(WarmupMiddleware())
+
+
 # 영수증 도구 등록
 @mcp.tool()
-def list_donation_recipients(data_file: str = None) -> dict:
+async def list_donation_recipients(data_file: str = None) -> dict:
     """
     영수증 발행 대상자 목록을 조회합니다.
 
@@ -53,11 +77,11 @@ def list_donation_recipients(data_file: str = None) -> dict:
     Returns:
         대상자 수와 총 금액 (개인정보 보호를 위해 상세 목록은 미포함)
     """
-    return list_recipients(DATA_DIR, data_file)
+    return await run_read(list_recipients, DATA_DIR, data_file)
 
 
 @mcp.tool()
-def generate_donation_receipt(name: str, data_file: str = None, template_file: str = None) -> dict:
+async def generate_donation_receipt(name: str, data_file: str = None, template_file: str = None) -> dict:
     """
     특정 사람의 기부금 영수증을 생성합니다.
 
@@ -69,14 +93,40 @@ def generate_donation_receipt(name: str, data_file: str = None, template_file: s
     Returns:
         생성 결과 (파일 경로 포함)
     """
-    return generate_receipt(DATA_DIR, name, data_file, template_file)
+    return await run_write(generate_receipt, DATA_DIR, name, data_file, template_file)
 
 
 @mcp.tool()
-def generate_all_donation_receipts(
+async def generate_donation_receipts(
+    names: list[str],
     data_file: str = None,
     template_file: str = None,
-    confirm: bool = False
+    jobs: int = 1
+) -> dict:
+    """
+    여러 사람의 기부금 영수증을 한 번에 생성합니다.
+
+    여러 명을 발행할 때는 generate_donation_receipt를 반복 호출하는 대신 이 도구를 사용하세요.
+
+    Args:
+        names: 대상자 이름 목록
+        data_file: 데이터 파일 경로 (선택사항)
+        template_file: 템플릿 파일 경로 (선택사항)
+        jobs: 병렬 작업자 수 (선택사항, 기본 1, 0이면 CPU 코어 수)
+
+    Returns:
+        이름별 생성 결과 (success, not_found, failed)
+    """
+    return await run_write(generate_receipts, DATA_DIR, names, data_file, template_file, jobs)
+
+
+@mcp.tool()
+async def generate_all_donation_receipts(
+    data_file: str = None,
+    template_file: str = None,
+    confirm: bool = False,
+    jobs: int = 1,
+    incremental: bool = False
 ) -> dict:
     """
     전체 대상자의 기부금 영수증을 생성합니다.
@@ -85,15 +135,72 @@ def generate_all_donation_receipts(
         data_file: 데이터 파일 경로 (선택사항)
         template_file: 템플릿 파일 경로 (선택사항)
         confirm: 생성 확인 (False면 미리보기만, True면 실제 생성)
+        jobs: 병렬 작업자 수 (선택사항, 기본 1, 0이면 CPU 코어 수)
+        incremental: True면 데이터/템플릿이 바뀐 대상자만 다시 생성
 
     Returns:
         생성 결과 또는 미리보기 정보
     """
-    return generate_all_receipts(DATA_DIR, data_file, template_file, confirm)
+    # 미리보기(confirm=False)는 파일을 쓰지 않으므로 읽기 풀에서 실행
+    run = run_write if confirm else run_read
+    return await run(generate_all_receipts, DATA_DIR, data_file, template_file, confirm, jobs, incremental)
+
+
+@mcp.tool()
+async def start_receipt_generation_job(
+    data_file: str = None,
+    template_file: str = None,
+    jobs: int = 1,
+    incremental: bool = False
+) -> dict:
+    """
+    전체 영수증 생성을 백그라운드 작업으로 시작하고 작업 ID를 바로 반환합니다.
+
+    대상자가 많아 generate_all_donation_receipts가 오래 걸릴 때 사용하세요.
+
+    Args:
+        data_file: 데이터 파일 경로 (선택사항)
+        template_file: 템플릿 파일 경로 (선택사항)
+        jobs: 병렬 작업자 수 (선택사항, 기본 1, 0이면 CPU 코어 수)
+        incremental: True면 데이터/템플릿이 바뀐 대상자만 다시 생성
+
+    Returns:
+        작업 ID
+    """
+    return start_generate_all_job(DATA_DIR, data_file, template_file, jobs, incremental)
+
+
+@mcp.tool()
+async def get_receipt_job_status(job_id: str = None, wait_seconds: float = 0, ctx: Context = None) -> dict:
+    """
+    백그라운드 영수증 생성 작업의 진행 상황을 조회합니다.
+
+    Args:
+        job_id: 작업 ID (선택사항, 미지정 시 가장 최근 작업)
+        wait_seconds: 작업이 끝날 때까지 최대 몇 초 기다릴지 (선택사항, 최대 50초, 기다리는 동안 진행률 알림)
+
+    Returns:
+        처리 수/전체 수, 진행률, 초당 처리 수, 예상 남은 시간, 완료 시 결과
+    """
+    return await wait_for_job(job_id, wait_seconds, ctx.report_progress if ctx else None)
 
 
 @mcp.tool()
-def preview_donation_receipt(name: str, data_file: str = None) -> dict:
+async def cancel_receipt_job(job_id: str) -> dict:
+    """
+    백그라운드 영수증 생성 작업을 중단합니다.
+
+    Args:
+        job_id: 작업 ID
+
+    Returns:
+        중단 요청 결과 (이미 만든 영수증은 발행대장에 기록됨)
+    """
+    return cancel_job(job_id)
+
+
+@mcp.tool()
+async def preview_donation_receipt(name: str, data_file: str = None) -> dict:
     """
     영수증 내용을 미리봅니다 (파일 생성 없이).
 
@@ -104,12 +211,12 @@ def preview_donation_receipt(name: str, data_file: str = None) -> dict:
     Returns:
         영수증 미리보기 정보
     """
-    return preview_receipt(DATA_DIR, name, data_file)
+    return await run_read(preview_receipt, DATA_DIR, name, data_file)
 
 
 # 검증 도구 등록
 @mcp.tool()
-def validate_donation_data(data_file: str = None) -> dict:
+async def validate_donation_data(data_file: str = None) -> dict:
     """
     데이터 파일의 유효성을 검사합니다.
 
@@ -119,11 +226,11 @@ def validate_donation_data(data_file: str = None) -> dict:
     Returns:
         검증 결과 (오류 목록 포함)
     """
-    return validate_data(DATA_DIR, data_file)
+    return await run_read(validate_data, DATA_DIR, data_file)
 
 
 @mcp.tool()
-def validate_receipt_template(template_file: str = None) -> dict:
+async def validate_receipt_template(template_file: str = None) -> dict:
     """
     템플릿 파일의 유효성을 검사합니다.
 
@@ -133,12 +240,12 @@ def validate_receipt_template(template_file: str = None) -> dict:
     Returns:
         검증 결과 (누락된 placeholder 목록 포함)
     """
-    return validate_template(DATA_DIR, template_file)
+    return await run_read(validate_template, DATA_DIR, template_file)
 
 
 # 이력 도구 등록
 @mcp.tool()
-def get_receipt_history(year: int = None) -> dict:
+async def get_receipt_history(year: int = None) -> dict:
     """
     영수증 발행 이력을 조회합니다.
 
@@ -148,11 +255,11 @@ def get_receipt_history(year: int = None) -> dict:
     Returns:
         발행 건수와 최근 발행 정보 (상세 내역은 로컬 파일 참조)
     """
-    return get_history(DATA_DIR, year)
+    return await run_read(get_history, DATA_DIR, year)
 
 
 @mcp.tool()
-def get_person_receipt_history(name: str, year: int = None) -> dict:
+async def get_person_receipt_history(name: str, year: int = None) -> dict:
     """
     특정 사람의 영수증 발행 이력을 조회합니다.
 
@@ -163,11 +270,40 @@ def get_person_receipt_history(name: str, year: int = None) -> dict:
     Returns:
         해당 사람의 발행 여부와 횟수
     """
-    return get_person_history(DATA_DIR, name, year)
+    return await run_read(get_person_history, DATA_DIR, name, year)
+
+
+# 비교 도구 등록
+@mcp.tool()
+async def diff_donation_data(old_file: str, new_file: str = None) -> dict:
+    """
+    두 버전의 데이터 파일을 비교하여 재발행이 필요한 대상자를 찾습니다.
+
+    Args:
+        old_file: 이전 버전 데이터 파일 경로
+        new_file: 새 버전 데이터 파일 경로 (선택사항, 미지정 시 자동 감지)
+
+    Returns:
+        추가/삭제/변경된 대상자 이름과 바뀐 월 (금액은 미포함)
+    """
+    return await run_read(diff_data, DATA_DIR, old_file, new_file)
+
+
+@mcp.tool()
+async def get_auto_regenerate_status() -> dict:
+    """
+    자동 재발행(파일 변경 감시) 상태를 조회합니다.
+
+    Returns:
+        마지막 자동 재발행 시각과 결과 (RECEIPT_WATCH=1로 실행한 경우)
+    """
+    return get_watch_status()
 
 
 def main():
     """MCP 서버 실행"""
+    if WATCH_ENABLED:
+        start_watcher(DATA_DIR)
     mcp.run(transport="stdio", show_banner=False, log_level="ERROR")
 
 
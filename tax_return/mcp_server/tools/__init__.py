@@ -1,15 +1,25 @@
 """MCP 도구 모듈"""
 
-from .receipt import list_recipients, generate_receipt, generate_all_receipts
+from .receipt import list_recipients, generate_receipt, generate_receipts, generate_all_receipts
 from .validate import validate_data, validate_template
 from .history import get_history, get_person_history
+from .diff import diff_data
+from .watch import start_watcher, get_watch_status
+from .jobs import start_generate_all_job, get_job_status, cancel_job
 
 __all__ = [
     "list_recipients",
     "generate_receipt",
+    "generate_receipts",
     "generate_all_receipts",
     "validate_data",
     "validate_template",
     "get_history",
     "get_person_history",
+    "diff_data",
+    "start_watcher",
+    "get_watch_status",
+    "start_generate_all_job",
+    "get_job_status",
+    "cancel_job",
 ]
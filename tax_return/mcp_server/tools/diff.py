@@ -0,0 +1,74 @@
+"""
+데이터 버전 비교 도구
+
+재발행 대상을 고를 수 있도록 이름과 바뀐 월만 알려주고, 금액은 응답에 넣지 않습니다.
+"""
+
+import os
+
+from .receipt import find_latest_data_file
+
+
+def _resolve(data_dir: str, data_file: str):
+    return os.path.join(data_dir, data_file) if not os.path.isabs(data_file) else data_file
+
+
+def diff_data(data_dir: str, old_file: str, new_file: str = None) -> dict:
+    """
+    두 데이터 파일 비교
+
+    Args:
+        old_file: 이전 버전 파일
+        new_file: 새 버전 파일 (미지정 시 가장 최신 연도 파일)
+
+    Returns:
+        추가/삭제/변경된 대상자 이름과 바뀐 월, 재발행 대상 이름
+    """
+    try:
+        from receipt_core.dataset import get_dataset
+        from receipt_core.diff import diff_donors, reissue_names
+
+        old_path = _resolve(data_dir, old_file)
+        if new_file:
+            new_path = _resolve(data_dir, new_file)
+        else:
+            new_path, _ = find_latest_data_file(data_dir)
+
+        if not new_path:
+            return {
+                "status": "error",
+                "message": "데이터 파일을 찾을 수 없습니다. YYYY_income_summary.xlsx 파일이 필요합니다."
+            }
+
+        for path in (old_path, new_path):
+            if not os.path.exists(path):
+                return {
+                    "status": "error",
+                    "message": f"데이터 파일을 찾을 수 없습니다: {os.path.basename(path)}"
+                }
+
+        diff = diff_donors(get_dataset(old_path).df, get_dataset(new_path).df)
+        reissue = reissue_names(diff)
+
+        return {
+            "status": "success",
+            "old_file": os.path.basename(old_path),
+            "new_file": os.path.basename(new_path),
+            "added": [d["name"] for d in diff["added"]],
+            "removed": [d["name"] for d in diff["removed"]],
+            "changed": [
+                {"name": d["name"], "months": [m["month"] for m in d["months"]]}
+                for d in diff["changed"]
+            ],
+            "renumbered": diff["renumbered"],
+            "unchanged": diff["unchanged"],
+            "reissue": reissue,
+            "message": f"추가 {len(diff['added'])}명, 삭제 {len(diff['removed'])}명, "
+                       f"변경 {len(diff['changed'])}명 (재발행 대상 {len(reissue)}명)"
+        }
+
+    except Exception as e:
+        return {
+            "status": "error",
+            "message": f"비교 실패: {str(e)}"
+        }
@@ -6,8 +6,8 @@
 
 import os
 import glob
-from datetime import datetime
-import pandas as pd
+
+from receipt_core.ledger import open_ledger, ledger_exists, sync_ledger
 
 
 def get_ledger_path(data_dir: str, year: int):
@@ -16,26 +16,36 @@ def get_ledger_path(data_dir: str, year: int):
 
 
 def find_latest_ledger(data_dir: str):
-    """가장 최신 발행대장 찾기"""
-    pattern = os.path.join(data_dir, "발행대장_*.xlsx")
-    files = glob.glob(pattern)
+    """가장 최신 발행대장 찾기 (엑셀 또는 저널)"""
+    files = glob.glob(os.path.join(data_dir, "발행대장_*.xlsx"))
+    files += glob.glob(os.path.join(data_dir, "발행대장_*.db"))
     if not files:
         return None, None
 
-    year_files = []
+    years = set()
     for f in files:
-        basename = os.path.basename(f)
+        basename = os.path.splitext(os.path.basename(f))[0]
         try:
-            year = int(basename.replace("발행대장_", "").replace(".xlsx", ""))
-            year_files.append((year, f))
+            years.add(int(basename.replace("발행대장_", "")))
         except ValueError:
             continue
 
-    if not year_files:
+    if not years:
         return None, None
 
-    year_files.sort(reverse=True)
-    return year_files[0][1], year_files[0][0]
+    year = max(years)
+    return get_ledger_path(data_dir, year), year
+
+
+def open_history(ledger_path: str):
+    """발행대장 저널을 읽기 전용으로 열기
+
+    조회 도구는 발행대장을 내보내지 않습니다.
+    저널 생성이나 엑셀 가져오기가 필요하면 데이터 폴더 쓰기 잠금 안에서 먼저 처리합니다.
+    (쓰기 풀을 기다리지 않으므로 전체 발행 작업 중에도 바로 응답)
+    """
+    sync_ledger(ledger_path)
+    return open_ledger(ledger_path, read_only=True)
 
 
 def get_history(data_dir: str, year: int = None) -> dict:
@@ -49,7 +59,7 @@ def get_history(data_dir: str, year: int = None) -> dict:
         # 연도 결정
         if year:
             ledger_path = get_ledger_path(data_dir, year)
-            if not os.path.exists(ledger_path):
+            if not ledger_exists(ledger_path):
                 return {
                     "status": "error",
                     "message": f"{year}년 발행 이력이 없습니다."
@@ -62,28 +72,25 @@ def get_history(data_dir: str, year: int = None) -> dict:
                     "message": "발행 이력이 없습니다. 아직 영수증을 발행하지 않았습니다."
                 }
 
-        # 발행대장 로드
-        df = pd.read_excel(ledger_path)
+        # 발행대장 통계 (저널에 유지되는 집계값)
+        with open_history(ledger_path) as ledger:
+            stats = ledger.summary()
+            import_warnings = ledger.import_warnings()
 
-        if df.empty:
+        if stats["total_records"] == 0:
             return {
                 "status": "info",
                 "year": year,
                 "message": f"{year}년 발행 이력이 없습니다."
             }
 
-        # 통계 계산
-        total_count = len(df)
-        unique_names = df["이름"].nunique()
-        reissue_count = len(df[df["비고"] == "재발행"])
+        total_count = stats["total_records"]
+        unique_names = stats["unique_recipients"]
+        reissue_count = stats["reissue_count"]
+        latest_date = stats["latest_date"]
+        total_amount = stats["total_amount"]
 
-        # 최근 발행 일시
-        latest_date = df["발행일시"].max() if "발행일시" in df.columns else None
-
-        # 총 금액
-        total_amount = df["연간총합"].sum() if "연간총합" in df.columns else 0
-
-        return {
+        result = {
             "status": "success",
             "year": year,
             "total_records": total_count,
@@ -95,6 +102,10 @@ def get_history(data_dir: str, year: int = None) -> dict:
             "message": f"{year}년 발행 이력: 총 {total_count}건 ({unique_names}명). "
                        f"상세 내역은 {os.path.basename(ledger_path)} 파일을 확인하세요."
         }
+        if import_warnings:
+            # 엑셀 발행대장에서 가져오지 못한 행 (행 번호만)
+            result["warnings"] = import_warnings
+        return result
 
     except Exception as e:
         return {
@@ -114,7 +125,7 @@ def get_person_history(data_dir: str, name: str, year: int = None) -> dict:
         # 연도 결정
         if year:
             ledger_path = get_ledger_path(data_dir, year)
-            if not os.path.exists(ledger_path):
+            if not ledger_exists(ledger_path):
                 return {
                     "status": "info",
                     "message": f"{year}년 발행 이력이 없습니다."
@@ -127,13 +138,11 @@ def get_person_history(data_dir: str, name: str, year: int = None) -> dict:
                     "message": "발행 이력이 없습니다."
                 }
 
-        # 발행대장 로드
-        df = pd.read_excel(ledger_path)
-
-        # 해당 이름 필터링
-        person_records = df[df["이름"] == name]
+        # 사람별 통계 (이름 인덱스 조회)
+        with open_history(ledger_path) as ledger:
+            person = ledger.person(name)
 
-        if person_records.empty:
+        if person is None:
             return {
                 "status": "info",
                 "year": year,
@@ -142,11 +151,10 @@ def get_person_history(data_dir: str, name: str, year: int = None) -> dict:
                 "message": f"'{name}'의 {year}년 발행 이력이 없습니다."
             }
 
-        # 발행 횟수 계산
-        issue_count = len(person_records)
-        reissue_count = len(person_records[person_records["비고"] == "재발행"])
-        latest_date = person_records["발행일시"].max()
-        receipt_no = person_records.iloc[-1]["발급번호"]
+        issue_count = person["issue_count"]
+        reissue_count = person["reissue_count"]
+        latest_date = person["latest_date"]
+        receipt_no = person["latest_receipt_no"]
 
         return {
             "status": "success",
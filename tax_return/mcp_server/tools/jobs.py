@@ -0,0 +1,182 @@
+"""
+백그라운드 전체 발행 작업
+
+전체 영수증 생성은 대상자가 많으면(PDF 포함) 오래 걸려 stdio 요청이 시간 초과될 수 있습니다.
+작업을 별도 스레드에서 실행하고 작업 ID만 바로 돌려준 뒤,
+상태 조회로 진행률/처리 속도를 확인하고 필요하면 중단합니다.
+발행대장 충돌을 막기 위해 작업은 다른 쓰기 도구와 같은 쓰기 풀에서 한 번에 하나씩 실행됩니다.
+"""
+
+import time
+import uuid
+import asyncio
+import threading
+from collections import OrderedDict
+from datetime import datetime
+
+from ..executor import write_executor
+from .receipt import generate_all_receipts
+
+
+# 완료된 작업을 포함해 기억하는 최대 작업 수
+MAX_JOBS = 20
+
+# 상태 조회에서 완료를 기다릴 때의 진행률 알림 간격/최대 대기 시간 (초)
+PROGRESS_INTERVAL = 0.5
+MAX_WAIT_SECONDS = 50
+
+_jobs = OrderedDict()
+_jobs_lock = threading.Lock()
+
+
+class ReceiptJob:
+    """전체 발행 작업 1건의 상태"""
+
+    def __init__(self, job_id):
+        self.id = job_id
+        self.status = "queued"
+        self.created_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self.started = None
+        self.finished = None
+        self.done = 0
+        self.total = None
+        self.result = None
+        self.cancel_event = threading.Event()
+
+    def update(self, done, total):
+        self.done = done
+        self.total = total
+
+    def snapshot(self):
+        """상태 조회 응답 (금액/이름 미포함)"""
+        now = self.finished or time.monotonic()
+        elapsed = now - self.started if self.started else 0.0
+        rate = self.done / elapsed if elapsed > 0 else 0.0
+
+        info = {
+            "status": self.status,
+            "job_id": self.id,
+            "created_at": self.created_at,
+            "done": self.done,
+            "total": self.total,
+            "percent": round(self.done * 100 / self.total, 1) if self.total else None,
+            "elapsed_seconds": round(elapsed, 1),
+            "receipts_per_second": round(rate, 2),
+        }
+        if self.status == "running" and rate > 0 and self.total:
+            info["eta_seconds"] = round((self.total - self.done) / rate, 1)
+        if self.result is not None:
+            info["result"] = self.result
+
+        messages = {
+            "queued": "앞선 쓰기 작업이 끝나기를 기다리는 중입니다.",
+            "running": f"영수증 생성 중입니다. ({self.done}/{self.total or '?'})",
+        }
+        info["message"] = messages.get(self.status) or (self.result or {}).get("message", "")
+        return info
+
+
+def _run(job, data_dir, data_file, template_file, jobs, incremental):
+    if job.cancel_event.is_set():
+        job.status = "cancelled"
+        job.result = {"status": "cancelled", "generated": 0, "message": "시작 전에 취소되었습니다."}
+        return
+
+    job.status = "running"
+    job.started = time.monotonic()
+    try:
+        result = generate_all_receipts(
+            data_dir, data_file, template_file, confirm=True, jobs=jobs, incremental=incremental,
+            progress=job.update, cancel_event=job.cancel_event,
+        )
+    except Exception as e:
+        result = {"status": "error", "message": f"전체 생성 실패: {str(e)}"}
+    job.finished = time.monotonic()
+    job.result = {k: result.get(k) for k in ("status", "generated", "skipped", "failed",
+                                             "output_dir", "ledger_path", "message") if k in result}
+    job.status = result["status"]
+
+
+def start_generate_all_job(
+    data_dir: str,
+    data_file: str = None,
+    template_file: str = None,
+    jobs: int = 1,
+    incremental: bool = False
+) -> dict:
+    """전체 영수증 생성을 백그라운드 작업으로 시작 (작업 ID를 바로 반환)"""
+    job = ReceiptJob(uuid.uuid4().hex[:8])
+    with _jobs_lock:
+        _jobs[job.id] = job
+        # 오래된 완료 작업 정리
+        while len(_jobs) > MAX_JOBS:
+            oldest = next((k for k, j in _jobs.items() if j.status not in ("queued", "running")), None)
+            if oldest is None:
+                break
+            del _jobs[oldest]
+
+    write_executor.submit(_run, job, data_dir, data_file, template_file, jobs, incremental)
+    return {
+        "status": "started",
+        "job_id": job.id,
+        "message": f"전체 영수증 생성을 시작했습니다. 작업 ID: {job.id} "
+                   f"(get_receipt_job_status로 진행 상황을 확인하세요)"
+    }
+
+
+def find_job(job_id: str = None):
+    """작업 ID의 작업 (없으면 가장 최근 작업, 작업이 없으면 None)"""
+    with _jobs_lock:
+        if job_id:
+            return _jobs.get(job_id)
+        return next(reversed(_jobs.values()), None)
+
+
+def get_job_status(job_id: str = None) -> dict:
+    """작업 진행 상황 (작업 ID를 생략하면 가장 최근 작업)"""
+    job = find_job(job_id)
+    if job is None:
+        return {
+            "status": "error",
+            "message": f"작업을 찾을 수 없습니다: {job_id}" if job_id else "실행한 작업이 없습니다."
+        }
+    return job.snapshot()
+
+
+def cancel_job(job_id: str) -> dict:
+    """작업 중단 요청 (이미 만든 영수증은 발행대장에 기록됨)"""
+    job = find_job(job_id)
+    if job is None:
+        return {
+            "status": "error",
+            "message": f"작업을 찾을 수 없습니다: {job_id}"
+        }
+    if job.status not in ("queued", "running"):
+        return {
+            "status": "info",
+            "job_id": job.id,
+            "message": f"이미 끝난 작업입니다. (상태: {job.status})"
+        }
+
+    job.cancel_event.set()
+    return {
+        "status": "success",
+        "job_id": job.id,
+        "message": "중단을 요청했습니다. 진행 중인 영수증까지 처리한 뒤 멈춥니다."
+    }
+
+
+async def wait_for_job(job_id: str = None, wait_seconds: float = 0, report_progress=None) -> dict:
+    """작업이 끝나거나 wait_seconds가 지날 때까지 기다린 뒤 상태 반환
+
+    report_progress(처리 수, 전체 수, 메시지) 코루틴으로 기다리는 동안 진행률을 알립니다.
+    (MCP 진행률 알림은 요청 중에만 보낼 수 있으므로 상태 조회 요청 안에서 보냄)
+    """
+    job = find_job(job_id)
+    if job is not None and wait_seconds and wait_seconds > 0:
+        deadline = time.monotonic() + min(wait_seconds, MAX_WAIT_SECONDS)
+        while job.status in ("queued", "running") and time.monotonic() < deadline:
+            if report_progress is not None and job.total:
+                await report_progress(job.done, job.total, f"영수증 생성 중 ({job.done}/{job.total})")
+            await asyncio.sleep(PROGRESS_INTERVAL)
+    return get_job_status(job.id if job is not None else job_id)
@@ -7,9 +7,29 @@
 import os
 import re
 import glob
-from datetime import datetime
-import pandas as pd
-from docxtpl import DocxTemplate
+import importlib
+
+from receipt_core.ledger import open_ledger
+from receipt_core.manifest import RenderManifest, context_hash
+from receipt_core.receipt_index import file_sha256
+
+from ..executor import submit_write_once
+
+# pandas/docxtpl을 불러오는 receipt_core 모듈(dataset, template, batch)은 도구를 처음 호출할 때 import합니다.
+# (MCP 서버 시작과 initialize 응답이 무거운 라이브러리 로딩을 기다리지 않도록)
+
+# 예전부터 이 모듈에서 가져다 쓰던 함수 -> 실제 모듈 (처음 접근할 때 import)
+LAZY_EXPORTS = {
+    "format_amount": "receipt_core.template",
+    "build_context": "receipt_core.template",
+    "load_data": "receipt_core.dataset",
+}
+
+
+def __getattr__(name):
+    if name in LAZY_EXPORTS:
+        return getattr(importlib.import_module(LAZY_EXPORTS[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 # 필수 컬럼
@@ -57,108 +77,15 @@ def get_issue_year(data_year: int):
     return (data_year + 1) % 100
 
 
-def format_amount(amount):
-    """금액을 천 단위 콤마 포맷으로 변환"""
-    if pd.isna(amount) or amount == 0:
-        return ""
-    return f"{int(amount):,}"
-
-
-def load_data(file_path: str):
-    """Excel 파일에서 데이터 로드 및 이름 분리"""
-    df = pd.read_excel(file_path)
-
-    # 마지막 행(합계)은 제외
-    df = df[df["이름"] != "합계"].copy()
-
-    # NaN을 0으로 처리
-    month_cols = [f"{i}월" for i in range(1, 13)]
-    for col in month_cols + ["연간 총합"]:
-        if col in df.columns:
-            df[col] = df[col].fillna(0).astype(int)
-
-    # 쉼표로 구분된 이름 분리하여 확장
-    expanded_rows = []
-    for _, row in df.iterrows():
-        name = row["이름"]
-        if "," in str(name):
-            names = [n.strip() for n in str(name).split(",")]
-            for individual_name in names:
-                new_row = row.copy()
-                new_row["이름"] = individual_name
-                expanded_rows.append(new_row)
-        else:
-            expanded_rows.append(row)
-
-    result_df = pd.DataFrame(expanded_rows)
-    result_df = result_df.sort_values("이름").reset_index(drop=True)
-
-    return result_df
-
-
 def get_ledger_path(data_dir: str, issue_year: int):
     """발행대장 파일 경로 반환"""
     return os.path.join(data_dir, f"발행대장_{2000 + issue_year}.xlsx")
 
 
-def load_or_create_ledger(ledger_path: str):
-    """발행대장 로드 또는 생성"""
-    if os.path.exists(ledger_path):
-        return pd.read_excel(ledger_path)
-    else:
-        return pd.DataFrame(columns=["발급번호", "이름", "연간총합", "발행일시", "파일경로", "비고"])
-
-
-def save_ledger(df, ledger_path: str):
-    """발행대장 저장"""
-    df.to_excel(ledger_path, index=False)
-
-
-def add_to_ledger(ledger_df, receipt_no, name, total, file_path, note=""):
-    """발행대장에 기록 추가"""
-    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-
-    # 기존 기록 확인 (동일 발급번호)
-    existing = ledger_df[ledger_df["발급번호"] == receipt_no]
-    if not existing.empty:
-        note = "재발행"
-
-    new_row = pd.DataFrame([{
-        "발급번호": receipt_no,
-        "이름": name,
-        "연간총합": total,
-        "발행일시": now,
-        "파일경로": file_path,
-        "비고": note
-    }])
-
-    return pd.concat([ledger_df, new_row], ignore_index=True)
-
-
-def create_receipt_file(template_path, name, monthly_amounts, total_amount, receipt_no, output_path):
-    """템플릿 기반 DOCX 영수증 생성"""
-    template = DocxTemplate(template_path)
-
-    context = {
-        "receipt_no": receipt_no,
-        "name": name,
-        "month_1": format_amount(monthly_amounts.get("1월", 0)),
-        "month_2": format_amount(monthly_amounts.get("2월", 0)),
-        "month_3": format_amount(monthly_amounts.get("3월", 0)),
-        "month_4": format_amount(monthly_amounts.get("4월", 0)),
-        "month_5": format_amount(monthly_amounts.get("5월", 0)),
-        "month_6": format_amount(monthly_amounts.get("6월", 0)),
-        "month_7": format_amount(monthly_amounts.get("7월", 0)),
-        "month_8": format_amount(monthly_amounts.get("8월", 0)),
-        "month_9": format_amount(monthly_amounts.get("9월", 0)),
-        "month_10": format_amount(monthly_amounts.get("10월", 0)),
-        "month_11": format_amount(monthly_amounts.get("11월", 0)),
-        "month_12": format_amount(monthly_amounts.get("12월", 0)),
-        "total": format_amount(total_amount),
-    }
-
-    template.render(context)
-    template.save(output_path)
+def export_ledger(ledger_path: str):
+    """엑셀 발행대장이 저널보다 오래되었으면 다시 쓰기"""
+    with open_ledger(ledger_path) as ledger:
+        return ledger.export_xlsx()
 
 
 # =============================================================================
@@ -173,6 +100,8 @@ def list_recipients(data_dir: str, data_file: str = None) -> dict:
         총 인원수와 총 금액만 반환 (이름 목록 미포함)
     """
     try:
+        from receipt_core.dataset import get_dataset
+
         # 데이터 파일 결정
         if data_file:
             file_path = os.path.join(data_dir, data_file) if not os.path.isabs(data_file) else data_file
@@ -186,10 +115,10 @@ def list_recipients(data_dir: str, data_file: str = None) -> dict:
                 "message": "데이터 파일을 찾을 수 없습니다. YYYY_income_summary.xlsx 파일이 필요합니다."
             }
 
-        # 데이터 로드
-        df = load_data(file_path)
-        total_count = len(df)
-        total_amount = df["연간 총합"].sum()
+        # 데이터 로드 (파일이 바뀌지 않았으면 캐시 사용)
+        table = get_dataset(file_path).table
+        total_count = len(table)
+        total_amount = table.totals.sum()
         issue_year = get_issue_year(data_year) if data_year else 26
 
         return {
@@ -222,6 +151,9 @@ def generate_receipt(
         생성 결과 (금액 정보 미포함)
     """
     try:
+        from receipt_core.dataset import get_dataset
+        from receipt_core.template import get_compiled_template
+
         # 데이터 파일 결정
         if data_file:
             file_path = os.path.join(data_dir, data_file) if not os.path.isabs(data_file) else data_file
@@ -247,31 +179,23 @@ def generate_receipt(
                 "message": f"템플릿 파일이 없습니다: {os.path.basename(tpl_path)}"
             }
 
-        # 데이터 로드
-        df = load_data(file_path)
+        # 데이터 로드 (파일이 바뀌지 않았으면 캐시 사용)
+        dataset = get_dataset(file_path)
+        table = dataset.table
         issue_year = get_issue_year(data_year) if data_year else 26
 
         # 대상자 찾기
-        target = df[df["이름"] == name]
-        if target.empty:
+        position = table.find(name)
+        if position is None:
             return {
                 "status": "error",
                 "message": f"'{name}'을(를) 찾을 수 없습니다. 이름을 정확히 입력했는지 확인하세요."
             }
 
-        row = target.iloc[0]
-
         # 발급번호 생성 (전체 목록 기준)
-        receipt_no_map = {
-            r["이름"]: f"{RECEIPT_PREFIX}{issue_year}-{idx+1:03d}"
-            for idx, r in df.iterrows()
-        }
+        receipt_no_map = dataset.receipt_no_map(issue_year, RECEIPT_PREFIX)
         receipt_no = receipt_no_map.get(name, f"{RECEIPT_PREFIX}{issue_year}-000")
-
-        # 월별 금액
-        month_cols = [f"{i}월" for i in range(1, 13)]
-        monthly_amounts = {col: row[col] for col in month_cols}
-        total_amount = row["연간 총합"]
+        total_amount = int(table.totals[position])
 
         # 출력 경로
         output_dir = os.path.join(data_dir, DEFAULT_OUTPUT_DIR)
@@ -280,13 +204,13 @@ def generate_receipt(
         output_path = os.path.join(output_dir, f"기부금영수증_{safe_name}.docx")
 
         # 영수증 생성
-        create_receipt_file(tpl_path, name, monthly_amounts, total_amount, receipt_no, output_path)
+        get_compiled_template(tpl_path).save(table.context(position, receipt_no), output_path)
 
-        # 발행대장 기록
+        # 발행대장 저널에만 기록하고, 엑셀 발행대장은 앞선 쓰기 작업이 끝난 뒤 한 번만 다시 씀
         ledger_path = get_ledger_path(data_dir, issue_year)
-        ledger_df = load_or_create_ledger(ledger_path)
-        ledger_df = add_to_ledger(ledger_df, receipt_no, name, total_amount, output_path)
-        save_ledger(ledger_df, ledger_path)
+        with open_ledger(ledger_path) as ledger:
+            ledger.append(receipt_no, name, total_amount, output_path)
+        submit_write_once(("export_ledger", os.path.abspath(ledger_path)), export_ledger, ledger_path)
 
         return {
             "status": "success",
@@ -303,19 +227,152 @@ def generate_receipt(
         }
 
 
+def generate_receipts(
+    data_dir: str,
+    names: list,
+    data_file: str = None,
+    template_file: str = None,
+    jobs: int = 1
+) -> dict:
+    """
+    여러 사람의 영수증을 한 번에 생성
+
+    데이터/발급번호/템플릿은 한 번만 읽고, 발행대장은 한 번에 기록합니다.
+    같은 이름을 여러 번 지정하면 한 번만 생성합니다.
+
+    Returns:
+        이름별 결과 (금액 정보 미포함)
+    """
+    try:
+        from receipt_core.dataset import get_dataset
+        from receipt_core.batch import render_receipts
+
+        # 데이터 파일 결정
+        if data_file:
+            file_path = os.path.join(data_dir, data_file) if not os.path.isabs(data_file) else data_file
+            data_year = extract_year_from_filename(file_path)
+        else:
+            file_path, data_year = find_latest_data_file(data_dir)
+
+        if not file_path or not os.path.exists(file_path):
+            return {
+                "status": "error",
+                "message": "데이터 파일을 찾을 수 없습니다."
+            }
+
+        # 템플릿 파일 결정
+        if template_file:
+            tpl_path = os.path.join(data_dir, template_file) if not os.path.isabs(template_file) else template_file
+        else:
+            tpl_path = os.path.join(data_dir, DEFAULT_TEMPLATE)
+
+        if not os.path.exists(tpl_path):
+            return {
+                "status": "error",
+                "message": f"템플릿 파일이 없습니다: {os.path.basename(tpl_path)}"
+            }
+
+        names = list(dict.fromkeys(names or []))
+        if not names:
+            return {
+                "status": "error",
+                "message": "생성할 이름을 하나 이상 지정하세요."
+            }
+
+        # 데이터 로드 (파일이 바뀌지 않았으면 캐시 사용)
+        dataset = get_dataset(file_path)
+        table = dataset.table
+        issue_year = get_issue_year(data_year) if data_year else 26
+        receipt_no_map = dataset.receipt_no_map(issue_year, RECEIPT_PREFIX)
+
+        output_dir = os.path.join(data_dir, DEFAULT_OUTPUT_DIR)
+        os.makedirs(output_dir, exist_ok=True)
+
+        # 이름 -> 결과 (입력 순서 유지)
+        outcomes = {}
+        targets = []
+        items = []
+        for name in names:
+            position = table.find(name)
+            if position is None:
+                outcomes[name] = {"name": name, "status": "not_found"}
+                continue
+            receipt_no = receipt_no_map.get(name, f"{RECEIPT_PREFIX}{issue_year}-000")
+            safe_name = name.replace("/", "_").replace("\\", "_")
+            output_path = os.path.join(output_dir, f"기부금영수증_{safe_name}.docx")
+            targets.append((name, receipt_no, int(table.totals[position]), output_path))
+            items.append((table.context(position, receipt_no), output_path))
+
+        ledger_records = []
+        results = render_receipts(tpl_path, items, jobs=jobs)
+        for (name, receipt_no, total_amount, output_path), result in zip(targets, results):
+            if result["error"]:
+                outcomes[name] = {"name": name, "status": "failed", "receipt_no": receipt_no}
+                continue
+            ledger_records.append((receipt_no, name, total_amount, output_path))
+            outcomes[name] = {"name": name, "status": "success", "receipt_no": receipt_no,
+                              "file_path": output_path}
+
+        # 발행대장 저널에 한 번에 기록하고 엑셀 발행대장 갱신
+        ledger_path = get_ledger_path(data_dir, issue_year)
+        if ledger_records:
+            with open_ledger(ledger_path) as ledger:
+                ledger.append_many(ledger_records)
+                ledger.export_xlsx()
+
+        receipts = [outcomes[name] for name in names]
+        not_found = sum(1 for r in receipts if r["status"] == "not_found")
+        failed = sum(1 for r in receipts if r["status"] == "failed")
+
+        message = f"{len(ledger_records)}명의 영수증이 생성되었습니다. 폴더: {output_dir}"
+        if not_found:
+            message += f" (찾을 수 없음 {not_found}명)"
+        if failed:
+            message += f" (실패 {failed}명)"
+
+        return {
+            "status": "success" if len(ledger_records) == len(names)
+            else "warning" if ledger_records else "error",
+            "generated": len(ledger_records),
+            "not_found": not_found,
+            "failed": failed,
+            "receipts": receipts,
+            "output_dir": output_dir,
+            "ledger_path": ledger_path,
+            "message": message
+        }
+
+    except Exception as e:
+        return {
+            "status": "error",
+            "message": f"영수증 생성 실패: {str(e)}"
+        }
+
+
 def generate_all_receipts(
     data_dir: str,
     data_file: str = None,
     template_file: str = None,
-    confirm: bool = False
+    confirm: bool = False,
+    jobs: int = 1,
+    incremental: bool = False,
+    progress=None,
+    cancel_event=None
 ) -> dict:
     """
     전체 영수증 생성
 
     confirm=False: 미리보기 (생성 안 함)
     confirm=True: 실제 생성
+    jobs: 병렬 작업자 프로세스 수 (0이면 CPU 코어 수)
+    incremental: 데이터/템플릿이 바뀐 대상자만 다시 생성 (발행대장도 그 대상자만 기록)
+    progress: 영수증마다 progress(처리 수, 전체 수) 호출 (백그라운드 작업용)
+    cancel_event: 설정되면 중단 (이미 만든 영수증은 발행대장에 기록)
     """
     try:
+        from receipt_core.dataset import get_dataset
+        from receipt_core.batch import render_receipts
+
         # 데이터 파일 결정
         if data_file:
             file_path = os.path.join(data_dir, data_file) if not os.path.isabs(data_file) else data_file
@@ -329,10 +386,11 @@ def generate_all_receipts(
                 "message": "데이터 파일을 찾을 수 없습니다."
             }
 
-        # 데이터 로드
-        df = load_data(file_path)
-        total_count = len(df)
-        total_amount = df["연간 총합"].sum()
+        # 데이터 로드 (파일이 바뀌지 않았으면 캐시 사용)
+        dataset = get_dataset(file_path)
+        table = dataset.table
+        total_count = len(table)
+        total_amount = table.totals.sum()
         issue_year = get_issue_year(data_year) if data_year else 26
 
         # 미리보기 모드
@@ -364,45 +422,78 @@ def generate_all_receipts(
         os.makedirs(output_dir, exist_ok=True)
 
         # 발급번호 매핑
-        receipt_no_map = {
-            row["이름"]: f"{RECEIPT_PREFIX}{issue_year}-{idx+1:03d}"
-            for idx, row in df.iterrows()
-        }
+        receipt_no_map = dataset.receipt_no_map(issue_year, RECEIPT_PREFIX)
 
-        # 발행대장 로드
         ledger_path = get_ledger_path(data_dir, issue_year)
-        ledger_df = load_or_create_ledger(ledger_path)
 
-        month_cols = [f"{i}월" for i in range(1, 13)]
         success_count = 0
         failed_count = 0
+        skipped_count = 0
+        ledger_records = []
+
+        # 이전 실행과 입력이 같은 대상자는 증분 모드에서 건너뜀
+        manifest = RenderManifest(output_dir)
+        template_hash = file_sha256(tpl_path)
 
-        for _, row in df.iterrows():
-            name = row["이름"]
+        targets = []
+        items = []
+        for position, name in enumerate(table.names):
             receipt_no = receipt_no_map.get(name, f"{RECEIPT_PREFIX}{issue_year}-000")
-            monthly_amounts = {col: row[col] for col in month_cols}
-            total_amount_row = row["연간 총합"]
+            total_amount_row = int(table.totals[position])
             safe_name = name.replace("/", "_").replace("\\", "_")
             output_path = os.path.join(output_dir, f"기부금영수증_{safe_name}.docx")
-
-            try:
-                create_receipt_file(tpl_path, name, monthly_amounts, total_amount_row, receipt_no, output_path)
-                ledger_df = add_to_ledger(ledger_df, receipt_no, name, total_amount_row, output_path)
-                success_count += 1
-            except Exception:
+            context = table.context(position, receipt_no)
+            targets.append((name, receipt_no, total_amount_row, output_path, context_hash(context)))
+            items.append((context, output_path))
+
+        if incremental:
+            unchanged = manifest.unchanged_outputs([(t[3], t[4], t[1]) for t in targets], template_hash)
+            keep = [i for i, t in enumerate(targets) if t[3] not in unchanged]
+            skipped_count = len(targets) - len(keep)
+            targets = [targets[i] for i in keep]
+            items = [items[i] for i in keep]
+
+        # 결과는 입력 순서대로 돌아오므로 발행대장 순서가 유지됨
+        cancelled = False
+        if progress:
+            progress(0, len(targets))
+        results = render_receipts(tpl_path, items, jobs=jobs)
+        for done, (target, result) in enumerate(zip(targets, results), start=1):
+            name, receipt_no, total_amount_row, output_path, row_hash = target
+            if result["error"]:
                 failed_count += 1
-
-        # 발행대장 저장
-        save_ledger(ledger_df, ledger_path)
+            else:
+                manifest.record(output_path, row_hash, template_hash, receipt_no)
+                ledger_records.append((receipt_no, name, total_amount_row, output_path))
+                success_count += 1
+            if progress:
+                progress(done, len(targets))
+            if cancel_event is not None and cancel_event.is_set():
+                cancelled = True
+                break
+        # 중단 시 작업자 프로세스 정리
+        results.close()
+
+        # 발행대장 저널에 기록 후 엑셀로 내보내기
+        with open_ledger(ledger_path) as ledger:
+            ledger.append_many(ledger_records)
+            ledger.export_xlsx()
+        manifest.save()
+
+        message = f"{success_count}명의 영수증이 생성되었습니다. 폴더: {output_dir}"
+        if skipped_count:
+            message += f" (변경 없음 {skipped_count}명 건너뜀)"
+        if cancelled:
+            message = f"중단되었습니다. {message}"
 
         return {
-            "status": "success",
+            "status": "cancelled" if cancelled else "success",
             "generated": success_count,
+            "skipped": skipped_count,
             "failed": failed_count,
             "output_dir": output_dir,
             "ledger_path": ledger_path,
-            "message": f"{success_count}명의 영수증이 생성되었습니다. "
-                       f"폴더: {output_dir}"
+            "message": message
         }
 
     except Exception as e:
@@ -420,6 +511,8 @@ def preview_receipt(data_dir: str, name: str, data_file: str = None) -> dict:
         영수증 내용 텍스트 형식
     """
     try:
+        from receipt_core.dataset import get_dataset
+
         # 데이터 파일 결정
         if data_file:
             file_path = os.path.join(data_dir, data_file) if not os.path.isabs(data_file) else data_file
@@ -433,36 +526,30 @@ def preview_receipt(data_dir: str, name: str, data_file: str = None) -> dict:
                 "message": "데이터 파일을 찾을 수 없습니다."
             }
 
-        # 데이터 로드
-        df = load_data(file_path)
+        # 데이터 로드 (파일이 바뀌지 않았으면 캐시 사용)
+        dataset = get_dataset(file_path)
+        table = dataset.table
         issue_year = get_issue_year(data_year) if data_year else 26
 
         # 대상자 찾기
-        target = df[df["이름"] == name]
-        if target.empty:
+        position = table.find(name)
+        if position is None:
             return {
                 "status": "error",
                 "message": f"'{name}'을(를) 찾을 수 없습니다."
             }
 
-        row = target.iloc[0]
-
         # 발급번호 생성
-        receipt_no_map = {
-            r["이름"]: f"{RECEIPT_PREFIX}{issue_year}-{idx+1:03d}"
-            for idx, r in df.iterrows()
-        }
+        receipt_no_map = dataset.receipt_no_map(issue_year, RECEIPT_PREFIX)
         receipt_no = receipt_no_map.get(name, f"{RECEIPT_PREFIX}{issue_year}-000")
 
-        # 월별 금액 텍스트 생성
-        month_cols = [f"{i}월" for i in range(1, 13)]
-        monthly_text = []
-        for col in month_cols:
-            amount = row[col]
-            if amount > 0:
-                monthly_text.append(f"  {col}: {format_amount(amount)}원")
-
-        total_amount = row["연간 총합"]
+        # 월별 금액 텍스트 생성 (미리 포맷된 문자열 사용)
+        monthly_text = [
+            f"  {month}월: {text}원"
+            for month, (amount, text) in enumerate(
+                zip(table.monthly[position], table.monthly_text[position]), start=1)
+            if amount > 0
+        ]
 
         preview_text = f"""
 ┌─────────────────────────────────────┐
@@ -474,7 +561,7 @@ def preview_receipt(data_dir: str, name: str, data_file: str = None) -> dict:
 │ 기부 내역:
 {chr(10).join(monthly_text)}
 │ ───────────────────────────────────
-│ 합계: {format_amount(total_amount)}원
+│ 합계: {table.total_text[position]}원
 └─────────────────────────────────────┘
 """
 
@@ -7,22 +7,12 @@
 import os
 import re
 import glob
-import pandas as pd
-from docxtpl import DocxTemplate
 
 
 # 필수 컬럼
 REQUIRED_COLUMNS = ["이름", "1월", "2월", "3월", "4월", "5월", "6월",
                     "7월", "8월", "9월", "10월", "11월", "12월", "연간 총합"]
 
-# 필수 placeholder
-REQUIRED_PLACEHOLDERS = [
-    "receipt_no", "name",
-    "month_1", "month_2", "month_3", "month_4", "month_5", "month_6",
-    "month_7", "month_8", "month_9", "month_10", "month_11", "month_12",
-    "total"
-]
-
 DEFAULT_TEMPLATE = "donation_receipt_template.docx"
 
 
@@ -55,6 +45,9 @@ def validate_data(data_dir: str, data_file: str = None) -> dict:
         검증 결과 (오류는 행 번호만, 이름 미포함)
     """
     try:
+        from receipt_core.reader import read_income_summary
+        from receipt_core.validation import data_warnings
+
         # 데이터 파일 결정
         if data_file:
             file_path = os.path.join(data_dir, data_file) if not os.path.isabs(data_file) else data_file
@@ -69,7 +62,7 @@ def validate_data(data_dir: str, data_file: str = None) -> dict:
 
         # 파일 읽기 시도
         try:
-            df = pd.read_excel(file_path)
+            df = read_income_summary(file_path, REQUIRED_COLUMNS)
         except Exception as e:
             return {
                 "status": "error",
@@ -88,45 +81,8 @@ def validate_data(data_dir: str, data_file: str = None) -> dict:
         if len(df) == 0:
             errors.append("데이터가 없습니다 (빈 파일)")
 
-        # 3. 금액 컬럼 검증
-        month_cols = [f"{i}월" for i in range(1, 13)] + ["연간 총합"]
-        for col in month_cols:
-            if col not in df.columns:
-                continue
-
-            # 숫자가 아닌 값 확인 (행 번호만 표시)
-            for idx, value in df[col].items():
-                if pd.notna(value) and not isinstance(value, (int, float)):
-                    warnings.append(f"행 {idx+2}: '{col}' 컬럼에 숫자가 아닌 값")
-
-                # 음수 값 확인
-                if isinstance(value, (int, float)) and value < 0:
-                    warnings.append(f"행 {idx+2}: '{col}' 컬럼에 음수 값")
-
-        # 4. 월별 합계 검증 (연간 총합과 비교)
-        if all(col in df.columns for col in month_cols):
-            month_only_cols = [f"{i}월" for i in range(1, 13)]
-            for idx, row in df.iterrows():
-                monthly_sum = sum(row[col] if pd.notna(row[col]) and isinstance(row[col], (int, float)) else 0
-                                  for col in month_only_cols)
-                annual_total = row["연간 총합"] if pd.notna(row["연간 총합"]) else 0
-
-                if abs(monthly_sum - annual_total) > 1:  # 1원 오차 허용
-                    warnings.append(f"행 {idx+2}: 월별 합계({int(monthly_sum)})와 연간 총합({int(annual_total)})이 다름")
-
-        # 5. 중복 이름 확인 (개수만)
-        if "이름" in df.columns:
-            # 쉼표로 분리된 이름 확장
-            all_names = []
-            for name in df["이름"].dropna():
-                if "," in str(name):
-                    all_names.extend([n.strip() for n in str(name).split(",")])
-                else:
-                    all_names.append(str(name))
-
-            duplicates = [name for name in set(all_names) if all_names.count(name) > 1]
-            if duplicates:
-                warnings.append(f"중복된 이름 {len(duplicates)}건 (상세 내용은 파일에서 확인)")
+        # 3. 금액 컬럼(숫자 아님/음수), 4. 월별 합계, 5. 중복 이름 (개수만)
+        warnings.extend(data_warnings(df))
 
         # 결과 반환
         if errors:
@@ -168,6 +124,9 @@ def validate_template(data_dir: str, template_file: str = None) -> dict:
         검증 결과 (누락된 placeholder 목록)
     """
     try:
+        # 필수 placeholder는 receipt_core.template.RECEIPT_FIELDS (CLI/PDF 렌더러와 같은 목록)
+        from receipt_core.template import analyze_placeholders, RECEIPT_FIELDS
+
         # 템플릿 파일 결정
         if template_file:
             file_path = os.path.join(data_dir, template_file) if not os.path.isabs(template_file) else template_file
@@ -180,37 +139,29 @@ def validate_template(data_dir: str, template_file: str = None) -> dict:
                 "message": f"템플릿 파일이 없습니다: {os.path.basename(file_path)}"
             }
 
-        # 템플릿 로드 및 placeholder 추출
+        # XML 파트에서 placeholder 추출 (렌더링 없이, 템플릿 해시 기준 캐시)
         try:
-            template = DocxTemplate(file_path)
-            # docxtpl의 undeclared_template_variables를 사용하여 placeholder 확인
-            # 실제로는 렌더링 시도를 해봐야 알 수 있음
+            analysis = analyze_placeholders(file_path, RECEIPT_FIELDS)
         except Exception as e:
             return {
                 "status": "error",
                 "message": f"템플릿 파일을 읽을 수 없습니다: {str(e)}"
             }
 
-        # 테스트 렌더링으로 placeholder 확인
-        test_context = {p: "TEST" for p in REQUIRED_PLACEHOLDERS}
-
-        try:
-            template.render(test_context)
-        except Exception as e:
-            error_msg = str(e)
-            # Jinja2 에러에서 누락된 변수 추출 시도
-            if "undefined" in error_msg.lower():
-                return {
-                    "status": "warning",
-                    "file": os.path.basename(file_path),
-                    "message": f"템플릿에 정의되지 않은 변수가 있을 수 있습니다: {error_msg}"
-                }
+        problems = []
+        if analysis["missing"]:
+            problems.append(f"필수 placeholder {len(analysis['missing'])}개 누락: {', '.join(analysis['missing'])}")
+        if analysis["extra"]:
+            problems.append(f"알 수 없는 placeholder (빈 칸으로 출력됨): {', '.join(analysis['extra'])}")
 
         return {
-            "status": "success",
+            "status": "warning" if problems else "success",
             "file": os.path.basename(file_path),
-            "required_placeholders": REQUIRED_PLACEHOLDERS,
-            "message": "템플릿 파일이 유효합니다. 필수 placeholder가 모두 포함되어 있는지 직접 확인하세요."
+            "required_placeholders": list(RECEIPT_FIELDS),
+            "missing_placeholders": analysis["missing"],
+            "extra_placeholders": analysis["extra"],
+            "message": ("템플릿 확인이 필요합니다. " + " / ".join(problems)) if problems
+            else "템플릿 파일이 유효합니다. 필수 placeholder가 모두 포함되어 있습니다."
         }
 
     except Exception as e:
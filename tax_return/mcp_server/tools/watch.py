@@ -0,0 +1,72 @@
+"""
+백그라운드 자동 재발행
+
+RECEIPT_WATCH=1로 서버를 실행하면 데이터 폴더의 *_income_summary.xlsx와 템플릿을 감시하다가
+바뀐 대상자의 영수증만 다시 생성합니다. (stdio 통신을 방해하지 않도록 화면 출력 없음)
+"""
+
+import os
+import threading
+from datetime import datetime
+
+from receipt_core.watch import watch, DEFAULT_INTERVAL, DEFAULT_DEBOUNCE
+
+from ..executor import write_executor
+from .receipt import generate_all_receipts, DEFAULT_TEMPLATE
+
+
+# 마지막 자동 재발행 결과
+_status = {"running": False, "last_run": None, "changed_files": [], "result": None}
+_status_lock = threading.Lock()
+
+
+def _regenerate(data_dir: str, changed):
+    # 다른 쓰기 도구와 겹치지 않도록 쓰기 풀에서 실행
+    result = write_executor.submit(generate_all_receipts, data_dir, confirm=True, incremental=True).result()
+    with _status_lock:
+        _status["last_run"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        _status["changed_files"] = sorted(os.path.basename(p) for p in changed)
+        _status["result"] = {k: result.get(k) for k in ("status", "generated", "skipped", "failed", "message")}
+
+
+def start_watcher(data_dir: str, interval: float = DEFAULT_INTERVAL, debounce: float = DEFAULT_DEBOUNCE):
+    """감시 스레드 시작 (중지용 Event 반환)"""
+    stop_event = threading.Event()
+    patterns = [
+        os.path.join(data_dir, "*_income_summary.xlsx"),
+        os.path.join(data_dir, DEFAULT_TEMPLATE),
+    ]
+
+    def run():
+        with _status_lock:
+            _status["running"] = True
+        try:
+            watch(patterns, lambda changed: _regenerate(data_dir, changed),
+                  interval=interval, debounce=debounce, stop_event=stop_event)
+        finally:
+            with _status_lock:
+                _status["running"] = False
+
+    threading.Thread(target=run, name="receipt-watcher", daemon=True).start()
+    return stop_event
+
+
+def get_watch_status() -> dict:
+    """자동 재발행 상태"""
+    with _status_lock:
+        status = dict(_status)
+
+    if not status["running"]:
+        return {
+            "status": "disabled",
+            "message": "자동 재발행이 꺼져 있습니다. RECEIPT_WATCH=1로 서버를 실행하세요."
+        }
+
+    return {
+        "status": "success",
+        "last_run": status["last_run"],
+        "changed_files": status["changed_files"],
+        "result": status["result"],
+        "message": f"마지막 자동 재발행: {status['last_run']}" if status["last_run"]
+                   else "파일 변경을 기다리는 중입니다."
+    }
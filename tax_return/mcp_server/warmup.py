@@ -0,0 +1,51 @@
+"""
+MCP 서버 백그라운드 예열
+
+도구 모듈은 pandas/docxtpl(openpyxl, lxml, jinja2 포함)을 처음 호출할 때 불러오므로
+서버 시작과 initialize 응답은 빠르지만, 첫 도구 호출이 그만큼 느려집니다.
+initialize 응답을 보낸 뒤 읽기 풀에서 이 모듈들을 미리 import해 두면
+사용자가 첫 질문을 입력하는 동안 로딩이 끝납니다. (RECEIPT_WARMUP=0이면 사용 안 함)
+"""
+
+import os
+import time
+import importlib
+import threading
+
+from .executor import read_executor
+
+
+WARMUP_ENABLED = os.environ.get("RECEIPT_WARMUP", "1").lower() not in ("0", "false", "no")
+
+# 도구가 처음 호출될 때 불러오는 모듈 (무거운 순서)
+WARMUP_MODULES = (
+    "receipt_core.template",  # docxtpl, jinja2, lxml, pandas
+    "receipt_core.dataset",   # pandas, numpy
+    "receipt_core.batch",
+    "receipt_core.validation",
+    "receipt_core.diff",
+    "openpyxl",               # 데이터 파일 읽기, 발행대장 내보내기
+)
+
+_started = threading.Event()
+
+
+def warm_up(modules=WARMUP_MODULES) -> dict:
+    """모듈을 미리 import (설치되지 않은 모듈은 건너뛰고 첫 도구 호출에서 오류를 알림)"""
+    start = time.perf_counter()
+    failed = []
+    for name in modules:
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            failed.append(name)
+    return {"seconds": round(time.perf_counter() - start, 2), "failed": failed}
+
+
+def start_warmup():
+    """백그라운드 예열 시작 (여러 번 불러도 한 번만 실행)"""
+    if not WARMUP_ENABLED or _started.is_set():
+        return None
+    _started.set()
+    return read_executor.submit(warm_up)
+
@@ -0,0 +1 @@
+"""기부금 영수증 공용 엔진 (CLI와 MCP 서버가 함께 사용)"""
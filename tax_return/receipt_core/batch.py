@@ -0,0 +1,107 @@
+"""
+영수증 일괄 렌더링
+
+여러 영수증을 프로세스 풀(--jobs)로 나누어 렌더링합니다.
+결과는 입력 순서대로 반환되므로 발급번호와 발행대장 순서가 항상 같습니다.
+PDF는 네이티브 렌더러(pdf_native)로 함께 그리거나,
+렌더링이 끝난 뒤 pdf.convert_many로 묶어서 변환합니다.
+"""
+
+import os
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from .template import get_compiled_template
+from .pdf import pdf_path_for
+
+
+# 길이를 모르는 입력(제너레이터)을 보낼 때 한 번에 묶는 작업 수
+STREAM_CHUNK_SIZE = 16
+
+# 작업자 프로세스 시작 방식: MCP 서버는 다른 스레드(읽기 풀, 예열 import)가 도는 중에 풀을 만들므로
+# fork하면 그 순간 잡혀 있던 잠금(import 잠금, 데이터 캐시 잠금 등)을 자식이 물려받아 멈출 수 있음
+MP_START_METHOD = "spawn"
+
+
+def resolve_jobs(jobs):
+    """작업자 수 결정 (0 이하면 CPU 코어 수)"""
+    if jobs is None:
+        return 1
+    if jobs <= 0:
+        return os.cpu_count() or 1
+    return jobs
+
+
+def _render_task(task):
+    """영수증 1건 렌더링 (작업자 프로세스에서 실행)"""
+    template_path, context, output_path, native_pdf, layout_path = task
+    result = {"output_path": output_path, "pdf_path": None, "error": None}
+    try:
+        # 작업자마다 템플릿/글꼴은 한 번만 로드됨 (프로세스 캐시)
+        get_compiled_template(template_path).save(context, output_path)
+        if native_pdf:
+            from .pdf_native import render_pdf
+            result["pdf_path"] = render_pdf(context, pdf_path_for(output_path), layout_path, template_path)
+    except Exception as e:
+        result["error"] = str(e)
+    return result
+
+
+def _render_chunk(tasks):
+    return [_render_task(task) for task in tasks]
+
+
+def _chunks(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def render_receipts(template_path, items, jobs=1, native_pdf=False, layout_path=None):
+    """
+    영수증 일괄 렌더링
+
+    Args:
+        template_path: 템플릿 파일 경로
+        items: (context, output_path) 목록 또는 제너레이터
+        jobs: 작업자 프로세스 수 (1이면 현재 프로세스에서 순차 처리)
+        native_pdf: 네이티브 렌더러로 PDF도 함께 생성
+        layout_path: PDF 레이아웃 명세 경로 (없으면 기본 레이아웃)
+
+    Yields:
+        입력 순서대로 {"output_path", "pdf_path", "error"}
+
+    작업은 필요한 만큼만 꺼내 보내므로(작업자당 최대 2묶음) 제너레이터 입력도
+    전체를 메모리에 올리지 않고 처리합니다.
+    """
+    tasks = (
+        (template_path, context, output_path, native_pdf, layout_path)
+        for context, output_path in items
+    )
+    jobs = resolve_jobs(jobs)
+    if hasattr(items, "__len__"):
+        jobs = min(jobs, max(len(items), 1))
+        # 작업 전달 비용을 줄이기 위해 묶어서 보냄
+        chunksize = max(1, len(items) // (jobs * 4))
+    else:
+        chunksize = STREAM_CHUNK_SIZE
+
+    if jobs == 1:
+        for task in tasks:
+            yield _render_task(task)
+        return
+
+    context = multiprocessing.get_context(MP_START_METHOD)
+    with ProcessPoolExecutor(max_workers=jobs, mp_context=context) as executor:
+        pending = deque()
+        for chunk in _chunks(tasks, chunksize):
+            pending.append(executor.submit(_render_chunk, chunk))
+            if len(pending) >= jobs * 2:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
@@ -0,0 +1,109 @@
+"""
+정규화된 대상자 표의 열 단위 캐시 (.receipt_cache/YYYY_income_summary.<해시>.v<버전>.donors.npy)
+
+처음 읽을 때 load_data 결과(이름 + 월별 금액 + 연간 총합)를 numpy 구조체 배열로
+데이터 폴더의 숨김 캐시 폴더에 저장하고, 이후에는 xlsx를 파싱하지 않고 메모리 매핑으로 읽습니다.
+원본 표에서만 알 수 있는 검사 결과(금액 경고 등)는 같은 이름의 .donors.json에 함께 저장합니다.
+파일명에 원본 내용 해시와 캐시 버전이 들어가므로 데이터나 정규화 방식이 바뀌면 새로 만들어집니다.
+"""
+
+import glob
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from .receipt_index import file_sha256, cache_dir_for
+from .locking import atomic_write
+
+
+CACHE_SUFFIX = ".donors.npy"
+META_SUFFIX = ".donors.json"
+HASH_LENGTH = 16
+
+# dataset.normalize_donors(이름 분리/정렬 등)나 저장 형식이 바뀌면 올림
+CACHE_VERSION = 3
+
+
+def _field(column):
+    """numpy 필드명 (한글 필드명은 .npy 3.0 형식이 되므로 ASCII로 변환)"""
+    return column.encode("unicode_escape").decode("ascii")
+
+
+def _cache_base(data_path):
+    base, _ = os.path.splitext(os.path.basename(data_path))
+    return os.path.join(cache_dir_for(data_path), base)
+
+
+def cache_path_for(data_path, sha256):
+    """원본 해시와 캐시 버전에 대응하는 캐시 파일 경로"""
+    return f"{_cache_base(data_path)}.{sha256[:HASH_LENGTH]}.v{CACHE_VERSION}{CACHE_SUFFIX}"
+
+
+def meta_path_for(data_path, sha256):
+    """캐시와 함께 저장하는 검사 결과 파일 경로"""
+    return cache_path_for(data_path, sha256)[:-len(CACHE_SUFFIX)] + META_SUFFIX
+
+
+def _stale_caches(data_path, keep=()):
+    """같은 데이터 파일의 다른 해시/버전 캐시 (표와 검사 결과 파일)"""
+    prefix = f"{glob.escape(_cache_base(data_path))}.{'[0-9a-f]' * HASH_LENGTH}.v*"
+    paths = glob.glob(prefix + CACHE_SUFFIX) + glob.glob(prefix + META_SUFFIX)
+    return [path for path in paths if path not in keep]
+
+
+def read_cached_donors(data_path, columns, sha256=None):
+    """캐시된 (대상자 표, 검사 결과 dict) (둘 중 하나라도 없거나 형식이 다르면 None)"""
+    sha256 = sha256 or file_sha256(data_path)
+    path = cache_path_for(data_path, sha256)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(meta_path_for(data_path, sha256), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        table = np.load(path, mmap_mode="r", allow_pickle=False)
+    except (OSError, ValueError):
+        return None
+    if list(table.dtype.names or ()) != [_field(col) for col in columns]:
+        return None
+    return pd.DataFrame({col: np.asarray(table[_field(col)]) for col in columns}), meta
+
+
+def write_cached_donors(data_path, df, columns, sha256=None, meta=None):
+    """대상자 표와 검사 결과(meta)를 캐시로 저장 (저장하지 못하면 None, 이전 해시의 캐시는 삭제)
+
+    이름이 모두 문자열이고 금액 컬럼이 모두 있을 때만 저장합니다.
+    """
+    if not set(columns) <= set(df.columns):
+        return None
+    names = df[columns[0]]
+    if not all(isinstance(name, str) for name in names):
+        return None
+
+    width = max((len(name) for name in names), default=1) or 1
+    dtype = [(_field(columns[0]), f"U{width}")] + [(_field(col), "i8") for col in columns[1:]]
+    table = np.empty(len(df), dtype=dtype)
+    table[_field(columns[0])] = names.to_numpy(dtype=str)
+    for col in columns[1:]:
+        table[_field(col)] = df[col].to_numpy(dtype="i8")
+
+    sha256 = sha256 or file_sha256(data_path)
+    path = cache_path_for(data_path, sha256)
+    meta_path = meta_path_for(data_path, sha256)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # 검사 결과를 먼저 써서, 표가 있으면 검사 결과도 있게 함
+        with atomic_write(meta_path, "w", encoding="utf-8") as f:
+            json.dump(meta or {}, f, ensure_ascii=False)
+        with atomic_write(path) as f:
+            np.save(f, table, allow_pickle=False)
+    except OSError:
+        return None
+
+    for stale in _stale_caches(data_path, keep=(path, meta_path)):
+        try:
+            os.remove(stale)
+        except OSError:
+            pass
+    return path
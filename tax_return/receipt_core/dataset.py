@@ -0,0 +1,160 @@
+"""
+헌금 데이터(YYYY_income_summary.xlsx) 로더
+
+쉼표로 구분된 부부 이름 분리, 빈 값 채우기, 정수 변환을
+행 단위 반복 없이 열 단위 연산으로 처리합니다.
+MCP 서버처럼 오래 실행되는 프로세스는 get_dataset으로 파싱 결과를 재사용합니다.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from functools import cached_property
+
+from .receipt_index import load_receipt_index, file_sha256
+from .columnar import read_cached_donors, write_cached_donors
+from .reader import read_income_summary
+
+
+MONTH_COLUMNS = [f"{i}월" for i in range(1, 13)]
+TOTAL_COLUMN = "연간 총합"
+AMOUNT_COLUMNS = MONTH_COLUMNS + [TOTAL_COLUMN]
+REQUIRED_COLUMNS = ["이름"] + AMOUNT_COLUMNS
+
+SUMMARY_ROW_NAME = "합계"
+
+
+def normalize_donors(df):
+    """원본 표를 영수증 대상자 표로 변환 (합계 행 제외, 부부 분리, 이름순 정렬)
+
+    변환 결과가 바뀌도록 고치면 columnar.CACHE_VERSION을 올려 저장된 캐시를 무효화합니다.
+    """
+    # 마지막 행(합계)은 제외
+    df = df[df["이름"] != SUMMARY_ROW_NAME].copy()
+
+    # NaN을 0으로 처리
+    amount_cols = [col for col in AMOUNT_COLUMNS if col in df.columns]
+    if amount_cols:
+        df[amount_cols] = df[amount_cols].fillna(0).astype(int)
+
+    # 쉼표로 구분된 이름 분리하여 확장 (부부는 같은 금액 행을 복제)
+    names = df["이름"]
+    has_comma = names.astype(str).str.contains(",", regex=False)
+    if has_comma.any():
+        df["이름"] = names.mask(has_comma, names.astype(str).str.split(","))
+        df = df.explode("이름")
+        split_rows = has_comma.reindex(df.index)
+        df["이름"] = df["이름"].mask(split_rows, df["이름"].astype(str).str.strip())
+
+    # 이름순 안정 정렬 (동명이인은 원본 순서 유지)
+    return df.sort_values("이름", kind="stable").reset_index(drop=True)
+
+
+def read_raw(file_path):
+    """Excel 파일에서 필요한 컬럼만 읽기 (정규화 전 원본 표)"""
+    return read_income_summary(file_path, REQUIRED_COLUMNS)
+
+
+def load_data(file_path):
+    """Excel 파일에서 데이터 로드 및 이름 분리"""
+    return normalize_donors(read_raw(file_path))
+
+
+class DonorDataset:
+    """파싱된 헌금 데이터 (캐시에 공유되므로 읽기 전용으로 사용)
+
+    raw는 Excel 원본 표, df는 영수증 대상자 표(처음 접근할 때 변환)입니다.
+    열 단위 캐시(columnar)에서 읽은 경우 raw는 None이고,
+    원본 표의 금액 검사 결과(amount_issues)는 캐시에 함께 저장된 값을 사용합니다.
+    """
+
+    def __init__(self, file_path, raw, df=None, sha256=None, amount_issues=None):
+        self.file_path = file_path
+        self.raw = raw
+        self.sha256 = sha256
+        self._receipt_index = None
+        if df is not None:
+            self.__dict__["df"] = df
+        if amount_issues is not None:
+            self.__dict__["amount_issues"] = amount_issues
+
+    @classmethod
+    def load(cls, file_path):
+        """열 단위 캐시가 있으면 사용하고, 없으면 xlsx를 읽음"""
+        sha256 = file_sha256(file_path)
+        cached = read_cached_donors(file_path, REQUIRED_COLUMNS, sha256)
+        if cached is not None and "amount_issues" in cached[1]:
+            df, meta = cached
+            return cls(file_path, None, df, sha256, meta["amount_issues"])
+        return cls(file_path, read_raw(file_path), sha256=sha256)
+
+    @cached_property
+    def amount_issues(self):
+        """금액 컬럼별 경고 종류 {"컬럼": ["non_numeric", "negative"]} (원본 표 기준, 문제 없는 컬럼은 빠짐)"""
+        from .validation import amount_flags  # validation 모듈이 이 모듈의 컬럼 상수를 사용
+
+        issues = {}
+        for col, (non_numeric, negative) in amount_flags(self.raw).items():
+            kinds = [kind for kind, mask in (("non_numeric", non_numeric), ("negative", negative)) if mask.any()]
+            if kinds:
+                issues[col] = kinds
+        return issues
+
+    @cached_property
+    def df(self):
+        df = normalize_donors(self.raw)
+        # 다음 실행부터는 xlsx 대신 캐시에서 읽음 (원본 표가 없으면 알 수 없는 금액 경고도 함께 저장)
+        write_cached_donors(self.file_path, df, REQUIRED_COLUMNS, self.sha256,
+                            meta={"amount_issues": self.amount_issues})
+        return df
+
+    @cached_property
+    def table(self):
+        """배열 기반 대상자 표 (영수증 루프/미리보기/목록용)"""
+        from .table import DonorTable  # table 모듈이 이 모듈의 컬럼 상수를 사용
+        return DonorTable.from_frame(self.df)
+
+    def receipt_no_map(self, issue_year, prefix=""):
+        """이름 -> 발급번호 매핑 (데이터 파일 옆에 저장된 색인 사용)"""
+        if self._receipt_index is None:
+            self._receipt_index = load_receipt_index(self.file_path, lambda: self.df)
+        return self._receipt_index.numbers(issue_year, prefix)
+
+
+# 파일 (절대 경로, 수정 시각, 크기) -> DonorDataset, 최근 사용 순
+DATASET_CACHE_SIZE = 8
+_datasets = OrderedDict()
+_dataset_lock = threading.Lock()
+
+
+def _file_key(file_path):
+    stat = os.stat(file_path)
+    return os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size
+
+
+def get_dataset(file_path):
+    """캐시된 헌금 데이터 반환 (파일이 바뀌었으면 다시 읽음)"""
+    key = _file_key(file_path)
+
+    with _dataset_lock:
+        dataset = _datasets.get(key)
+        if dataset is not None:
+            _datasets.move_to_end(key)
+            return dataset
+
+    dataset = DonorDataset.load(file_path)
+
+    with _dataset_lock:
+        # 같은 파일의 이전 버전 제거
+        for stale in [k for k in _datasets if k[0] == key[0]]:
+            del _datasets[stale]
+        _datasets[key] = dataset
+        while len(_datasets) > DATASET_CACHE_SIZE:
+            _datasets.popitem(last=False)
+    return dataset
+
+
+def clear_dataset_cache():
+    """헌금 데이터 캐시 비우기"""
+    with _dataset_lock:
+        _datasets.clear()
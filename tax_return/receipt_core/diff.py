@@ -0,0 +1,87 @@
+"""
+두 헌금 데이터 버전 비교
+
+대상자 표(load_data 결과)를 (이름, 같은 이름 안에서의 순번)을 키로 해시 조인하여
+추가/삭제/변경된 대상자와 바뀐 월을 찾습니다. 재발행이 필요한 사람을 고를 때 사용합니다.
+"""
+
+from .dataset import MONTH_COLUMNS, TOTAL_COLUMN, AMOUNT_COLUMNS
+from .receipt_index import build_sequence
+
+
+KEY_COLUMNS = ["이름", "순번"]
+
+
+def _keyed(df):
+    """비교용 표 (동명이인은 원래 순서대로 순번 부여)"""
+    keyed = df[["이름"] + AMOUNT_COLUMNS].copy()
+    keyed["순번"] = keyed.groupby("이름", sort=False).cumcount()
+    return keyed
+
+
+def _donor(name, total):
+    return {"name": name, "total": int(total)}
+
+
+def diff_donors(old_df, new_df):
+    """두 대상자 표 비교
+
+    Returns:
+        {"added": [...], "removed": [...], "changed": [...], "renumbered": [...], "unchanged": 개수}
+        changed 항목은 이름, 이전/이후 총액, 바뀐 월 목록(before/after)을 포함합니다.
+        renumbered는 금액은 같지만 추가/삭제로 발급번호 순번이 바뀐 이름입니다.
+    """
+    merged = _keyed(old_df).merge(
+        _keyed(new_df), on=KEY_COLUMNS, how="outer",
+        suffixes=("_old", "_new"), indicator=True, sort=False,
+    )
+
+    added = merged[merged["_merge"] == "right_only"]
+    removed = merged[merged["_merge"] == "left_only"]
+    both = merged[merged["_merge"] == "both"]
+
+    old_values = both[[f"{col}_old" for col in AMOUNT_COLUMNS]].to_numpy()
+    new_values = both[[f"{col}_new" for col in AMOUNT_COLUMNS]].to_numpy()
+    differs = old_values != new_values
+    changed_rows = differs.any(axis=1)
+
+    changed = []
+    month_count = len(MONTH_COLUMNS)
+    for name, before, after, row_diff in zip(
+        both["이름"].to_numpy()[changed_rows],
+        old_values[changed_rows],
+        new_values[changed_rows],
+        differs[changed_rows],
+    ):
+        changed.append({
+            "name": name,
+            "total_before": int(before[-1]),
+            "total_after": int(after[-1]),
+            "months": [
+                {"month": MONTH_COLUMNS[i], "before": int(before[i]), "after": int(after[i])}
+                for i in range(month_count) if row_diff[i]
+            ],
+        })
+
+    # 발급번호는 이름순 전체 목록 기준이므로 추가/삭제가 있으면 뒤 번호가 밀림
+    old_sequence = build_sequence(old_df)
+    new_sequence = build_sequence(new_df)
+    changed_names = {d["name"] for d in changed}
+    renumbered = [
+        name for name, number in new_sequence.items()
+        if name in old_sequence and old_sequence[name] != number and name not in changed_names
+    ]
+
+    return {
+        "added": [_donor(n, t) for n, t in zip(added["이름"], added[f"{TOTAL_COLUMN}_new"])],
+        "removed": [_donor(n, t) for n, t in zip(removed["이름"], removed[f"{TOTAL_COLUMN}_old"])],
+        "changed": changed,
+        "renumbered": renumbered,
+        "unchanged": int(len(both) - changed_rows.sum()),
+    }
+
+
+def reissue_names(diff):
+    """다시 발행해야 하는 이름 (추가 + 변경, 중복 제거)"""
+    names = [d["name"] for d in diff["added"]] + [d["name"] for d in diff["changed"]]
+    return list(dict.fromkeys(names))
@@ -0,0 +1,409 @@
+"""
+발행대장 저널
+
+발행 기록을 SQLite 저널(발행대장_YYYY.db)에 추가 전용으로 쌓습니다.
+이름/발급번호/발행일시에 인덱스가 있고, 전체 통계(stats)와
+사람별 통계(people)를 기록할 때마다 함께 갱신하므로
+이력 조회는 파일 크기와 관계없이 인덱스 조회 한 번으로 끝납니다.
+엑셀 발행대장(발행대장_YYYY.xlsx)은 저널을 내보낸 결과물로
+일괄 발행이 끝났을 때나 요청할 때만 스트리밍 방식으로 다시 씁니다.
+
+엑셀 파일이 저널 밖에서 수정되었으면(직접 편집, 이전 버전에서 생성 등)
+다음에 열 때 엑셀 내용을 저널에 합칩니다. 저널이 기준이므로 엑셀에 없는 기록은 지우지 않습니다.
+
+기록 추가, 엑셀 내보내기/가져오기는 데이터 폴더 잠금(locking) 안에서 실행하므로
+CLI와 MCP 서버가 동시에 발행해도 기록이 사라지지 않습니다.
+"""
+
+import os
+import json
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+
+from .locking import lock_for, atomic_write
+
+
+LEDGER_COLUMNS = ["발급번호", "이름", "연간총합", "발행일시", "파일경로", "비고"]
+REISSUE_NOTE = "재발행"
+
+# 스키마가 바뀌면 올림 (집계 테이블을 다시 계산)
+SCHEMA_VERSION = 2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    receipt_no TEXT NOT NULL,
+    name TEXT NOT NULL,
+    total INTEGER NOT NULL DEFAULT 0,
+    issued_at TEXT NOT NULL,
+    file_path TEXT,
+    note TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_entries_receipt_no ON entries(receipt_no);
+CREATE INDEX IF NOT EXISTS idx_entries_name ON entries(name);
+CREATE INDEX IF NOT EXISTS idx_entries_issued_at ON entries(issued_at);
+CREATE TABLE IF NOT EXISTS people (
+    name TEXT PRIMARY KEY,
+    issue_count INTEGER NOT NULL,
+    reissue_count INTEGER NOT NULL,
+    latest_date TEXT,
+    latest_receipt_no TEXT
+);
+CREATE TABLE IF NOT EXISTS stats (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    total_records INTEGER NOT NULL,
+    unique_recipients INTEGER NOT NULL,
+    reissue_count INTEGER NOT NULL,
+    total_amount INTEGER NOT NULL,
+    latest_date TEXT
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+# executescript는 실행 전에 COMMIT하므로 한 트랜잭션 안에서 execute로 하나씩 실행
+REBUILD_AGGREGATES = (
+    "DELETE FROM people",
+    """INSERT INTO people (name, issue_count, reissue_count, latest_date, latest_receipt_no)
+    SELECT e.name, COUNT(*), SUM(e.note = '재발행'), MAX(e.issued_at),
+           (SELECT l.receipt_no FROM entries l WHERE l.name = e.name ORDER BY l.id DESC LIMIT 1)
+    FROM entries e GROUP BY e.name""",
+    "DELETE FROM stats",
+    """INSERT INTO stats (id, total_records, unique_recipients, reissue_count, total_amount, latest_date)
+    SELECT 1, COUNT(*), (SELECT COUNT(*) FROM people), COALESCE(SUM(note = '재발행'), 0),
+           COALESCE(SUM(total), 0), MAX(issued_at)
+    FROM entries""",
+)
+
+
+def journal_path_for(xlsx_path):
+    """엑셀 발행대장 경로에 대응하는 저널 경로"""
+    return os.path.splitext(xlsx_path)[0] + ".db"
+
+
+def _now():
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _mtime_ns(path):
+    return os.stat(path).st_mtime_ns if os.path.exists(path) else None
+
+
+class Ledger:
+    """발행대장 저널 (SQLite)"""
+
+    def __init__(self, xlsx_path, read_only=False):
+        self.xlsx_path = xlsx_path
+        self.journal_path = journal_path_for(xlsx_path)
+        self.lock = lock_for(xlsx_path)
+        if read_only:
+            # 조회 전용: 저널 파일을 만들거나 고치지 않음 (엑셀 가져오기/스키마 갱신 없음)
+            uri = Path(os.path.abspath(self.journal_path)).as_uri() + "?mode=ro"
+            self.conn = sqlite3.connect(uri, uri=True, timeout=30)
+            return
+        self.conn = sqlite3.connect(self.journal_path, timeout=30)
+        try:
+            self._migrate()
+            self._sync_from_xlsx()
+        except BaseException:
+            self.conn.close()
+            raise
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # -------------------------------------------------------------------------
+    # 메타데이터
+    # -------------------------------------------------------------------------
+
+    def _get_meta(self, key):
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key, value):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(value))
+        )
+
+    def _rebuild_aggregates(self):
+        """기록으로 사람별/전체 통계 다시 계산 (호출한 쪽의 트랜잭션 안에서)"""
+        for statement in REBUILD_AGGREGATES:
+            self.conn.execute(statement)
+
+    def _migrate(self):
+        """스키마 생성/갱신 (이전 버전 저널이면 집계 테이블 재계산)"""
+        version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        if version == SCHEMA_VERSION:
+            return
+        self.conn.executescript(SCHEMA)
+        with self.conn:
+            self._rebuild_aggregates()
+            self.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    # -------------------------------------------------------------------------
+    # 엑셀 → 저널 가져오기
+    # -------------------------------------------------------------------------
+
+    def needs_sync(self):
+        """스키마 갱신이나 엑셀 가져오기가 필요한지 여부"""
+        version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        return version != SCHEMA_VERSION or self._xlsx_changed()
+
+    def _xlsx_changed(self):
+        mtime = _mtime_ns(self.xlsx_path)
+        return mtime is not None and str(mtime) != self._get_meta("export_mtime_ns")
+
+    def _sync_from_xlsx(self):
+        """엑셀이 저널 밖에서 바뀌었으면 엑셀 내용을 저널에 합침"""
+        if not self._xlsx_changed():
+            return
+        # 다른 프로세스가 내보내는 중이었을 수 있으므로 잠근 뒤 다시 확인
+        with self.lock.write():
+            if self._xlsx_changed():
+                self._import_xlsx()
+
+    def _read_xlsx_records(self):
+        """엑셀 발행대장의 기록 목록과 건너뛴 행 경고
+
+        발급번호/이름/발행일시가 비었거나 연간총합이 숫자가 아닌 행은 건너뜁니다.
+        """
+        import pandas as pd
+        df = pd.read_excel(self.xlsx_path, dtype=object)
+        for column in LEDGER_COLUMNS:
+            if column not in df.columns:
+                df[column] = None
+
+        def text(value):
+            return "" if pd.isna(value) else str(value).strip()
+
+        totals = pd.to_numeric(df["연간총합"], errors="coerce")
+        records, warnings = [], []
+        for position, row in enumerate(df[LEDGER_COLUMNS].itertuples(index=False)):
+            receipt_no, name, total, issued_at, file_path, note = row
+            row_no = position + 2  # 엑셀 행 번호 (헤더 포함)
+            if not text(receipt_no) or not text(name) or not text(issued_at):
+                warnings.append(f"{row_no}행: 발급번호/이름/발행일시가 비어 있어 가져오지 않았습니다")
+                continue
+            if pd.isna(totals.iloc[position]) and not pd.isna(total):
+                warnings.append(f"{row_no}행: 연간총합이 숫자가 아니어서 가져오지 않았습니다")
+                continue
+            amount = totals.iloc[position]
+            records.append((
+                text(receipt_no), text(name), 0 if pd.isna(amount) else int(amount),
+                text(issued_at), text(file_path), text(note),
+            ))
+        return records, warnings
+
+    def _import_xlsx(self):
+        """엑셀 기록을 저널에 합침 (저널 기록은 지우지 않음)
+
+        발급번호+발행일시가 같은 기록은 엑셀 내용으로 고치고, 저널에 없는 기록은 추가합니다.
+        엑셀에 없는 저널 기록(아직 내보내지 않은 발행 등)은 그대로 둡니다.
+        """
+        mtime = _mtime_ns(self.xlsx_path)
+        records, warnings = self._read_xlsx_records()
+
+        existing = {}
+        for entry_id, receipt_no, issued_at in self.conn.execute(
+            "SELECT id, receipt_no, issued_at FROM entries ORDER BY id"
+        ):
+            existing.setdefault((receipt_no, issued_at), []).append(entry_id)
+
+        updates, inserts = [], []
+        for receipt_no, name, total, issued_at, file_path, note in records:
+            ids = existing.get((receipt_no, issued_at))
+            if ids:
+                updates.append((name, total, file_path, note, ids.pop(0)))
+            else:
+                inserts.append((receipt_no, name, total, issued_at, file_path, note))
+
+        with self.conn:
+            self.conn.executemany(
+                "UPDATE entries SET name = ?, total = ?, file_path = ?, note = ? WHERE id = ?", updates
+            )
+            self._insert(inserts)
+            self._rebuild_aggregates()
+            self._set_meta("export_mtime_ns", mtime)
+            self._set_meta("exported_count", len(records))
+            self._set_meta("import_warnings", json.dumps(warnings, ensure_ascii=False))
+
+    def import_warnings(self):
+        """마지막 엑셀 가져오기에서 건너뛴 행 (행 번호만, 이름 미포함)"""
+        value = self._get_meta("import_warnings")
+        return json.loads(value) if value else []
+
+    # -------------------------------------------------------------------------
+    # 기록 추가
+    # -------------------------------------------------------------------------
+
+    def _insert(self, records):
+        self.conn.executemany(
+            "INSERT INTO entries (receipt_no, name, total, issued_at, file_path, note) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            records,
+        )
+
+    def _is_issued(self, receipt_no):
+        row = self.conn.execute(
+            "SELECT 1 FROM entries WHERE receipt_no = ? LIMIT 1", (receipt_no,)
+        ).fetchone()
+        return row is not None
+
+    def _update_aggregates(self, receipt_no, name, total, issued_at, note):
+        """사람별/전체 통계 갱신"""
+        reissued = 1 if note == REISSUE_NOTE else 0
+        is_new_person = self.person(name) is None
+        self.conn.execute(
+            "INSERT INTO people (name, issue_count, reissue_count, latest_date, latest_receipt_no) "
+            "VALUES (?, 1, ?, ?, ?) "
+            "ON CONFLICT(name) DO UPDATE SET "
+            "issue_count = issue_count + 1, "
+            "reissue_count = reissue_count + excluded.reissue_count, "
+            "latest_date = MAX(COALESCE(latest_date, ''), excluded.latest_date), "
+            "latest_receipt_no = excluded.latest_receipt_no",
+            (name, reissued, issued_at, receipt_no),
+        )
+        self.conn.execute(
+            "INSERT INTO stats (id, total_records, unique_recipients, reissue_count, total_amount, latest_date) "
+            "VALUES (1, 1, 1, ?, ?, ?) "
+            "ON CONFLICT(id) DO UPDATE SET "
+            "total_records = total_records + 1, "
+            "unique_recipients = unique_recipients + ?, "
+            "reissue_count = reissue_count + excluded.reissue_count, "
+            "total_amount = total_amount + excluded.total_amount, "
+            "latest_date = MAX(COALESCE(latest_date, ''), excluded.latest_date)",
+            (reissued, total, issued_at, 1 if is_new_person else 0),
+        )
+
+    def append_many(self, records):
+        """
+        발행 기록 여러 건 추가 (한 트랜잭션)
+
+        Args:
+            records: (발급번호, 이름, 연간총합, 파일경로) 목록
+
+        Returns:
+            각 기록의 비고 목록 (이미 발행된 발급번호면 "재발행")
+        """
+        now = _now()
+        notes = []
+        # 재발행 판정과 기록 추가 사이에 다른 발행이 끼어들지 않도록 잠금
+        with self.lock.write(), self.conn:
+            for receipt_no, name, total, file_path in records:
+                note = REISSUE_NOTE if self._is_issued(receipt_no) else ""
+                self._insert([(receipt_no, name, int(total), now, file_path, note)])
+                self._update_aggregates(receipt_no, name, int(total), now, note)
+                notes.append(note)
+        return notes
+
+    def append(self, receipt_no, name, total, file_path):
+        """발행 기록 1건 추가"""
+        return self.append_many([(receipt_no, name, total, file_path)])[0]
+
+    # -------------------------------------------------------------------------
+    # 조회 / 내보내기
+    # -------------------------------------------------------------------------
+
+    def summary(self):
+        """전체 통계 (유지되는 집계값이므로 O(1))"""
+        row = self.conn.execute(
+            "SELECT total_records, unique_recipients, reissue_count, total_amount, latest_date "
+            "FROM stats WHERE id = 1"
+        ).fetchone() or (0, 0, 0, 0, None)
+        keys = ["total_records", "unique_recipients", "reissue_count", "total_amount", "latest_date"]
+        return dict(zip(keys, row))
+
+    def person(self, name):
+        """사람별 통계 (이름 기본키 조회, 없으면 None)"""
+        row = self.conn.execute(
+            "SELECT issue_count, reissue_count, latest_date, latest_receipt_no "
+            "FROM people WHERE name = ?", (name,)
+        ).fetchone()
+        if row is None:
+            return None
+        keys = ["issue_count", "reissue_count", "latest_date", "latest_receipt_no"]
+        return dict(zip(keys, row))
+
+    def count(self):
+        return self.summary()["total_records"]
+
+    def rows(self, name=None):
+        """발행 순서대로 (발급번호, 이름, 연간총합, 발행일시, 파일경로, 비고)"""
+        columns = "SELECT receipt_no, name, total, issued_at, file_path, note FROM entries"
+        if name is not None:
+            return self.conn.execute(f"{columns} WHERE name = ? ORDER BY id", (name,))
+        return self.conn.execute(f"{columns} ORDER BY id")
+
+    def to_dataframe(self, name=None):
+        """발행대장 DataFrame"""
+        import pandas as pd
+        return pd.DataFrame(list(self.rows(name)), columns=LEDGER_COLUMNS)
+
+    def is_export_stale(self):
+        """엑셀 발행대장이 저널보다 오래되었는지 여부"""
+        if not os.path.exists(self.xlsx_path):
+            return self.count() > 0
+        return str(self.count()) != self._get_meta("exported_count")
+
+    def export_xlsx(self, force=False):
+        """엑셀 발행대장 내보내기 (write-only 스트리밍 모드, 임시 파일에 쓴 뒤 교체)"""
+        if not force and not self.is_export_stale():
+            return self.xlsx_path
+        with self.lock.write():
+            return self._export_xlsx()
+
+    def _export_xlsx(self):
+        from openpyxl import Workbook
+
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet("Sheet1")
+        sheet.append(LEDGER_COLUMNS)
+        count = 0
+        for receipt_no, name, total, issued_at, file_path, note in self.rows():
+            sheet.append([receipt_no, name, total, issued_at, file_path, note or None])
+            count += 1
+
+        with atomic_write(self.xlsx_path) as f:
+            workbook.save(f)
+
+        with self.conn:
+            self._set_meta("export_mtime_ns", _mtime_ns(self.xlsx_path))
+            self._set_meta("exported_count", count)
+        return self.xlsx_path
+
+
+def open_ledger(xlsx_path, read_only=False):
+    """발행대장 저널 열기 (없으면 생성, read_only면 있는 저널을 그대로 읽기만 함)"""
+    return Ledger(xlsx_path, read_only=read_only)
+
+
+def ledger_needs_sync(xlsx_path):
+    """읽기 전용으로 열기 전에 저널 생성/갱신이 필요한지 여부"""
+    if not os.path.exists(journal_path_for(xlsx_path)):
+        return True
+    with Ledger(xlsx_path, read_only=True) as ledger:
+        return ledger.needs_sync()
+
+
+def sync_ledger(xlsx_path):
+    """저널 생성/스키마 갱신/엑셀 가져오기가 필요하면 쓰기 잠금 안에서 처리 (필요 없으면 잠그지 않음)"""
+    if not ledger_needs_sync(xlsx_path):
+        return
+    with lock_for(xlsx_path).write():
+        # 기다리는 동안 다른 스레드/프로세스가 처리했을 수 있으므로 다시 확인
+        if ledger_needs_sync(xlsx_path):
+            open_ledger(xlsx_path).close()
+
+
+def ledger_exists(xlsx_path):
+    """엑셀 발행대장이나 저널 중 하나라도 있는지 여부"""
+    return os.path.exists(xlsx_path) or os.path.exists(journal_path_for(xlsx_path))
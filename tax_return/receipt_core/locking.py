@@ -0,0 +1,157 @@
+"""
+데이터 폴더 잠금과 원자적 파일 쓰기
+
+CLI 실행과 MCP 서버(여러 클라이언트)가 같은 데이터 폴더를 동시에 다룰 때를 위한 잠금입니다.
+- 프로세스 사이: 데이터 폴더의 .receipt.lock 파일 잠금 (POSIX flock, Windows msvcrt)
+- 프로세스 안: 스레드 읽기/쓰기 잠금 (읽기는 동시에, 쓰기는 혼자)
+발행대장 내보내기/가져오기, 발행 기록 추가, 매니페스트 저장처럼 짧은 구간만 잠그므로
+오래 걸리는 렌더링은 서로 막지 않습니다.
+영수증/발행대장 파일은 임시 파일에 쓴 뒤 이름을 바꿔, 읽는 쪽이 쓰다 만 파일을 보지 않게 합니다.
+"""
+
+import os
+import stat
+import tempfile
+import threading
+from contextlib import contextmanager
+
+
+LOCK_NAME = ".receipt.lock"
+DEFAULT_FILE_MODE = 0o644
+
+
+def _lock_file(fd, exclusive):
+    try:
+        import fcntl
+    except ImportError:
+        # Windows: 공유 잠금이 없으므로 항상 배타 잠금
+        import msvcrt
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+        return
+    fcntl.flock(fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+
+
+def _unlock_file(fd):
+    try:
+        import fcntl
+    except ImportError:
+        import msvcrt
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+        return
+    fcntl.flock(fd, fcntl.LOCK_UN)
+
+
+class DirectoryLock:
+    """데이터 폴더 하나의 읽기/쓰기 잠금 (프로세스 안 + 프로세스 사이)
+
+    같은 스레드에서 쓰기 잠금을 다시 잡거나, 쓰기 잠금 중에 읽기 잠금을 잡아도 됩니다.
+    읽기 잠금 중에 쓰기 잠금으로 올리는 것은 교착 상태가 되므로 RuntimeError입니다.
+    """
+
+    def __init__(self, directory):
+        self.directory = os.path.abspath(directory)
+        self.path = os.path.join(self.directory, LOCK_NAME)
+        self._cond = threading.Condition()
+        self._readers = {}  # 스레드 ID -> 읽기 잠금 횟수
+        self._writer = None
+        self._write_depth = 0
+        self._fd = None
+
+    def _open(self):
+        if self._fd is None:
+            os.makedirs(self.directory, exist_ok=True)
+            self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        return self._fd
+
+    @contextmanager
+    def read(self):
+        me = threading.get_ident()
+        with self._cond:
+            if self._writer == me:
+                # 쓰기 잠금 안의 읽기
+                self._write_depth += 1
+                nested_write = True
+            else:
+                nested_write = False
+                while self._writer is not None:
+                    self._cond.wait()
+                if not self._readers:
+                    _lock_file(self._open(), exclusive=False)
+                self._readers[me] = self._readers.get(me, 0) + 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                if nested_write:
+                    self._write_depth -= 1
+                else:
+                    self._readers[me] -= 1
+                    if not self._readers[me]:
+                        del self._readers[me]
+                    if not self._readers:
+                        _unlock_file(self._fd)
+                        self._cond.notify_all()
+
+    @contextmanager
+    def write(self):
+        me = threading.get_ident()
+        with self._cond:
+            if self._writer == me:
+                self._write_depth += 1
+            else:
+                if me in self._readers:
+                    raise RuntimeError("읽기 잠금 중에는 쓰기 잠금을 잡을 수 없습니다")
+                while self._writer is not None or self._readers:
+                    self._cond.wait()
+                _lock_file(self._open(), exclusive=True)
+                self._writer = me
+                self._write_depth = 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._write_depth -= 1
+                if not self._write_depth:
+                    self._writer = None
+                    _unlock_file(self._fd)
+                    self._cond.notify_all()
+
+
+# 절대 경로 -> DirectoryLock (프로세스 안에서 폴더마다 하나)
+_locks = {}
+_locks_guard = threading.Lock()
+
+
+def directory_lock(directory):
+    """데이터 폴더의 잠금 객체"""
+    path = os.path.abspath(directory)
+    with _locks_guard:
+        lock = _locks.get(path)
+        if lock is None:
+            lock = _locks[path] = DirectoryLock(path)
+        return lock
+
+
+def lock_for(file_path):
+    """파일이 들어 있는 폴더의 잠금"""
+    return directory_lock(os.path.dirname(os.path.abspath(file_path)))
+
+
+@contextmanager
+def atomic_write(path, mode="wb", **kwargs):
+    """같은 폴더의 임시 파일에 쓰고 성공하면 path로 교체 (실패하면 임시 파일 삭제)"""
+    directory, name = os.path.split(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{name}.", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, mode, **kwargs) as f:
+            # mkstemp는 0600으로 만들므로 기존 파일(없으면 일반 파일)의 권한으로 맞춤
+            mode_bits = stat.S_IMODE(os.stat(path).st_mode) if os.path.exists(path) else DEFAULT_FILE_MODE
+            os.chmod(tmp_path, mode_bits)
+            yield f
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
@@ -0,0 +1,102 @@
+"""
+증분 발행용 매니페스트 (receipts/.receipt_manifest.json)
+
+영수증 파일마다 (대상자 데이터 해시, 템플릿 해시, 발급번호, 출력 옵션)을 기록해 두고,
+다음 실행에서 모두 같고 파일도 남아 있으면 다시 만들지 않습니다.
+"""
+
+import hashlib
+import json
+import os
+
+from .receipt_index import file_sha256
+from .pdf import pdf_path_for
+from .locking import lock_for, atomic_write
+
+
+MANIFEST_NAME = ".receipt_manifest.json"
+MANIFEST_VERSION = 1
+
+
+def context_hash(context):
+    """템플릿에 들어가는 값 전체의 해시 (대상자 행이 바뀌면 달라짐)"""
+    payload = json.dumps(context, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def render_options(native_pdf=False, layout_path=None):
+    """출력 결과에 영향을 주는 옵션 문자열 (native PDF는 레이아웃 내용까지 포함)"""
+    if not native_pdf:
+        return "docx"
+    layout_hash = file_sha256(layout_path) if layout_path and os.path.exists(layout_path) else "default"
+    return f"native-pdf:{layout_hash}"
+
+
+class RenderManifest:
+    """출력 폴더 하나의 매니페스트"""
+
+    def __init__(self, output_dir):
+        self.output_dir = output_dir
+        self.path = os.path.join(output_dir, MANIFEST_NAME)
+        # 출력 폴더(receipts/)가 들어 있는 데이터 폴더의 잠금
+        self.lock = lock_for(output_dir)
+        self.entries = self._load()
+        # 이번 실행에서 기록한 항목 (저장할 때 다른 실행의 기록과 합침)
+        self._recorded = {}
+
+    def _load(self):
+        try:
+            with self.lock.read(), open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if isinstance(data, dict) and data.get("version") == MANIFEST_VERSION:
+            return data.get("files") or {}
+        return {}
+
+    def _key(self, output_path):
+        return os.path.basename(output_path)
+
+    def is_current(self, output_path, row_hash, template_hash, receipt_no, options="docx", need_pdf=False):
+        """이전과 같은 입력으로 만든 파일이 남아 있는지 확인"""
+        entry = self.entries.get(self._key(output_path))
+        if entry != {"row": row_hash, "template": template_hash,
+                     "receipt_no": receipt_no, "options": options}:
+            return False
+        if not os.path.exists(output_path):
+            return False
+        return not need_pdf or os.path.exists(pdf_path_for(output_path))
+
+    def unchanged_outputs(self, candidates, template_hash, options="docx", need_pdf=False):
+        """다시 만들 필요가 없는 출력 파일 집합
+
+        candidates: (output_path, row_hash, receipt_no) 목록.
+        같은 파일에 여러 행이 쓰이면(동명이인) 마지막 행이 파일 내용을 결정합니다.
+        """
+        last = {}
+        for output_path, row_hash, receipt_no in candidates:
+            last[output_path] = (row_hash, receipt_no)
+        return {
+            output_path for output_path, (row_hash, receipt_no) in last.items()
+            if self.is_current(output_path, row_hash, template_hash, receipt_no, options, need_pdf)
+        }
+
+    def record(self, output_path, row_hash, template_hash, receipt_no, options="docx"):
+        entry = {
+            "row": row_hash,
+            "template": template_hash,
+            "receipt_no": receipt_no,
+            "options": options,
+        }
+        self.entries[self._key(output_path)] = entry
+        self._recorded[self._key(output_path)] = entry
+
+    def save(self):
+        """그 사이 다른 실행이 저장한 기록과 합쳐 임시 파일에 쓰고 교체"""
+        with self.lock.write():
+            entries = self._load()
+            entries.update(self._recorded)
+            with atomic_write(self.path, "w", encoding="utf-8") as f:
+                json.dump({"version": MANIFEST_VERSION, "files": entries}, f,
+                          ensure_ascii=False, indent=1)
+        self.entries = entries
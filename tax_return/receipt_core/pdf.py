@@ -0,0 +1,166 @@
+"""
+DOCX → PDF 변환
+
+LibreOffice가 있으면 여러 파일을 묶어 한 번의 soffice 실행으로 변환합니다.
+작업자마다 전용 사용자 프로필을 두어 여러 soffice를 동시에 띄울 수 있고,
+프로필을 배치 사이에 재사용하므로 첫 실행 초기화 비용도 한 번만 듭니다.
+LibreOffice가 없으면 docx2pdf(Word 필요)로 파일별 변환합니다.
+"""
+
+import os
+import queue
+import shutil
+import tempfile
+import subprocess
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+
+# 배치당 파일 수와 파일당 허용 시간 (초)
+DEFAULT_BATCH_SIZE = 50
+TIMEOUT_PER_FILE = 30
+STARTUP_TIMEOUT = 60
+
+SOFFICE_CANDIDATES = [
+    "soffice",
+    "libreoffice",
+    "/Applications/LibreOffice.app/Contents/MacOS/soffice",
+]
+
+
+def find_soffice():
+    """LibreOffice 실행 파일 경로 찾기"""
+    for candidate in SOFFICE_CANDIDATES:
+        path = shutil.which(candidate)
+        if path:
+            return path
+    return None
+
+
+def has_docx2pdf():
+    """docx2pdf 사용 가능 여부"""
+    try:
+        import docx2pdf  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def converter_available():
+    """PDF 변환 도구 설치 여부"""
+    return bool(find_soffice()) or has_docx2pdf()
+
+
+def pdf_path_for(docx_path):
+    """DOCX 경로에 대응하는 PDF 경로"""
+    return os.path.splitext(docx_path)[0] + ".pdf"
+
+
+def _run_soffice(soffice, profile_dir, docx_paths):
+    """soffice 한 번 실행으로 여러 파일 변환 (같은 폴더 파일만)"""
+    outdir = os.path.dirname(docx_paths[0]) or "."
+    timeout = STARTUP_TIMEOUT + TIMEOUT_PER_FILE * len(docx_paths)
+    try:
+        subprocess.run([
+            soffice, "--headless", "--norestore",
+            f"-env:UserInstallation={Path(profile_dir).as_uri()}",
+            "--convert-to", "pdf", "--outdir", outdir,
+            *docx_paths
+        ], capture_output=True, text=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        pass
+
+    return {p: pdf_path_for(p) if os.path.exists(pdf_path_for(p)) else None for p in docx_paths}
+
+
+def _convert_with_soffice(soffice, docx_paths, batch_size, workers):
+    """배치 단위로 나누어 여러 soffice 인스턴스에서 변환"""
+    # 폴더별로 묶은 뒤 배치로 나눔 (--outdir가 하나이므로)
+    by_dir = {}
+    for path in docx_paths:
+        by_dir.setdefault(os.path.dirname(path), []).append(path)
+    batches = [
+        paths[i:i + batch_size]
+        for paths in by_dir.values()
+        for i in range(0, len(paths), batch_size)
+    ]
+
+    workers = max(1, min(workers, len(batches)))
+    profiles = queue.Queue()
+    profile_dirs = [tempfile.mkdtemp(prefix="oikos_soffice_") for _ in range(workers)]
+    for profile_dir in profile_dirs:
+        profiles.put(profile_dir)
+
+    def convert_batch(batch):
+        profile_dir = profiles.get()
+        try:
+            result = _run_soffice(soffice, profile_dir, batch)
+            # 배치가 중간에 실패하면 남은 파일만 하나씩 다시 시도
+            failed = [p for p, pdf in result.items() if pdf is None]
+            if failed and len(batch) > 1:
+                for path in failed:
+                    result.update(_run_soffice(soffice, profile_dir, [path]))
+            return result
+        finally:
+            profiles.put(profile_dir)
+
+    results = {}
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for result in executor.map(convert_batch, batches):
+                results.update(result)
+    finally:
+        for profile_dir in profile_dirs:
+            shutil.rmtree(profile_dir, ignore_errors=True)
+    return results
+
+
+def _convert_with_docx2pdf(docx_paths):
+    """docx2pdf로 파일별 변환"""
+    from docx2pdf import convert
+
+    results = {}
+    for path in docx_paths:
+        try:
+            convert(path, pdf_path_for(path))
+            results[path] = pdf_path_for(path)
+        except Exception:
+            results[path] = None
+    return results
+
+
+def convert_many(docx_paths, workers=1, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    여러 DOCX를 PDF로 변환
+
+    Args:
+        docx_paths: 변환할 DOCX 경로 목록
+        workers: 동시에 실행할 soffice 인스턴스 수
+        batch_size: soffice 한 번에 넘길 파일 수
+
+    Returns:
+        DOCX 경로 -> PDF 경로 (실패 시 None)
+    """
+    docx_paths = list(docx_paths)
+    if not docx_paths:
+        return {}
+
+    # 이전 실행의 PDF가 성공으로 오인되지 않도록 제거
+    for path in docx_paths:
+        if os.path.exists(pdf_path_for(path)):
+            os.remove(pdf_path_for(path))
+
+    soffice = find_soffice()
+    if soffice:
+        results = _convert_with_soffice(soffice, docx_paths, batch_size, workers)
+    elif has_docx2pdf():
+        results = _convert_with_docx2pdf(docx_paths)
+    else:
+        results = {}
+
+    return {path: results.get(path) for path in docx_paths}
+
+
+def convert_to_pdf(docx_path):
+    """DOCX를 PDF로 변환 (실패 시 None)"""
+    return convert_many([docx_path])[docx_path]
@@ -0,0 +1,265 @@
+"""
+네이티브 PDF 영수증 렌더러 (--pdf-engine native)
+
+LibreOffice나 Word 없이 reportlab으로 영수증을 PDF에 직접 그립니다.
+레이아웃은 선언형 명세(receipt_layout.yaml)로 정의하고,
+글꼴 파일은 프로세스당 한 번만 읽어 모든 영수증에 재사용합니다.
+
+필요 패키지: pip install reportlab pyyaml (기본 레이아웃도 yaml 파일에서 읽음)
+"""
+
+import os
+import io
+import copy
+import string
+import functools
+import zipfile
+import threading
+
+from .template import RECEIPT_FIELDS
+from .locking import atomic_write
+
+
+# 템플릿 외 추가 항목 (config.yaml의 organization 값과 기부 연도)
+EXTRA_FIELDS = ["year", "org_name", "org_representative", "org_business_number", "org_address"]
+
+# 기본 레이아웃 = 프로젝트의 receipt_layout.sample.yaml (사용자가 복사해 고치는 파일과 같은 내용)
+DEFAULT_LAYOUT_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                   "receipt_layout.sample.yaml")
+
+
+def _read_layout(layout_path):
+    import yaml
+    with open(layout_path, "r", encoding="utf-8") as f:
+        return yaml.safe_load(f) or {}
+
+
+@functools.lru_cache(maxsize=1)
+def _default_layout():
+    return _read_layout(DEFAULT_LAYOUT_PATH)
+
+
+def load_layout(layout_path=None):
+    """레이아웃 명세 로드 (파일이 없으면 기본 레이아웃, 있으면 기본 레이아웃에 덮어씀)"""
+    merged = copy.deepcopy(_default_layout())
+    if not layout_path or not os.path.exists(layout_path):
+        return merged
+
+    layout = _read_layout(layout_path)
+    for key, value in layout.items():
+        if isinstance(value, dict) and key in merged:
+            merged[key].update(value)
+        else:
+            merged[key] = value
+    return merged
+
+
+def _element_texts(element):
+    """요소에 들어 있는 문자열 목록"""
+    if element.get("type") == "table":
+        return [cell for row in element.get("rows", []) for cell in row]
+    return [element.get("text", "")]
+
+
+def layout_fields(layout):
+    """레이아웃에서 사용하는 항목 이름"""
+    fields = set()
+    for element in layout.get("elements", []):
+        for text in _element_texts(element):
+            for _, field, _, _ in string.Formatter().parse(str(text)):
+                if field:
+                    fields.add(field)
+    return fields
+
+
+def check_layout(layout):
+    """레이아웃 검사 (누락/알 수 없는 항목이 있으면 ValueError)"""
+    fields = layout_fields(layout)
+    missing = [f for f in RECEIPT_FIELDS if f not in fields]
+    unknown = sorted(fields - set(RECEIPT_FIELDS) - set(EXTRA_FIELDS))
+    if missing:
+        raise ValueError(f"레이아웃에 필수 항목이 없습니다: {', '.join(missing)}")
+    if unknown:
+        raise ValueError(f"레이아웃에 알 수 없는 항목이 있습니다: {', '.join(unknown)}")
+
+
+# 글꼴 출처 -> reportlab 글꼴 이름 (프로세스당 한 번 등록)
+_fonts = {}
+_font_lock = threading.Lock()
+
+
+def _embedded_font(template_path, bold):
+    """템플릿(docx)에 내장된 TrueType 글꼴 데이터"""
+    with zipfile.ZipFile(template_path) as zf:
+        fonts = sorted(n for n in zf.namelist()
+                       if n.startswith("word/fonts/") and n.lower().endswith(".ttf"))
+        if not fonts:
+            return None
+        preferred = [n for n in fonts if ("bold" in n.lower()) == bold]
+        return zf.read((preferred or fonts)[0])
+
+
+def register_font(font_path, template_path=None, bold=False):
+    """글꼴 등록 후 reportlab 글꼴 이름 반환"""
+    from reportlab.pdfbase import pdfmetrics
+    from reportlab.pdfbase.ttfonts import TTFont
+
+    if font_path:
+        key = ("file", os.path.abspath(font_path))
+    elif template_path:
+        key = ("template", os.path.abspath(template_path), os.stat(template_path).st_mtime_ns, bold)
+    else:
+        raise ValueError("글꼴 파일이 없습니다. 레이아웃의 fonts 항목에 .ttf 경로를 지정하세요.")
+
+    with _font_lock:
+        if key in _fonts:
+            return _fonts[key]
+
+        if font_path:
+            source = font_path
+        else:
+            data = _embedded_font(template_path, bold)
+            if data is None:
+                raise ValueError("템플릿에 내장 글꼴이 없습니다. 레이아웃의 fonts 항목에 .ttf 경로를 지정하세요.")
+            source = io.BytesIO(data)
+
+        font_name = f"ReceiptFont{len(_fonts)}"
+        pdfmetrics.registerFont(TTFont(font_name, source))
+        _fonts[key] = font_name
+        return font_name
+
+
+class PdfReceiptRenderer:
+    """레이아웃 명세로 영수증 PDF를 그리는 렌더러"""
+
+    def __init__(self, layout, template_path=None):
+        from reportlab.lib import pagesizes
+
+        check_layout(layout)
+        self.layout = layout
+        self.page_size = getattr(pagesizes, str(layout["page"].get("size", "A4")).upper(), pagesizes.A4)
+
+        fonts = layout["fonts"]
+        self.font_size = fonts.get("size", 10)
+        self.regular = register_font(fonts.get("regular"), template_path, bold=False)
+        self.bold = register_font(fonts.get("bold") or fonts.get("regular"), template_path, bold=True)
+
+    def _wrap(self, text, font, size, width):
+        """글자 단위 줄바꿈 (한글은 공백 없이도 나눔)"""
+        from reportlab.pdfbase.pdfmetrics import stringWidth
+
+        lines, line = [], ""
+        for char in text:
+            if line and stringWidth(line + char, font, size) > width:
+                lines.append(line)
+                line = char.lstrip()
+            else:
+                line += char
+        if line:
+            lines.append(line)
+        return lines
+
+    def _draw_string(self, canvas, x, y, text, align):
+        if align == "center":
+            canvas.drawCentredString(x, y, text)
+        elif align == "right":
+            canvas.drawRightString(x, y, text)
+        else:
+            canvas.drawString(x, y, text)
+
+    def _draw_text(self, canvas, element, fields):
+        from reportlab.lib.units import mm
+
+        size = element.get("size", self.font_size)
+        font = self.bold if element.get("bold") else self.regular
+        text = str(element.get("text", "")).format_map(fields)
+        canvas.setFont(font, size)
+
+        page_height = self.page_size[1]
+        lines = [text]
+        if element.get("width"):
+            lines = self._wrap(text, font, size, element["width"] * mm)
+
+        leading = size * 1.5
+        for i, line in enumerate(lines):
+            y = page_height - element["y"] * mm - i * leading
+            self._draw_string(canvas, element["x"] * mm, y, line, element.get("align", "left"))
+
+    def _draw_table(self, canvas, element, fields):
+        from reportlab.lib.units import mm
+
+        size = element.get("size", self.font_size)
+        widths = [w * mm for w in element["widths"]]
+        row_height = element.get("row_height", 8) * mm
+        aligns = element.get("align") or ["left"] * len(widths)
+        padding = 1.5 * mm
+
+        page_height = self.page_size[1]
+        x0 = element["x"] * mm
+        top = page_height - element["y"] * mm
+        rows = element.get("rows", [])
+
+        canvas.setFont(self.regular, size)
+        for r, row in enumerate(rows):
+            y = top - (r + 1) * row_height
+            x = x0
+            for c, width in enumerate(widths):
+                canvas.rect(x, y, width, row_height)
+                text = str(row[c]).format_map(fields) if c < len(row) else ""
+                align = aligns[c] if c < len(aligns) else "left"
+                if align == "center":
+                    tx = x + width / 2
+                elif align == "right":
+                    tx = x + width - padding
+                else:
+                    tx = x + padding
+                self._draw_string(canvas, tx, y + (row_height - size * 0.7) / 2, text, align)
+                x += width
+
+    def render(self, fields, output_path):
+        """영수증 PDF 저장"""
+        from reportlab.pdfgen import canvas as pdf_canvas
+
+        # 임시 파일에 그린 뒤 교체 (쓰다 만 PDF가 남지 않도록)
+        with atomic_write(output_path) as f:
+            canvas = pdf_canvas.Canvas(f, pagesize=self.page_size)
+            canvas.setLineWidth(0.5)
+            for element in self.layout["elements"]:
+                if element.get("type") == "table":
+                    self._draw_table(canvas, element, fields)
+                else:
+                    self._draw_text(canvas, element, fields)
+            canvas.showPage()
+            canvas.save()
+
+
+# (레이아웃 경로, 수정 시각, 템플릿 경로) -> PdfReceiptRenderer
+_renderers = {}
+_renderer_lock = threading.Lock()
+
+
+def get_pdf_renderer(layout_path=None, template_path=None):
+    """캐시된 PDF 렌더러 반환"""
+    layout_key = None
+    if layout_path and os.path.exists(layout_path):
+        layout_key = (os.path.abspath(layout_path), os.stat(layout_path).st_mtime_ns)
+    template_key = None
+    if template_path:
+        # 템플릿을 고치면 내장 글꼴이 바뀔 수 있으므로 수정 시각도 키에 포함
+        mtime = os.stat(template_path).st_mtime_ns if os.path.exists(template_path) else None
+        template_key = (os.path.abspath(template_path), mtime)
+    key = (layout_key, template_key)
+
+    with _renderer_lock:
+        renderer = _renderers.get(key)
+        if renderer is None:
+            renderer = PdfReceiptRenderer(load_layout(layout_path), template_path)
+            _renderers[key] = renderer
+        return renderer
+
+
+def render_pdf(fields, output_path, layout_path=None, template_path=None):
+    """영수증 1건을 PDF로 렌더링"""
+    missing = {f: "" for f in EXTRA_FIELDS if f not in fields}
+    get_pdf_renderer(layout_path, template_path).render({**missing, **fields}, output_path)
+    return output_path
@@ -0,0 +1,102 @@
+"""
+헌금 데이터(xlsx) 읽기 백엔드
+
+필요한 컬럼(REQUIRED_COLUMNS)만 읽어 DataFrame으로 반환합니다.
+python-calamine이 설치되어 있으면 이를 사용하고(Rust 기반, 가장 빠름),
+없으면 openpyxl 읽기 전용 모드로 셀 값만 읽습니다.
+RECEIPT_EXCEL_READER 환경 변수로 백엔드를 고정할 수 있습니다 (calamine, openpyxl, pandas).
+"""
+
+import os
+
+import pandas as pd
+
+
+READER_ENV = "RECEIPT_EXCEL_READER"
+
+
+def _has_calamine():
+    try:
+        import python_calamine  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _trim_trailing_empty(rows):
+    """끝부분의 빈 행 제거 (pd.read_excel과 같은 동작)"""
+    end = len(rows)
+    while end and all(value is None for value in rows[end - 1]):
+        end -= 1
+    return rows[:end]
+
+
+def read_openpyxl(path, columns):
+    """openpyxl 읽기 전용 모드로 지정한 컬럼의 값만 읽기"""
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(path, read_only=True, data_only=True, keep_links=False)
+    try:
+        sheet = workbook.worksheets[0]
+        # 읽기 전용 모드는 파일에 적힌 범위(<dimension>)까지만 읽으므로, 틀린 범위면 행이 빠짐
+        # (pd.read_excel처럼 범위를 지우고 실제 데이터 끝까지 읽음)
+        sheet.reset_dimensions()
+        rows = sheet.iter_rows(values_only=True)
+        header = next(rows, None) or ()
+        positions = {}
+        for idx, name in enumerate(header):
+            if name is not None and str(name) not in positions:
+                positions[str(name)] = idx
+
+        selected = [col for col in columns if col in positions]
+        indexes = [positions[col] for col in selected]
+        width = max(indexes) + 1 if indexes else 0
+
+        data = []
+        for row in rows:
+            if len(row) < width:
+                row = tuple(row) + (None,) * (width - len(row))
+            data.append(tuple(row[idx] for idx in indexes))
+    finally:
+        workbook.close()
+
+    return pd.DataFrame(_trim_trailing_empty(data), columns=selected)
+
+
+def read_calamine(path, columns):
+    """python-calamine 엔진으로 지정한 컬럼만 읽기"""
+    return pd.read_excel(path, engine="calamine", usecols=lambda name: str(name) in columns)
+
+
+def read_pandas(path, columns):
+    """pandas 기본 엔진 (비교/문제 해결용)"""
+    return pd.read_excel(path, usecols=lambda name: str(name) in columns)
+
+
+READERS = {
+    "calamine": read_calamine,
+    "openpyxl": read_openpyxl,
+    "pandas": read_pandas,
+}
+
+
+def resolve_reader(name=None):
+    """사용할 백엔드 이름 (지정이 없으면 설치된 것 중 가장 빠른 것)"""
+    name = name or os.environ.get(READER_ENV) or None
+    if name:
+        if name not in READERS:
+            raise ValueError(f"알 수 없는 Excel 읽기 백엔드: {name} (사용 가능: {', '.join(READERS)})")
+        return name
+    return "calamine" if _has_calamine() else "openpyxl"
+
+
+def read_income_summary(path, columns, reader=None):
+    """헌금 데이터 파일에서 필요한 컬럼만 읽기
+
+    Args:
+        columns: 읽을 컬럼 (파일에 없는 컬럼은 결과에서 빠짐)
+        reader: 백엔드 이름 (기본: 자동 선택)
+    """
+    df = READERS[resolve_reader(reader)](path, set(columns))
+    # 원본 순서와 관계없이 요청한 컬럼 순서로 정렬
+    return df[[col for col in columns if col in df.columns]]
@@ -0,0 +1,133 @@
+"""
+발급번호 색인 (.receipt_cache/YYYY_income_summary.receipt_index.json)
+
+이름순 전체 목록에서의 순번을 데이터 폴더의 숨김 캐시 폴더에 저장해 두고,
+데이터 파일 내용(SHA-256)이 바뀌었을 때만 다시 만듭니다.
+발급번호 문자열은 조회할 때 접두사/연도를 붙여 만듭니다.
+"""
+
+import hashlib
+import json
+import os
+from collections.abc import Mapping
+
+from .locking import atomic_write
+
+
+INDEX_VERSION = 1
+INDEX_SUFFIX = ".receipt_index.json"
+
+# 데이터 폴더 안의 캐시 폴더 (사용자의 데이터 파일 옆을 어지럽히지 않도록 숨김 폴더)
+CACHE_DIR_NAME = ".receipt_cache"
+
+
+def cache_dir_for(data_path):
+    """데이터 파일의 캐시 폴더 경로"""
+    return os.path.join(os.path.dirname(os.path.abspath(data_path)), CACHE_DIR_NAME)
+
+
+def index_path_for(data_path):
+    """데이터 파일에 대응하는 색인 파일 경로"""
+    base, _ = os.path.splitext(os.path.basename(data_path))
+    return os.path.join(cache_dir_for(data_path), base + INDEX_SUFFIX)
+
+
+def file_sha256(path):
+    """파일 내용 해시"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def build_sequence(df):
+    """이름 -> 순번 (1부터, 동명이인은 마지막 순번)"""
+    return dict(zip(df["이름"], range(1, len(df) + 1)))
+
+
+class ReceiptNumbers(Mapping):
+    """이름 -> 발급번호 (조회한 이름만 문자열로 만듦)"""
+
+    def __init__(self, sequence, issue_year, prefix=""):
+        self._sequence = sequence
+        self.issue_year = issue_year
+        self.prefix = prefix
+
+    def __getitem__(self, name):
+        return f"{self.prefix}{self.issue_year}-{self._sequence[name]:03d}"
+
+    def __contains__(self, name):
+        return name in self._sequence
+
+    def __iter__(self):
+        return iter(self._sequence)
+
+    def __len__(self):
+        return len(self._sequence)
+
+
+class ReceiptIndex:
+    """데이터 파일 하나의 발급번호 색인"""
+
+    def __init__(self, sequence, sha256):
+        self.sequence = sequence
+        self.sha256 = sha256
+
+    def numbers(self, issue_year, prefix=""):
+        return ReceiptNumbers(self.sequence, issue_year, prefix)
+
+
+def _read_index(index_path):
+    try:
+        with open(index_path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get("version") != INDEX_VERSION:
+        return None
+    return data
+
+
+def _write_index(index_path, data):
+    """임시 파일에 쓰고 교체 (쓸 수 없는 폴더면 저장하지 않음)"""
+    try:
+        os.makedirs(os.path.dirname(index_path), exist_ok=True)
+        with atomic_write(index_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+    except OSError:
+        pass
+
+
+def load_receipt_index(data_path, load_df):
+    """발급번호 색인 로드 (데이터가 바뀌었으면 load_df()로 다시 만들어 저장)
+
+    Args:
+        data_path: 헌금 데이터 파일 경로
+        load_df: 이름순 정렬된 대상자 표를 반환하는 함수 (재생성할 때만 호출)
+    """
+    index_path = index_path_for(data_path)
+    stat = os.stat(data_path)
+    data = _read_index(index_path)
+
+    if data is not None:
+        source = data.get("source") or {}
+        # 수정 시각/크기가 같으면 해시 계산도 생략
+        if source.get("mtime_ns") == stat.st_mtime_ns and source.get("size") == stat.st_size:
+            return ReceiptIndex(data["names"], source.get("sha256"))
+
+        sha256 = file_sha256(data_path)
+        if source.get("sha256") == sha256:
+            data["source"] = {"sha256": sha256, "mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+            _write_index(index_path, data)
+            return ReceiptIndex(data["names"], sha256)
+    else:
+        sha256 = file_sha256(data_path)
+
+    sequence = build_sequence(load_df())
+    _write_index(index_path, {
+        "version": INDEX_VERSION,
+        "source": {"sha256": sha256, "mtime_ns": stat.st_mtime_ns, "size": stat.st_size},
+        "names": sequence,
+    })
+    return ReceiptIndex(sequence, sha256)
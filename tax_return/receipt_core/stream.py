@@ -0,0 +1,194 @@
+"""
+대용량 대상자 목록용 스트리밍 발행
+
+openpyxl 읽기 전용 모드로 한 행씩 읽어 부부 이름을 그 자리에서 나누고,
+영수증을 렌더링하면서 발행대장에 묶음 단위로 기록합니다.
+전체 표를 DataFrame으로 올리지 않으므로 대상자 수와 관계없이 메모리 사용량이 거의 일정합니다.
+(발급번호 순번을 정하기 위한 이름 목록만 유지하며, 이는 receipt_index 색인으로 저장됩니다)
+
+영수증은 이름순이 아니라 데이터 파일의 행 순서대로 만들어지지만,
+발급번호는 일반 발행과 같은 이름순 번호를 사용합니다.
+"""
+
+import os
+from collections import deque
+
+import pandas as pd
+
+from .dataset import MONTH_COLUMNS, TOTAL_COLUMN, REQUIRED_COLUMNS, SUMMARY_ROW_NAME
+from .template import build_context
+from .batch import render_receipts
+from .ledger import open_ledger
+from .receipt_index import load_receipt_index
+
+
+# 발행대장/PDF 변환을 묶어서 처리하는 단위
+LEDGER_BATCH_SIZE = 100
+
+
+def _amount(value):
+    """금액 셀 값 -> 정수 (빈 칸은 0, 숫자가 아니면 ValueError)"""
+    if value is None or value != value:
+        return 0
+    return int(value)
+
+
+def _iter_rows(data_path):
+    """데이터 행마다 (이름 목록, 월별 금액 dict, 연간 총합, 오류) 반환 (합계 행 제외)
+
+    금액이 숫자가 아닌 행은 금액 대신 오류 메시지를 돌려주므로, 호출하는 쪽이 그 행만 건너뛸 수 있습니다.
+    """
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(data_path, read_only=True, data_only=True)
+    try:
+        sheet = workbook.worksheets[0]
+        # 파일에 적힌 범위(<dimension>)가 틀려도 실제 데이터 끝까지 읽음
+        sheet.reset_dimensions()
+        rows = sheet.iter_rows(values_only=True)
+        header = next(rows, None) or ()
+        columns = {str(name): idx for idx, name in enumerate(header) if name is not None}
+        missing = [col for col in REQUIRED_COLUMNS if col not in columns]
+        if missing:
+            raise ValueError(f"필수 컬럼이 없습니다: {', '.join(missing)}")
+
+        name_idx = columns["이름"]
+        amount_idx = [(col, columns[col]) for col in MONTH_COLUMNS + [TOTAL_COLUMN]]
+
+        # 행 번호는 헤더를 1행으로 센 엑셀 행 번호
+        for row_no, row in enumerate(rows, start=2):
+            if name_idx >= len(row):
+                continue
+            raw_name = row[name_idx]
+            if raw_name is None or raw_name == SUMMARY_ROW_NAME:
+                continue
+
+            raw_name = str(raw_name)
+            names = [name.strip() for name in raw_name.split(",")] if "," in raw_name else [raw_name]
+
+            amounts = {}
+            error = None
+            for col, idx in amount_idx:
+                try:
+                    amounts[col] = _amount(row[idx] if idx < len(row) else None)
+                except (TypeError, ValueError):
+                    error = f"행 {row_no}: '{col}' 컬럼에 숫자가 아닌 값"
+                    break
+            if error:
+                yield names, None, None, error
+                continue
+
+            total = amounts.pop(TOTAL_COLUMN)
+            yield names, amounts, total, None
+    finally:
+        workbook.close()
+
+
+def iter_donors(data_path):
+    """대상자 한 명씩 (이름, 월별 금액 dict, 연간 총합) 반환 (합계 행 제외, 부부 분리)
+
+    load_data와 같은 규칙을 따릅니다: 쉼표로 나눈 이름만 앞뒤 공백을 제거합니다.
+    금액이 숫자가 아닌 행이 있으면 ValueError입니다.
+    """
+    for names, monthly, total, error in _iter_rows(data_path):
+        if error:
+            raise ValueError(error)
+        for name in names:
+            yield name, monthly, total
+
+
+def iter_names(data_path):
+    """이름만 한 명씩 반환 (발급번호 색인 생성용, 금액이 잘못된 행의 이름도 포함)"""
+    for names, _, _, _ in _iter_rows(data_path):
+        yield from names
+
+
+def receipt_numbers(data_path, issue_year, prefix=""):
+    """이름 -> 발급번호 (이름순 전체 목록 기준, 저장된 색인 재사용)"""
+    def load_names():
+        return pd.DataFrame({"이름": sorted(iter_names(data_path))})
+
+    return load_receipt_index(data_path, load_names).numbers(issue_year, prefix)
+
+
+def stream_receipts(data_path, template_path, output_dir, ledger_path, issue_year, prefix="",
+                    names=None, jobs=1, native_pdf=False, layout_path=None, extra_fields=None,
+                    convert_pdf=None, batch_size=LEDGER_BATCH_SIZE):
+    """대상자를 한 명씩 렌더링하며 발행대장에 묶음 단위로 기록
+
+    Args:
+        names: 발행 대상 이름 집합 (None이면 전체)
+        convert_pdf: 묶음마다 호출할 PDF 변환 함수 ({docx 경로: 이름} -> {docx 경로: pdf 경로 또는 None})
+        batch_size: 발행대장 기록/PDF 변환 묶음 크기
+
+    Yields:
+        대상자마다 {"name", "receipt_no", "output_path", "pdf_path", "error"}
+        (금액이 숫자가 아닌 행의 대상자는 렌더링하지 않고 error로 보고하며 나머지는 계속 발행)
+    """
+    numbers = receipt_numbers(data_path, issue_year, prefix)
+    default_no = f"{prefix}{issue_year}-000"
+    targets = deque()
+    ledger_records = []
+    generated = {}
+    pending_events = []
+
+    def items():
+        for row_names, monthly, total, error in _iter_rows(data_path):
+            for name in row_names:
+                if names is not None and name not in names:
+                    continue
+                receipt_no = numbers.get(name, default_no)
+                if error:
+                    # 금액이 잘못된 행은 렌더링하지 않고 그 대상자만 실패로 보고
+                    pending_events.append({"name": name, "receipt_no": receipt_no, "output_path": None,
+                                           "pdf_path": None, "error": error})
+                    continue
+                safe_name = name.replace("/", "_").replace("\\", "_")
+                output_path = os.path.join(output_dir, f"기부금영수증_{safe_name}.docx")
+                context = build_context(name, monthly, total, receipt_no)
+                if extra_fields:
+                    context.update(extra_fields)
+                # 렌더링 결과와 짝을 맞추기 위해 순서대로 보관 (결과를 받으면 바로 비움)
+                targets.append((name, receipt_no, total, output_path))
+                yield context, output_path
+
+    os.makedirs(output_dir, exist_ok=True)
+
+    def flush():
+        # 기록한 묶음은 바로 비움 (PDF 변환이 실패해도 같은 기록을 다시 쓰지 않음)
+        if ledger_records:
+            with open_ledger(ledger_path) as ledger:
+                ledger.append_many(ledger_records)
+            ledger_records.clear()
+        if convert_pdf and generated:
+            batch = dict(generated)
+            generated.clear()
+            events = {event["output_path"]: event for event in pending_events if not event["error"]}
+            for docx_path, pdf_path in convert_pdf(batch).items():
+                events[docx_path]["pdf_path"] = pdf_path
+        generated.clear()
+
+    results = render_receipts(template_path, items(), jobs=jobs,
+                              native_pdf=native_pdf, layout_path=layout_path)
+    try:
+        for result in results:
+            name, receipt_no, total, output_path = targets.popleft()
+            event = {"name": name, "receipt_no": receipt_no, "output_path": output_path,
+                     "pdf_path": result["pdf_path"], "error": result["error"]}
+            if not result["error"]:
+                ledger_records.append((receipt_no, name, total, output_path))
+                generated[output_path] = name
+            pending_events.append(event)
+
+            if len(pending_events) >= batch_size:
+                flush()
+                yield from pending_events
+                pending_events.clear()
+    finally:
+        # 중간에 오류가 나거나 호출한 쪽이 멈춰도 이미 만든 영수증은 발행대장에 남김
+        flush()
+        # 엑셀 발행대장은 마지막에 한 번 내보냄 (저널에서 스트리밍으로 기록)
+        with open_ledger(ledger_path) as ledger:
+            ledger.export_xlsx()
+
+    yield from pending_events
@@ -0,0 +1,75 @@
+"""
+배열 기반 대상자 표
+
+영수증 루프에서 대상자마다 pandas Series를 만들지 않도록
+이름 목록, 월별 금액 행렬(N×12, int64), 연간 총합 벡터, 이름 -> 행 번호 dict로 보관합니다.
+금액 문자열(천 단위 콤마)은 전체 대상자에 대해 한 번에 만들어 둡니다.
+"""
+
+from functools import cached_property
+
+import numpy as np
+
+from .dataset import MONTH_COLUMNS, TOTAL_COLUMN
+
+
+def format_amounts(values):
+    """금액 배열을 천 단위 콤마 문자열 배열로 변환 (0은 빈 문자열, format_amount와 같은 규칙)
+
+    같은 금액이 많으므로 서로 다른 값만 포맷한 뒤 배열 인덱싱으로 펼칩니다.
+    """
+    values = np.asarray(values, dtype=np.int64)
+    unique, inverse = np.unique(values, return_inverse=True)
+    labels = np.array([f"{v:,}" if v else "" for v in unique.tolist()], dtype=object)
+    return labels[inverse.reshape(values.shape)]
+
+
+class DonorTable:
+    """대상자 표 (읽기 전용)"""
+
+    def __init__(self, names, monthly, totals):
+        self.names = list(names)
+        self.monthly = np.asarray(monthly, dtype=np.int64).reshape(len(self.names), len(MONTH_COLUMNS))
+        self.totals = np.asarray(totals, dtype=np.int64)
+        # 동명이인은 첫 번째 행 (기존 df[df["이름"] == name].iloc[0]과 같음)
+        self.index = {}
+        for position, name in enumerate(self.names):
+            self.index.setdefault(name, position)
+
+    @classmethod
+    def from_frame(cls, df):
+        """load_data 결과(DataFrame)에서 생성"""
+        return cls(
+            df["이름"].tolist(),
+            df[MONTH_COLUMNS].to_numpy(dtype=np.int64),
+            df[TOTAL_COLUMN].to_numpy(dtype=np.int64),
+        )
+
+    def __len__(self):
+        return len(self.names)
+
+    def find(self, name):
+        """이름의 행 번호 (없으면 None)"""
+        return self.index.get(name)
+
+    @cached_property
+    def monthly_text(self):
+        """N×12 금액 문자열"""
+        return format_amounts(self.monthly)
+
+    @cached_property
+    def total_text(self):
+        """N개 연간 총합 문자열"""
+        return format_amounts(self.totals)
+
+    def monthly_amounts(self, position):
+        """{"1월": 금액, ...}"""
+        return dict(zip(MONTH_COLUMNS, self.monthly[position].tolist()))
+
+    def context(self, position, receipt_no):
+        """템플릿 placeholder 값 (build_context와 같은 결과)"""
+        context = {"receipt_no": receipt_no, "name": self.names[position]}
+        for month, text in enumerate(self.monthly_text[position], start=1):
+            context[f"month_{month}"] = text
+        context["total"] = self.total_text[position]
+        return context
@@ -0,0 +1,251 @@
+"""
+컴파일된 영수증 템플릿
+
+템플릿(.docx)의 압축 해제, XML 전처리, Jinja 컴파일을 한 번만 수행하고
+대상자별로는 변수 치환과 파일 쓰기만 합니다.
+캐시는 (절대 경로, 수정 시각) 기준이라 템플릿을 고치면 자동으로 다시 읽습니다.
+"""
+
+import os
+import re
+import zipfile
+import hashlib
+import threading
+
+import pandas as pd
+from lxml import etree
+from jinja2 import Environment, Template, meta
+from docxtpl import DocxTemplate
+from docx.oxml.ns import nsmap
+
+from .zipcopy import read_raw_entries, compress_entry, write_zip
+
+
+# Jinja 구문이 들어 있을 수 있는 파트 (폰트/이미지 등 바이너리 제외)
+XML_PART_SUFFIXES = (".xml", ".rels")
+# "{{", "{%", "{#" (Word가 중괄호 사이에 런 태그를 넣은 경우 포함)
+JINJA_MARKER = re.compile(rb"\{(?:<[^>]*>)*[{%#]")
+# 렌더링 결과에 따라 표/그림 개수가 달라질 수 있는 구문 ({% for %}, {%tc %} 등 블록과 주석)
+JINJA_BLOCK_MARKER = re.compile(rb"\{(?:<[^>]*>)*[%#]")
+
+# 본문 파트 (docxtpl이 표 열 정리와 그림 ID 다시 매기기를 하는 파트)
+DOCUMENT_PART = "word/document.xml"
+# docxtpl.render_init의 docx_ids_index 시작값 (그림 ID는 이 다음 번호부터)
+DOCPR_ID_START = 1000
+
+# 영수증 항목 (템플릿 placeholder 이름)
+RECEIPT_FIELDS = (
+    ["receipt_no", "name"]
+    + [f"month_{i}" for i in range(1, 13)]
+    + ["total"]
+)
+
+# docxtpl.resolve_listing이 처리하는 특수 문자
+LISTING_CHARS = ("\t", "\a", "\n", "\f")
+
+
+def _has_jinja(data):
+    """Jinja 구문이 들어 있을 수 있는 파트인지"""
+    return JINJA_MARKER.search(data) is not None
+
+
+def _fix_structure(helper, xml_bytes):
+    """docxtpl.render가 본문에 하는 후처리 (표 열 정리 fix_tables, 그림 ID 다시 매기기 fix_docpr_ids)"""
+    tree = helper.fix_tables(xml_bytes)
+    for index, element in enumerate(tree.xpath("//wp:docPr", namespaces=nsmap), start=DOCPR_ID_START + 1):
+        element.attrib["id"] = str(index)
+    # python-docx가 파트를 저장할 때와 같은 선언부
+    return etree.tostring(tree, encoding="UTF-8", standalone=True)
+
+
+def _xml_encoding(xml_bytes):
+    """XML 선언부에서 인코딩 추출"""
+    match = re.match(rb'<\?xml[^?]+\bencoding="([^"]+)"', xml_bytes, re.I)
+    if match:
+        return match.group(1).decode("ascii")
+    return "utf-8"
+
+
+def format_amount(amount):
+    """금액을 천 단위 콤마 포맷으로 변환"""
+    if pd.isna(amount) or amount == 0:
+        return ""
+    return f"{int(amount):,}"
+
+
+def build_context(name, monthly_amounts, total_amount, receipt_no):
+    """템플릿 placeholder에 들어갈 값 생성"""
+    context = {
+        "receipt_no": receipt_no,
+        "name": name,
+    }
+    for month in range(1, 13):
+        context[f"month_{month}"] = format_amount(monthly_amounts.get(f"{month}월", 0))
+    context["total"] = format_amount(total_amount)
+    return context
+
+
+class CompiledTemplate:
+    """한 번 파싱/컴파일된 DOCX 템플릿
+
+    Jinja 구문이 있는 모든 XML 파트(본문, 머리글/바닥글, 각주, 문서 속성)를 치환하고,
+    본문은 docxtpl.render처럼 표 열 정리와 그림 ID 다시 매기기를 합니다.
+    """
+
+    def __init__(self, template_path):
+        self.path = os.path.abspath(template_path)
+        self.mtime_ns = os.stat(self.path).st_mtime_ns
+
+        # docxtpl의 XML 전처리 함수만 사용 (문서 로드는 하지 않음)
+        self._helper = DocxTemplate(self.path)
+
+        # 원본 zip 항목 (ZipInfo, 압축된 바이트), 순서 유지
+        self.entries = read_raw_entries(self.path)
+        # 파트 이름 -> (컴파일된 Jinja 템플릿, 인코딩)
+        self.parts = {}
+        # 파트 이름 -> 원본 대신 쓸 bytes (변수 없이 후처리만 한 본문)
+        self.fixed_parts = {}
+        # 본문에 블록 구문이 있으면 렌더링할 때마다 표/그림 ID 후처리
+        self.fix_after_render = False
+
+        with zipfile.ZipFile(self.path) as zf:
+            for info, _ in self.entries:
+                if not info.filename.endswith(XML_PART_SUFFIXES):
+                    continue
+                data = zf.read(info.filename)
+                if info.filename == DOCUMENT_PART:
+                    # 변수 치환만 있으면 표/그림 구조가 바뀌지 않으므로 후처리는 여기서 한 번만
+                    self.fix_after_render = JINJA_BLOCK_MARKER.search(data) is not None
+                    if not self.fix_after_render:
+                        data = _fix_structure(self._helper, data)
+                        if not _has_jinja(data):
+                            self.fixed_parts[info.filename] = data
+                            continue
+                if _has_jinja(data):
+                    encoding = _xml_encoding(data)
+                    xml = self._helper.patch_xml(data.decode(encoding))
+                    xml = re.sub(r"<w:p([ >])", r"\n<w:p\1", xml)
+                    self.parts[info.filename] = (Template(xml), encoding)
+
+    def render_parts(self, context):
+        """변수 치환된 파트 반환 (파트 이름 -> bytes)"""
+        needs_listing = any(
+            isinstance(v, str) and any(c in v for c in LISTING_CHARS)
+            for v in context.values()
+        )
+
+        rendered = dict(self.fixed_parts)
+        for name, (template, encoding) in self.parts.items():
+            xml = template.render(context)
+            xml = re.sub(r"\n<w:p([ >])", r"<w:p\1", xml)
+            xml = (
+                xml.replace("{_{", "{{")
+                .replace("}_}", "}}")
+                .replace("{_%", "{%")
+                .replace("%_}", "%}")
+            )
+            if needs_listing:
+                xml = self._helper.resolve_listing(xml)
+            rendered[name] = xml.encode(encoding)
+            if name == DOCUMENT_PART and self.fix_after_render:
+                rendered[name] = _fix_structure(self._helper, rendered[name])
+        return rendered
+
+    def save(self, context, output_path):
+        """변수 치환 후 DOCX 파일 저장 (치환된 파트만 새로 압축, 나머지는 그대로 복사)"""
+        rendered = self.render_parts(context)
+        write_zip(output_path, [
+            compress_entry(info, rendered[info.filename]) if info.filename in rendered else (info, raw)
+            for info, raw in self.entries
+        ])
+
+
+def template_variables(template_path):
+    """템플릿에서 사용하는 Jinja 변수 이름 (렌더링하지 않고 XML 파트만 분석)
+
+    docxtpl의 patch_xml로 여러 런에 나뉜 placeholder를 합친 뒤 구문 트리에서 찾으므로
+    {% for %} 등으로 템플릿 안에서 선언한 변수는 포함되지 않습니다.
+    """
+    helper = DocxTemplate(template_path)
+    environment = Environment()
+    variables = set()
+    with zipfile.ZipFile(template_path) as zf:
+        for info in zf.infolist():
+            if not info.filename.endswith(XML_PART_SUFFIXES):
+                continue
+            data = zf.read(info.filename)
+            if not _has_jinja(data):
+                continue
+            xml = helper.patch_xml(data.decode(_xml_encoding(data)))
+            variables |= meta.find_undeclared_variables(environment.parse(xml))
+    return variables
+
+
+# 템플릿 내용 해시 -> 사용하는 변수 (frozenset), (절대 경로, 수정 시각, 크기) -> 해시
+_variables_cache = {}
+_hash_cache = {}
+
+
+def _template_sha256(path):
+    stat = os.stat(path)
+    key = (path, stat.st_mtime_ns, stat.st_size)
+    with _cache_lock:
+        sha256 = _hash_cache.get(key)
+    if sha256 is None:
+        with open(path, "rb") as f:
+            sha256 = hashlib.sha256(f.read()).hexdigest()
+        with _cache_lock:
+            _hash_cache[key] = sha256
+    return sha256
+
+
+def analyze_placeholders(template_path, required=RECEIPT_FIELDS):
+    """필수 placeholder 대비 누락/추가 변수 분석 (템플릿 내용 해시 기준 캐시)
+
+    Returns:
+        {"variables": [...], "missing": [...], "extra": [...]} - 모두 정렬된 목록
+    """
+    path = os.path.abspath(template_path)
+    sha256 = _template_sha256(path)
+
+    with _cache_lock:
+        variables = _variables_cache.get(sha256)
+    if variables is None:
+        variables = frozenset(template_variables(path))
+        with _cache_lock:
+            _variables_cache[sha256] = variables
+
+    return {
+        "variables": sorted(variables),
+        "missing": [name for name in required if name not in variables],
+        "extra": sorted(variables - set(required)),
+    }
+
+
+# (절대 경로, 수정 시각) -> CompiledTemplate
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+def get_compiled_template(template_path):
+    """캐시된 컴파일 템플릿 반환 (템플릿이 바뀌었으면 다시 컴파일)"""
+    path = os.path.abspath(template_path)
+    key = (path, os.stat(path).st_mtime_ns)
+
+    with _cache_lock:
+        template = _cache.get(key)
+        if template is None:
+            # 같은 경로의 이전 버전 제거
+            for stale in [k for k in _cache if k[0] == path]:
+                del _cache[stale]
+            template = CompiledTemplate(path)
+            _cache[key] = template
+        return template
+
+
+def clear_template_cache():
+    """템플릿 캐시 비우기"""
+    with _cache_lock:
+        _cache.clear()
+        _variables_cache.clear()
+        _hash_cache.clear()
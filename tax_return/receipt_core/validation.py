@@ -0,0 +1,105 @@
+"""
+헌금 데이터 검증 규칙
+
+셀/행 단위 반복 없이 컬럼 단위 마스크로 검사합니다.
+판정 기준은 기존 반복 검사와 같습니다 (isinstance(value, (int, float))를 숫자로 봄).
+경고 메시지에는 이름을 넣지 않고 Excel 행 번호만 넣습니다.
+"""
+
+import numpy as np
+import pandas as pd
+
+from .dataset import MONTH_COLUMNS, TOTAL_COLUMN, AMOUNT_COLUMNS
+
+
+# 월별 합계와 연간 총합의 허용 오차 (원)
+TOTAL_TOLERANCE = 1
+
+
+def _number_values(series):
+    """(숫자 셀 마스크, 숫자 값 배열) - 숫자가 아니거나 빈 셀의 값은 0"""
+    if pd.api.types.is_numeric_dtype(series.dtype):
+        number = series.notna().to_numpy()
+        values = np.where(number, series.to_numpy(dtype=np.float64, na_value=0.0), 0.0)
+        return number, values
+
+    # object 컬럼: 서로 다른 타입만 isinstance로 판정한 뒤 마스크로 펼침
+    objects = series.to_numpy(dtype=object)
+    types = pd.Series(list(map(type, objects)), index=series.index, dtype=object)
+    numeric_types = [t for t in types.unique() if issubclass(t, (int, float))]
+    number = (types.isin(numeric_types) & series.notna()).to_numpy()
+
+    values = np.zeros(len(series), dtype=np.float64)
+    if number.any():
+        values[number] = np.array(objects[number].tolist(), dtype=np.float64)
+    return number, values
+
+
+def amount_flags(df, columns=AMOUNT_COLUMNS):
+    """컬럼별 (숫자가 아닌 값 마스크, 음수 값 마스크) - 없는 컬럼은 건너뜀"""
+    flags = {}
+    for col in columns:
+        if col not in df.columns:
+            continue
+        number, values = _number_values(df[col])
+        non_numeric = df[col].notna().to_numpy() & ~number
+        flags[col] = (non_numeric, number & (values < 0))
+    return flags
+
+
+def total_mismatches(df, tolerance=TOTAL_TOLERANCE):
+    """월별 합계와 연간 총합이 다른 행 (행 위치, 월별 합계, 연간 총합)
+
+    숫자가 아닌 월 금액은 0으로 계산하고, 연간 총합이 숫자가 아닌 행은
+    이미 amount_flags에서 경고하므로 건너뜁니다.
+    """
+    monthly = np.zeros(len(df), dtype=np.float64)
+    for col in MONTH_COLUMNS:
+        monthly += _number_values(df[col])[1]
+
+    total_series = df[TOTAL_COLUMN]
+    number, totals = _number_values(total_series)
+    comparable = number | total_series.isna().to_numpy()
+
+    positions = np.flatnonzero(comparable & (np.abs(monthly - totals) > tolerance))
+    return positions, monthly[positions], totals[positions]
+
+
+def count_duplicate_names(names):
+    """중복된 이름 수 (쉼표로 구분된 부부 이름은 나눠서 셈)"""
+    names = names.dropna().astype(str)
+    has_comma = names.str.contains(",", regex=False)
+    expanded = pd.concat([
+        names[~has_comma],
+        names[has_comma].str.split(",").explode().str.strip(),
+    ])
+    counts = expanded.value_counts()
+    return int((counts > 1).sum())
+
+
+def data_warnings(df):
+    """원본 표(read_income_summary 결과)의 경고 메시지 목록
+
+    금액 컬럼 순서 -> 행 순서, 월별 합계, 중복 이름 순으로 기존 검사와 같은 메시지를 만듭니다.
+    """
+    warnings = []
+    rows = df.index.to_numpy() + 2  # 헤더 1행 + 0부터 시작하는 인덱스
+
+    for col, (non_numeric, negative) in amount_flags(df).items():
+        # 한 셀이 두 경고에 모두 해당할 수는 없으므로 행 순서로 합침
+        for position in np.flatnonzero(non_numeric | negative):
+            kind = "숫자가 아닌 값" if non_numeric[position] else "음수 값"
+            warnings.append(f"행 {rows[position]}: '{col}' 컬럼에 {kind}")
+
+    if all(col in df.columns for col in AMOUNT_COLUMNS):
+        positions, monthly, totals = total_mismatches(df)
+        for position, monthly_sum, annual_total in zip(positions, monthly, totals):
+            warnings.append(f"행 {rows[position]}: 월별 합계({int(monthly_sum)})와 "
+                            f"연간 총합({int(annual_total)})이 다름")
+
+    if "이름" in df.columns:
+        duplicates = count_duplicate_names(df["이름"])
+        if duplicates:
+            warnings.append(f"중복된 이름 {duplicates}건 (상세 내용은 파일에서 확인)")
+
+    return warnings
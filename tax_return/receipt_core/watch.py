@@ -0,0 +1,72 @@
+"""
+데이터/템플릿 파일 변경 감시
+
+감시할 파일이 몇 개뿐이므로 별도 라이브러리 없이 stat 폴링으로 확인합니다.
+Excel은 저장할 때 파일을 여러 번 쓰므로, 변경 후 debounce 초 동안 더 바뀌지 않아야 알립니다.
+"""
+
+import glob
+import os
+import threading
+import time
+
+
+DEFAULT_INTERVAL = 1.0
+DEFAULT_DEBOUNCE = 2.0
+
+
+class PollingWatcher:
+    """경로 패턴(glob)에 맞는 파일의 추가/수정/삭제 감시"""
+
+    def __init__(self, patterns, interval=DEFAULT_INTERVAL, debounce=DEFAULT_DEBOUNCE):
+        self.patterns = list(patterns)
+        self.interval = interval
+        self.debounce = debounce
+        self._state = self.snapshot()
+
+    def snapshot(self):
+        """{경로: (수정 시각, 크기)}"""
+        state = {}
+        for pattern in self.patterns:
+            for path in glob.glob(pattern):
+                # Excel 잠금 파일(~$...)은 제외
+                if os.path.basename(path).startswith("~$"):
+                    continue
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                state[path] = (stat.st_mtime_ns, stat.st_size)
+        return state
+
+    @staticmethod
+    def _changed(before, after):
+        return {path for path in before.keys() | after.keys() if before.get(path) != after.get(path)}
+
+    def wait(self, stop_event=None):
+        """변경이 생기고 잠잠해질 때까지 대기 후 바뀐 경로 집합 반환 (중지되면 None)"""
+        stop_event = stop_event or threading.Event()
+        pending = set()
+        last_change = None
+
+        while not stop_event.wait(self.interval):
+            current = self.snapshot()
+            changed = self._changed(self._state, current)
+            self._state = current
+
+            if changed:
+                pending |= changed
+                last_change = time.monotonic()
+            elif pending and time.monotonic() - last_change >= self.debounce:
+                return pending
+        return None
+
+
+def watch(patterns, on_change, interval=DEFAULT_INTERVAL, debounce=DEFAULT_DEBOUNCE, stop_event=None):
+    """변경될 때마다 on_change(바뀐 경로 집합) 호출 (stop_event가 설정되면 종료)"""
+    watcher = PollingWatcher(patterns, interval, debounce)
+    while True:
+        changed = watcher.wait(stop_event)
+        if changed is None:
+            return
+        on_change(changed)
@@ -0,0 +1,108 @@
+"""
+압축된 zip 항목을 그대로 복사하는 DOCX 쓰기
+
+zipfile로 다시 쓰면 폰트/이미지/스타일처럼 바뀌지 않는 파트도 영수증마다 다시 압축됩니다.
+템플릿에서 압축된 바이트를 한 번 읽어 두고 그대로 복사하며,
+변수가 치환된 파트만 새로 압축합니다. (ZIP64/암호화 미지원 - DOCX 템플릿에는 필요 없음)
+"""
+
+import copy
+import struct
+import zipfile
+import zlib
+
+from .locking import atomic_write
+
+
+LOCAL_HEADER = struct.Struct("<4s5H3L2H")
+CENTRAL_HEADER = struct.Struct("<4s6H3L5H2L")
+END_RECORD = struct.Struct("<4s4H2LH")
+
+LOCAL_SIGNATURE = b"PK\x03\x04"
+CENTRAL_SIGNATURE = b"PK\x01\x02"
+END_SIGNATURE = b"PK\x05\x06"
+
+FLAG_ENCRYPTED = 0x01
+FLAG_DATA_DESCRIPTOR = 0x08
+FLAG_UTF8 = 0x800
+ZIP32_LIMIT = 0xFFFFFFFF
+ENTRY_LIMIT = 0xFFFF
+
+
+def read_raw_entries(path):
+    """zip 항목별 (ZipInfo, 압축된 바이트) 목록 (원본 순서)"""
+    entries = []
+    with zipfile.ZipFile(path) as zf, open(path, "rb") as f:
+        for info in zf.infolist():
+            if info.flag_bits & FLAG_ENCRYPTED:
+                raise ValueError(f"암호화된 zip 항목은 지원하지 않습니다: {info.filename}")
+            f.seek(info.header_offset)
+            header = LOCAL_HEADER.unpack(f.read(LOCAL_HEADER.size))
+            if header[0] != LOCAL_SIGNATURE:
+                raise zipfile.BadZipFile(f"잘못된 zip 항목 헤더: {info.filename}")
+            f.seek(header[9] + header[10], 1)  # 파일 이름 + extra 필드
+            entries.append((info, f.read(info.compress_size)))
+    return entries
+
+
+def compress_entry(info, data):
+    """새 내용으로 압축한 (ZipInfo, 압축된 바이트) - 압축 방식은 원본 항목을 따름"""
+    info = copy.copy(info)
+    info.file_size = len(data)
+    info.CRC = zlib.crc32(data)
+    if info.compress_type == zipfile.ZIP_STORED:
+        compressed = data
+    else:
+        info.compress_type = zipfile.ZIP_DEFLATED
+        compressor = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -15)
+        compressed = compressor.compress(data) + compressor.flush()
+    info.compress_size = len(compressed)
+    return info, compressed
+
+
+def _dos_datetime(date_time):
+    year, month, day, hour, minute, second = date_time
+    return (hour << 11) | (minute << 5) | (second // 2), ((year - 1980) << 9) | (month << 5) | day
+
+
+def _encoded_name(info):
+    try:
+        return info.filename.encode("ascii"), info.flag_bits & ~(FLAG_DATA_DESCRIPTOR | FLAG_UTF8)
+    except UnicodeEncodeError:
+        return info.filename.encode("utf-8"), (info.flag_bits & ~FLAG_DATA_DESCRIPTOR) | FLAG_UTF8
+
+
+def write_zip(output_path, entries):
+    """(ZipInfo, 압축된 바이트) 목록을 zip 파일로 저장"""
+    if len(entries) > ENTRY_LIMIT:
+        raise ValueError("zip 항목이 너무 많습니다 (ZIP64 미지원)")
+
+    central = []
+    offset = 0
+    # 임시 파일에 쓴 뒤 교체 (읽는 쪽이 쓰다 만 DOCX를 보지 않도록)
+    with atomic_write(output_path) as f:
+        for info, compressed in entries:
+            name, flags = _encoded_name(info)
+            dos_time, dos_date = _dos_datetime(info.date_time)
+            version = 20 if info.compress_type == zipfile.ZIP_DEFLATED else 10
+            if offset + len(compressed) > ZIP32_LIMIT or info.file_size > ZIP32_LIMIT:
+                raise ValueError("zip 파일이 너무 큽니다 (ZIP64 미지원)")
+
+            f.write(LOCAL_HEADER.pack(
+                LOCAL_SIGNATURE, version, flags, info.compress_type, dos_time, dos_date,
+                info.CRC, len(compressed), info.file_size, len(name), 0,
+            ))
+            f.write(name)
+            f.write(compressed)
+
+            central.append(CENTRAL_HEADER.pack(
+                CENTRAL_SIGNATURE, (info.create_system << 8) | version, version, flags,
+                info.compress_type, dos_time, dos_date, info.CRC, len(compressed), info.file_size,
+                len(name), 0, 0, 0, info.internal_attr, info.external_attr, offset,
+            ) + name)
+            offset += LOCAL_HEADER.size + len(name) + len(compressed)
+
+        directory = b"".join(central)
+        f.write(directory)
+        f.write(END_RECORD.pack(END_SIGNATURE, 0, 0, len(entries), len(entries),
+                                len(directory), offset, 0))
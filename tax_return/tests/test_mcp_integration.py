@@ -9,6 +9,7 @@ MCP 서버의 전체 워크플로우를 테스트합니다.
 """
 
 import os
+import sys
 import tempfile
 import shutil
 import pytest
@@ -25,12 +26,14 @@ from mcp_server.tools.receipt import (
 )
 from mcp_server.tools.validate import validate_data, validate_template
 from mcp_server.tools.history import get_history, get_person_history
+from mcp_server.executor import write_executor
 
 
 # 테스트 데이터 경로
 TEST_DIR = os.path.dirname(os.path.abspath(__file__))
-SAMPLE_DATA = os.path.join(TEST_DIR, "sample_income_summary.xlsx")
-SAMPLE_TEMPLATE = os.path.join(TEST_DIR, "donation_receipt_template.docx")
+PROJECT_DIR = os.path.dirname(TEST_DIR)
+SAMPLE_DATA = os.path.join(PROJECT_DIR, "sample_income_summary.xlsx")
+SAMPLE_TEMPLATE = os.path.join(PROJECT_DIR, "donation_receipt_template.docx")
 
 
 class TestEndToEndWorkflow:
@@ -48,6 +51,8 @@ class TestEndToEndWorkflow:
             shutil.copy(SAMPLE_TEMPLATE, os.path.join(temp_dir, "donation_receipt_template.docx"))
 
         yield temp_dir
+        # 쓰기 풀에 미뤄 둔 발행대장 내보내기가 끝난 뒤 정리
+        write_executor.submit(lambda: None).result()
         shutil.rmtree(temp_dir, ignore_errors=True)
 
     @pytest.mark.skipif(
@@ -205,6 +210,65 @@ class TestServerImport:
         assert hasattr(mcp, 'name')
         assert mcp.name == "oikos-receipt"
 
+    def test_server_import_skips_heavy_libraries(self):
+        """서버 시작 시 pandas/docxtpl을 불러오지 않고, 예열하면 불러옴"""
+        import mcp_server
+        project_dir = os.path.dirname(os.path.dirname(os.path.abspath(mcp_server.__file__)))
+        script = (
+            "import sys, json\n"
+            "import mcp_server.server\n"
+            "heavy = ('pandas', 'docxtpl', 'openpyxl')\n"
+            "before = [m for m in heavy if m in sys.modules]\n"
+            "from mcp_server.warmup import warm_up\n"
+            "warm_up()\n"
+            "print(json.dumps([before, [m for m in heavy if m in sys.modules]]))\n"
+        )
+        output = subprocess.run(
+            [sys.executable, "-c", script], cwd=project_dir,
+            capture_output=True, text=True, check=True
+        ).stdout
+        before, after = json.loads(output.strip().splitlines()[-1])
+        assert before == []
+        assert after == ["pandas", "docxtpl", "openpyxl"]
+
+
+class TestToolExecutor:
+    """도구 실행기 테스트 (읽기는 동시에, 쓰기는 순서대로)"""
+
+    def overlaps(self, run):
+        """같은 실행기로 두 작업을 동시에 보냈을 때 겹쳐 실행되었는지"""
+        import asyncio
+        import threading
+        import time
+
+        active = []
+        peak = []
+        lock = threading.Lock()
+
+        def work():
+            with lock:
+                active.append(1)
+                peak.append(len(active))
+            time.sleep(0.2)
+            with lock:
+                active.pop()
+
+        async def main():
+            await asyncio.gather(run(work), run(work))
+
+        asyncio.run(main())
+        return max(peak) > 1
+
+    def test_reads_run_concurrently(self):
+        from mcp_server.executor import run_read, READ_WORKERS
+        if READ_WORKERS < 2:
+            pytest.skip("읽기 작업자가 1개입니다")
+        assert self.overlaps(run_read)
+
+    def test_writes_are_serialized(self):
+        from mcp_server.executor import run_write
+        assert not self.overlaps(run_write)
+
 
 class TestErrorHandling:
     """오류 처리 테스트"""
@@ -8,8 +8,10 @@ MCP 서버 단위 테스트
 """
 
 import os
+import asyncio
 import tempfile
 import shutil
+import zipfile
 import pytest
 import pandas as pd
 from pathlib import Path
@@ -18,6 +20,7 @@ from pathlib import Path
 from mcp_server.tools.receipt import (
     list_recipients,
     generate_receipt,
+    generate_receipts,
     generate_all_receipts,
     preview_receipt,
     find_latest_data_file,
@@ -34,12 +37,25 @@ from mcp_server.tools.history import (
     get_history,
     get_person_history,
 )
+from mcp_server.tools.diff import diff_data
+from mcp_server.tools.jobs import start_generate_all_job, get_job_status, cancel_job, wait_for_job
+from mcp_server.executor import write_executor
 
 
 # 테스트 데이터 경로
 TEST_DIR = os.path.dirname(os.path.abspath(__file__))
-SAMPLE_DATA = os.path.join(TEST_DIR, "sample_income_summary.xlsx")
-SAMPLE_TEMPLATE = os.path.join(TEST_DIR, "donation_receipt_template.docx")
+PROJECT_DIR = os.path.dirname(TEST_DIR)
+SAMPLE_DATA = os.path.join(PROJECT_DIR, "sample_income_summary.xlsx")
+SAMPLE_TEMPLATE = os.path.join(PROJECT_DIR, "donation_receipt_template.docx")
+
+
+@pytest.fixture
+def sample_dir(tmp_path):
+    """샘플 파일을 복사한 임시 데이터 폴더 (캐시 파일이 테스트 폴더에 남지 않도록)"""
+    for path in (SAMPLE_DATA, SAMPLE_TEMPLATE):
+        if os.path.exists(path):
+            shutil.copy(path, tmp_path)
+    return str(tmp_path)
 
 
 class TestHelperFunctions:
@@ -104,9 +120,9 @@ class TestLoadData:
 class TestListRecipients:
     """list_recipients 함수 테스트"""
 
-    def test_list_recipients_with_sample_data(self):
+    def test_list_recipients_with_sample_data(self, sample_dir):
         """샘플 데이터로 대상자 목록 조회"""
-        result = list_recipients(TEST_DIR, "sample_income_summary.xlsx")
+        result = list_recipients(sample_dir, "sample_income_summary.xlsx")
 
         assert result["status"] == "success"
         assert "count" in result
@@ -119,9 +135,9 @@ class TestListRecipients:
         result = list_recipients(TEST_DIR, "nonexistent.xlsx")
         assert result["status"] == "error"
 
-    def test_list_recipients_privacy(self):
+    def test_list_recipients_privacy(self, sample_dir):
         """개인정보 보호 확인 - 이름 목록 미포함"""
-        result = list_recipients(TEST_DIR, "sample_income_summary.xlsx")
+        result = list_recipients(sample_dir, "sample_income_summary.xlsx")
 
         if result["status"] == "success":
             # names 키가 없어야 함 (개인정보 보호)
@@ -131,9 +147,9 @@ class TestListRecipients:
 class TestPreviewReceipt:
     """preview_receipt 함수 테스트"""
 
-    def test_preview_receipt_success(self):
+    def test_preview_receipt_success(self, sample_dir):
         """영수증 미리보기"""
-        result = preview_receipt(TEST_DIR, "홍길동", "sample_income_summary.xlsx")
+        result = preview_receipt(sample_dir, "홍길동", "sample_income_summary.xlsx")
 
         if result["status"] == "error" and "찾을 수 없습니다" in result["message"]:
             pytest.skip("테스트 이름이 샘플 데이터에 없습니다")
@@ -142,9 +158,9 @@ class TestPreviewReceipt:
         assert "preview" in result
         assert "receipt_no" in result
 
-    def test_preview_receipt_not_found(self):
+    def test_preview_receipt_not_found(self, sample_dir):
         """존재하지 않는 사람"""
-        result = preview_receipt(TEST_DIR, "존재하지않는이름", "sample_income_summary.xlsx")
+        result = preview_receipt(sample_dir, "존재하지않는이름", "sample_income_summary.xlsx")
         assert result["status"] == "error"
         assert "찾을 수 없습니다" in result["message"]
 
@@ -162,7 +178,8 @@ class TestGenerateReceipt:
         if os.path.exists(SAMPLE_TEMPLATE):
             shutil.copy(SAMPLE_TEMPLATE, os.path.join(temp_dir, "donation_receipt_template.docx"))
         yield temp_dir
-        # 정리
+        # 정리 (쓰기 풀에 미뤄 둔 발행대장 내보내기가 끝난 뒤)
+        write_executor.submit(lambda: None).result()
         shutil.rmtree(temp_dir, ignore_errors=True)
 
     def test_generate_receipt_no_template(self, temp_data_dir):
@@ -202,13 +219,94 @@ class TestGenerateReceipt:
             assert "file_path" in result
             assert os.path.exists(result["file_path"])
 
+    @pytest.mark.skipif(
+        not os.path.exists(SAMPLE_TEMPLATE) or not os.path.exists(SAMPLE_DATA),
+        reason="샘플 파일이 없습니다"
+    )
+    def test_single_issue_defers_ledger_export(self, temp_data_dir, monkeypatch):
+        """한 명 발행은 저널에만 기록하고, 엑셀 발행대장은 쓰기 풀에서 한 번만 내보냄"""
+        import threading
+        from receipt_core.ledger import Ledger, open_ledger
+
+        exports = []
+        export_xlsx = Ledger.export_xlsx
+
+        def counting_export(self, force=False):
+            exports.append(self.xlsx_path)
+            return export_xlsx(self, force)
+
+        monkeypatch.setattr(Ledger, "export_xlsx", counting_export)
+
+        # 앞선 쓰기 작업(전체 발행 등)이 진행 중인 상황
+        release = threading.Event()
+        write_executor.submit(release.wait)
+        try:
+            names = list(dict.fromkeys(load_data(SAMPLE_DATA)["이름"]))[:2]
+            results = [generate_receipt(temp_data_dir, name, "sample_income_summary.xlsx") for name in names]
+            ledger_path = results[0]["ledger_path"]
+
+            assert [r["status"] for r in results] == ["success", "success"]
+            assert exports == []
+            assert not os.path.exists(ledger_path)
+        finally:
+            release.set()
+        write_executor.submit(lambda: None).result()
+
+        assert exports == [ledger_path]
+        assert len(pd.read_excel(ledger_path)) == 2
+        with open_ledger(ledger_path) as ledger:
+            assert not ledger.is_export_stale()
+
+
+class TestGenerateReceipts:
+    """generate_receipts 함수 테스트 (여러 명 일괄 생성)"""
+
+    @pytest.fixture
+    def temp_data_dir(self):
+        """임시 데이터 디렉토리 생성"""
+        temp_dir = tempfile.mkdtemp()
+        if os.path.exists(SAMPLE_DATA):
+            shutil.copy(SAMPLE_DATA, os.path.join(temp_dir, "sample_income_summary.xlsx"))
+        if os.path.exists(SAMPLE_TEMPLATE):
+            shutil.copy(SAMPLE_TEMPLATE, os.path.join(temp_dir, "donation_receipt_template.docx"))
+        yield temp_dir
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    @pytest.mark.skipif(
+        not os.path.exists(SAMPLE_TEMPLATE) or not os.path.exists(SAMPLE_DATA),
+        reason="샘플 파일이 없습니다"
+    )
+    def test_per_name_status_and_single_ledger_write(self, temp_data_dir):
+        """이름별 결과와 발행대장 기록"""
+        from receipt_core.ledger import open_ledger
+
+        names = list(dict.fromkeys(load_data(SAMPLE_DATA)["이름"]))[:3]
+        result = generate_receipts(temp_data_dir, names + ["없는사람", names[0]],
+                                   "sample_income_summary.xlsx")
+
+        assert result["status"] == "warning"
+        assert result["generated"] == 3
+        assert [r["status"] for r in result["receipts"]] == ["success"] * 3 + ["not_found"]
+        assert all(os.path.exists(r["file_path"]) for r in result["receipts"][:3])
+
+        with open_ledger(result["ledger_path"]) as ledger:
+            assert ledger.count() == 3
+
+    def test_empty_names(self, sample_dir):
+        """이름 목록이 비었을 때"""
+        if not os.path.exists(SAMPLE_DATA) or not os.path.exists(SAMPLE_TEMPLATE):
+            pytest.skip("샘플 파일이 없습니다")
+
+        result = generate_receipts(sample_dir, [], "sample_income_summary.xlsx")
+        assert result["status"] == "error"
+
 
 class TestGenerateAllReceipts:
     """generate_all_receipts 함수 테스트"""
 
-    def test_preview_mode(self):
+    def test_preview_mode(self, sample_dir):
         """미리보기 모드 (confirm=False)"""
-        result = generate_all_receipts(TEST_DIR, "sample_income_summary.xlsx", confirm=False)
+        result = generate_all_receipts(sample_dir, "sample_income_summary.xlsx", confirm=False)
 
         if result["status"] == "error":
             pytest.skip("샘플 데이터 접근 오류")
@@ -242,13 +340,127 @@ class TestGenerateAllReceipts:
         assert "generated" in result
         assert result["generated"] > 0
 
+    @pytest.mark.skipif(
+        not os.path.exists(SAMPLE_TEMPLATE),
+        reason="템플릿 파일이 없습니다"
+    )
+    def test_incremental_skips_unchanged(self, temp_data_dir):
+        """증분 생성 시 바뀐 대상자만 다시 생성"""
+        data_path = os.path.join(temp_data_dir, "sample_income_summary.xlsx")
+        first = generate_all_receipts(temp_data_dir, "sample_income_summary.xlsx", confirm=True)
+        if first["status"] == "error":
+            pytest.skip(f"생성 오류: {first['message']}")
+
+        second = generate_all_receipts(temp_data_dir, "sample_income_summary.xlsx",
+                                       confirm=True, incremental=True)
+        assert second["generated"] == 0
+        assert second["skipped"] == first["generated"]
+
+        # 동명이인이 없는 한 사람의 금액만 수정
+        df = pd.read_excel(data_path)
+        names = load_data(data_path)["이름"]
+        unique_names = set(names[~names.duplicated(keep=False)])
+        row = df.index[df["이름"].isin(unique_names)][0]
+        df.loc[row, "1월"] = (df.loc[row, "1월"] if pd.notna(df.loc[row, "1월"]) else 0) + 1000
+        df.loc[row, "연간 총합"] = df.loc[row, "연간 총합"] + 1000
+        df.to_excel(data_path, index=False)
+
+        third = generate_all_receipts(temp_data_dir, "sample_income_summary.xlsx",
+                                      confirm=True, incremental=True)
+        assert third["generated"] == 1
+        assert third["skipped"] == first["generated"] - 1
+
+
+class TestReceiptJobs:
+    """백그라운드 전체 발행 작업 테스트"""
+
+    @pytest.fixture
+    def temp_data_dir(self):
+        """임시 데이터 디렉토리 생성"""
+        temp_dir = tempfile.mkdtemp()
+        if os.path.exists(SAMPLE_DATA):
+            shutil.copy(SAMPLE_DATA, os.path.join(temp_dir, "sample_income_summary.xlsx"))
+        if os.path.exists(SAMPLE_TEMPLATE):
+            shutil.copy(SAMPLE_TEMPLATE, os.path.join(temp_dir, "donation_receipt_template.docx"))
+        yield temp_dir
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def test_unknown_job(self):
+        """없는 작업 ID"""
+        assert get_job_status("없는작업")["status"] == "error"
+        assert cancel_job("없는작업")["status"] == "error"
+
+    @pytest.mark.skipif(
+        not os.path.exists(SAMPLE_TEMPLATE) or not os.path.exists(SAMPLE_DATA),
+        reason="샘플 파일이 없습니다"
+    )
+    def test_job_runs_in_background(self, temp_data_dir):
+        """작업 ID를 바로 반환하고 완료 후 결과 제공"""
+        started = start_generate_all_job(temp_data_dir, "sample_income_summary.xlsx")
+        assert started["status"] == "started"
+
+        status = asyncio.run(wait_for_job(started["job_id"], wait_seconds=30))
+        assert status["status"] == "success"
+        assert status["done"] == status["total"] == status["result"]["generated"]
+        assert status["receipts_per_second"] > 0
+
+    @pytest.mark.skipif(
+        not os.path.exists(SAMPLE_TEMPLATE) or not os.path.exists(SAMPLE_DATA),
+        reason="샘플 파일이 없습니다"
+    )
+    def test_cancel_records_finished_receipts(self, temp_data_dir):
+        """중단하면 이미 만든 영수증까지만 기록"""
+        import threading
+
+        cancel_event = threading.Event()
+        cancel_event.set()
+        progress = []
+        result = generate_all_receipts(temp_data_dir, "sample_income_summary.xlsx", confirm=True,
+                                       progress=lambda done, total: progress.append(done),
+                                       cancel_event=cancel_event)
+
+        assert result["status"] == "cancelled"
+        assert result["generated"] == 1
+        assert progress == [0, 1]
+
+
+class TestDiffData:
+    """diff_data 함수 테스트"""
+
+    def test_missing_file(self):
+        """존재하지 않는 파일"""
+        result = diff_data(TEST_DIR, "nonexistent.xlsx", "sample_income_summary.xlsx")
+        assert result["status"] == "error"
+
+    def test_changed_donor_without_amounts(self):
+        """변경된 대상자와 월만 반환 (금액 미포함)"""
+        if not os.path.exists(SAMPLE_DATA):
+            pytest.skip("샘플 데이터가 없습니다")
+
+        temp_dir = tempfile.mkdtemp()
+        try:
+            shutil.copy(SAMPLE_DATA, os.path.join(temp_dir, "2024_income_summary.xlsx"))
+            df = pd.read_excel(SAMPLE_DATA)
+            row = df.index[~df["이름"].astype(str).str.contains(",") & (df["이름"] != "합계")][0]
+            df.loc[row, "5월"] = (df.loc[row, "5월"] if pd.notna(df.loc[row, "5월"]) else 0) + 1000
+            df.to_excel(os.path.join(temp_dir, "2025_income_summary.xlsx"), index=False)
+
+            result = diff_data(temp_dir, "2024_income_summary.xlsx")
+
+            assert result["status"] == "success"
+            assert result["new_file"] == "2025_income_summary.xlsx"
+            assert any("5월" in d["months"] for d in result["changed"])
+            assert "total_before" not in str(result)
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
 
 class TestValidateData:
     """validate_data 함수 테스트"""
 
-    def test_validate_sample_data(self):
+    def test_validate_sample_data(self, sample_dir):
         """샘플 데이터 검증"""
-        result = validate_data(TEST_DIR, "sample_income_summary.xlsx")
+        result = validate_data(sample_dir, "sample_income_summary.xlsx")
 
         # 샘플 데이터는 유효해야 함
         assert result["status"] in ["success", "warning"]
@@ -294,7 +506,7 @@ class TestValidateTemplate:
         if not os.path.exists(SAMPLE_TEMPLATE):
             pytest.skip("템플릿 파일이 없습니다")
 
-        result = validate_template(TEST_DIR, "donation_receipt_template.docx")
+        result = validate_template(PROJECT_DIR, "donation_receipt_template.docx")
         assert result["status"] in ["success", "warning"]
 
     def test_validate_missing_template(self):
@@ -302,6 +514,28 @@ class TestValidateTemplate:
         result = validate_template(TEST_DIR, "nonexistent.docx")
         assert result["status"] == "error"
 
+    def test_validate_reports_missing_placeholder(self):
+        """누락된 placeholder를 정확히 보고"""
+        if not os.path.exists(SAMPLE_TEMPLATE):
+            pytest.skip("템플릿 파일이 없습니다")
+
+        temp_dir = tempfile.mkdtemp()
+        try:
+            template_path = os.path.join(temp_dir, "template.docx")
+            with zipfile.ZipFile(SAMPLE_TEMPLATE) as src, zipfile.ZipFile(template_path, "w") as dst:
+                for info in src.infolist():
+                    data = src.read(info.filename)
+                    if info.filename == "word/document.xml":
+                        data = data.replace(b"{{total}}", b"")
+                    dst.writestr(info, data)
+
+            result = validate_template(temp_dir, "template.docx")
+            assert result["status"] == "warning"
+            assert result["missing_placeholders"] == ["total"]
+            assert result["extra_placeholders"] == []
+        finally:
+            shutil.rmtree(temp_dir)
+
 
 class TestGetHistory:
     """get_history 함수 테스트"""
@@ -344,6 +578,37 @@ class TestGetHistory:
         assert result["unique_recipients"] == 2
         assert result["reissue_count"] == 1
 
+    def test_get_history_does_not_write(self, temp_dir_with_ledger):
+        """이력 조회는 저널/엑셀 발행대장을 쓰지 않음"""
+        from receipt_core.ledger import open_ledger, journal_path_for
+
+        ledger_path = os.path.join(temp_dir_with_ledger, "발행대장_2026.xlsx")
+        with open_ledger(ledger_path) as ledger:
+            ledger.append("26-003", "이영희", 300000, "receipts/이영희.docx")
+        before = {p: os.stat(p).st_mtime_ns for p in (ledger_path, journal_path_for(ledger_path))}
+
+        result = get_history(temp_dir_with_ledger)
+
+        assert result["total_records"] == 4
+        assert {p: os.stat(p).st_mtime_ns for p in before} == before
+        assert len(pd.read_excel(ledger_path)) == 3
+
+    def test_sync_does_not_wait_for_write_pool(self, temp_dir_with_ledger):
+        """저널을 만들어야 해도 진행 중인 쓰기 작업이 끝나기를 기다리지 않음"""
+        import threading
+        from concurrent.futures import ThreadPoolExecutor
+
+        release = threading.Event()
+        write_executor.submit(release.wait)
+        try:
+            with ThreadPoolExecutor(max_workers=1) as reader:
+                result = reader.submit(get_history, temp_dir_with_ledger).result(timeout=30)
+        finally:
+            release.set()
+
+        assert result["status"] == "success"
+        assert result["total_records"] == 3
+
 
 class TestGetPersonHistory:
     """get_person_history 함수 테스트"""
@@ -382,18 +647,18 @@ class TestGetPersonHistory:
 class TestPrivacyProtection:
     """개인정보 보호 테스트"""
 
-    def test_list_recipients_no_names(self):
+    def test_list_recipients_no_names(self, sample_dir):
         """대상자 목록에 이름 미포함"""
-        result = list_recipients(TEST_DIR, "sample_income_summary.xlsx")
+        result = list_recipients(sample_dir, "sample_income_summary.xlsx")
 
         if result["status"] == "success":
             # 이름 목록이 노출되면 안 됨
             assert "names" not in result
             assert "name_list" not in result
 
-    def test_validate_data_no_names_in_errors(self):
+    def test_validate_data_no_names_in_errors(self, sample_dir):
         """검증 오류에 이름 미포함"""
-        result = validate_data(TEST_DIR, "sample_income_summary.xlsx")
+        result = validate_data(sample_dir, "sample_income_summary.xlsx")
 
         # 경고나 오류가 있을 때 이름이 노출되면 안 됨
         if result.get("warnings"):
@@ -0,0 +1,1364 @@
+#!/usr/bin/env python3
+"""
+receipt_core 엔진 단위 테스트
+
+테스트 실행:
+    pytest test_receipt_core.py -v
+"""
+
+import os
+import re
+import sys
+import shutil
+import tempfile
+import zipfile
+import pytest
+
+from receipt_core.template import (
+    CompiledTemplate,
+    get_compiled_template,
+    clear_template_cache,
+)
+from receipt_core.batch import render_receipts, resolve_jobs
+from receipt_core import pdf as pdf_module
+
+
+# 테스트 데이터 경로 (tax_return/ 폴더의 샘플 파일 사용)
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_DIR = os.path.dirname(TEST_DIR)
+SAMPLE_DATA = os.path.join(PROJECT_DIR, "sample_income_summary.xlsx")
+SAMPLE_TEMPLATE = os.path.join(PROJECT_DIR, "donation_receipt_template.docx")
+
+
+def make_context(name="홍길동", receipt_no="26-001"):
+    """테스트용 렌더링 컨텍스트"""
+    context = {"receipt_no": receipt_no, "name": name, "total": "1,200,000"}
+    context.update({f"month_{i}": "100,000" for i in range(1, 13)})
+    return context
+
+
+def document_text(docx_path):
+    """DOCX 본문의 텍스트 런 목록"""
+    xml = zipfile.ZipFile(docx_path).read("word/document.xml").decode("utf-8")
+    return re.findall(r"<w:t(?: [^>]*)?>([^<]*)</w:t>", xml)
+
+
+# 1x1 PNG (그림 ID 테스트용)
+PIXEL_PNG = bytes.fromhex(
+    "89504e470d0a1a0a0000000d4948445200000001000000010806000000"
+    "1f15c4890000000d4944415478da63f8cfc0f01f0005000201a5f1d1e90000000049454e44ae426082"
+)
+
+
+def write_structured_template(target_path, with_blocks):
+    """머리글 변수, 표, 그림이 있는 템플릿 (with_blocks면 {%tc %}/{%p %} 반복 포함)"""
+    import io
+    import docx
+
+    document = docx.Document()
+    document.sections[0].header.paragraphs[0].text = "{{ name }}"
+    document.add_paragraph("{{ receipt_no }}")
+    table = document.add_table(rows=1, cols=3 if with_blocks else 2)
+    if with_blocks:
+        cells = ["{%tc for m in months %}", "{{ m }}", "{%tc endfor %}"]
+    else:
+        cells = ["{{ month_1 }}", "{{ total }}"]
+    for cell, text in zip(table.rows[0].cells, cells):
+        cell.text = text
+    if with_blocks:
+        document.add_paragraph("{%p for picture in pictures %}")
+    document.add_picture(io.BytesIO(PIXEL_PNG))
+    document.add_picture(io.BytesIO(PIXEL_PNG))
+    if with_blocks:
+        document.add_paragraph("{%p endfor %}")
+    document.save(target_path)
+
+
+def write_wrong_dimension(target_path):
+    """샘플 데이터의 시트 범위(<dimension>)를 실제보다 작게 적은 사본 (앞의 2행만 있다고 표시)"""
+    with zipfile.ZipFile(SAMPLE_DATA) as src, zipfile.ZipFile(target_path, "w") as dst:
+        for info in src.infolist():
+            data = src.read(info.filename)
+            if info.filename == "xl/worksheets/sheet1.xml":
+                data = re.sub(rb'<dimension ref="[^"]*"/>', b'<dimension ref="A1:N3"/>', data)
+            dst.writestr(info, data)
+
+
+@pytest.fixture
+def work_dir():
+    """임시 작업 디렉토리"""
+    temp_dir = tempfile.mkdtemp(prefix="receipt_core_test_")
+    yield temp_dir
+    shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+@pytest.mark.skipif(not os.path.exists(SAMPLE_TEMPLATE), reason="템플릿 파일이 없습니다")
+class TestCompiledTemplate:
+    """컴파일된 템플릿 테스트"""
+
+    def test_same_output_as_docxtpl(self, work_dir):
+        """docxtpl 렌더링과 동일한 본문"""
+        from docxtpl import DocxTemplate
+
+        expected_path = os.path.join(work_dir, "expected.docx")
+        template = DocxTemplate(SAMPLE_TEMPLATE)
+        template.render(make_context())
+        template.save(expected_path)
+
+        actual_path = os.path.join(work_dir, "actual.docx")
+        get_compiled_template(SAMPLE_TEMPLATE).save(make_context(), actual_path)
+
+        assert document_text(actual_path) == document_text(expected_path)
+        assert "홍길동" in document_text(actual_path)
+
+    @pytest.mark.parametrize("with_blocks", [False, True])
+    def test_structure_same_as_docxtpl(self, work_dir, with_blocks):
+        """머리글, {%tc %} 반복으로 늘어난 표 열, 반복된 그림 ID까지 docxtpl과 같음"""
+        import docx
+        from docxtpl import DocxTemplate
+
+        template_path = os.path.join(work_dir, "template.docx")
+        write_structured_template(template_path, with_blocks)
+        context = dict(make_context(), months=["1월", "2월", "3월", "4월"], pictures=[1, 2])
+
+        expected_path = os.path.join(work_dir, "expected.docx")
+        template = DocxTemplate(template_path)
+        template.render(context)
+        template.save(expected_path)
+
+        actual_path = os.path.join(work_dir, "actual.docx")
+        CompiledTemplate(template_path).save(context, actual_path)
+
+        def structure(path):
+            document = docx.Document(path)
+            xml = zipfile.ZipFile(path).read("word/document.xml").decode("utf-8")
+            return {
+                "header": [p.text for p in document.sections[0].header.paragraphs],
+                "body": document_text(path),
+                "grid": re.findall(r'<w:gridCol w:w="(\d+)"', xml),
+                "cells": [len(row.cells) for table in document.tables for row in table.rows],
+                "docpr_ids": re.findall(r'<wp:docPr id="(\d+)"', xml),
+            }
+
+        expected = structure(expected_path)
+        assert structure(actual_path) == expected
+        assert expected["header"] == ["홍길동"]
+        assert len(expected["grid"]) == max(expected["cells"])
+        assert len(set(expected["docpr_ids"])) == len(expected["docpr_ids"]) > 0
+
+    def test_cached_by_path(self):
+        """같은 템플릿은 한 번만 컴파일"""
+        clear_template_cache()
+        first = get_compiled_template(SAMPLE_TEMPLATE)
+        second = get_compiled_template(os.path.relpath(SAMPLE_TEMPLATE))
+        assert first is second
+
+    def test_recompiled_when_modified(self, work_dir):
+        """템플릿 수정 시 다시 컴파일"""
+        template_path = os.path.join(work_dir, "template.docx")
+        shutil.copy(SAMPLE_TEMPLATE, template_path)
+
+        first = get_compiled_template(template_path)
+        stat = os.stat(template_path)
+        os.utime(template_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        second = get_compiled_template(template_path)
+
+        assert first is not second
+
+
+@pytest.mark.skipif(not os.path.exists(SAMPLE_TEMPLATE), reason="템플릿 파일이 없습니다")
+class TestRenderReceipts:
+    """일괄 렌더링 테스트"""
+
+    def test_resolve_jobs(self):
+        """작업자 수 결정"""
+        assert resolve_jobs(None) == 1
+        assert resolve_jobs(3) == 3
+        assert resolve_jobs(0) >= 1
+
+    @pytest.mark.parametrize("jobs", [1, 2])
+    @pytest.mark.parametrize("lazy", [False, True])
+    def test_results_in_input_order(self, work_dir, jobs, lazy):
+        """결과가 입력 순서대로 반환 (제너레이터 입력 포함)"""
+        names = ["홍길동", "김영희", "이철수"]
+        items = [
+            (make_context(name, f"26-{i + 1:03d}"), os.path.join(work_dir, f"{name}.docx"))
+            for i, name in enumerate(names)
+        ]
+        if lazy:
+            results = list(render_receipts(SAMPLE_TEMPLATE, iter(items), jobs=jobs))
+        else:
+            results = list(render_receipts(SAMPLE_TEMPLATE, items, jobs=jobs))
+
+        assert [r["output_path"] for r in results] == [path for _, path in items]
+        for name, result in zip(names, results):
+            assert result["error"] is None
+            assert name in document_text(result["output_path"])
+
+    def test_workers_are_spawned(self, work_dir, monkeypatch):
+        """작업자 프로세스는 fork가 아니라 spawn으로 시작 (서버 스레드의 잠금을 물려받지 않음)"""
+        from receipt_core import batch
+
+        start_methods = []
+        process_pool = batch.ProcessPoolExecutor
+
+        def recording_pool(*args, mp_context=None, **kwargs):
+            start_methods.append(mp_context.get_start_method() if mp_context else None)
+            return process_pool(*args, mp_context=mp_context, **kwargs)
+
+        monkeypatch.setattr(batch, "ProcessPoolExecutor", recording_pool)
+        items = [(make_context(name), os.path.join(work_dir, f"{name}.docx")) for name in ("가", "나")]
+
+        results = list(render_receipts(SAMPLE_TEMPLATE, items, jobs=2))
+
+        assert start_methods == ["spawn"]
+        assert all(result["error"] is None for result in results)
+
+    def test_failure_reported_per_item(self, work_dir):
+        """실패한 항목만 오류로 보고"""
+        items = [
+            (make_context(), os.path.join(work_dir, "ok.docx")),
+            (make_context(), os.path.join(work_dir, "missing_dir", "fail.docx")),
+        ]
+
+        results = list(render_receipts(SAMPLE_TEMPLATE, items))
+
+        assert results[0]["error"] is None
+        assert results[1]["error"]
+
+
+# soffice 흉내: --outdir에 PDF를 만들되 이름에 "broken"이 있으면 건너뜀
+FAKE_SOFFICE = """#!{python}
+import os, sys
+args = sys.argv[1:]
+outdir = args[args.index("--outdir") + 1]
+with open(os.path.join(outdir, "calls.log"), "a") as f:
+    f.write("call\\n")
+for arg in args:
+    if arg.endswith(".docx") and "broken" not in arg:
+        name = os.path.splitext(os.path.basename(arg))[0] + ".pdf"
+        open(os.path.join(outdir, name), "w").close()
+"""
+
+
+class TestPdfConverter:
+    """PDF 일괄 변환 테스트"""
+
+    @pytest.fixture
+    def fake_soffice(self, work_dir, monkeypatch):
+        """가짜 soffice 실행 파일"""
+        script = os.path.join(work_dir, "soffice")
+        with open(script, "w") as f:
+            f.write(FAKE_SOFFICE.format(python=sys.executable))
+        os.chmod(script, 0o755)
+        monkeypatch.setattr(pdf_module, "find_soffice", lambda: script)
+        return script
+
+    def make_docx_files(self, work_dir, names):
+        paths = []
+        for name in names:
+            path = os.path.join(work_dir, f"{name}.docx")
+            open(path, "w").close()
+            paths.append(path)
+        return paths
+
+    def test_converts_in_batches(self, work_dir, fake_soffice):
+        """여러 파일을 배치 단위로 변환"""
+        paths = self.make_docx_files(work_dir, [f"r{i}" for i in range(5)])
+
+        results = pdf_module.convert_many(paths, batch_size=2)
+
+        assert all(results[p] == pdf_module.pdf_path_for(p) for p in paths)
+        with open(os.path.join(work_dir, "calls.log")) as f:
+            assert len(f.readlines()) == 3
+
+    def test_reports_per_file_failure(self, work_dir, fake_soffice):
+        """실패한 파일만 None, 나머지는 변환"""
+        paths = self.make_docx_files(work_dir, ["a", "broken", "b"])
+
+        results = pdf_module.convert_many(paths, workers=2)
+
+        assert results[paths[0]] and results[paths[2]]
+        assert results[paths[1]] is None
+
+    def test_no_converter(self, work_dir, monkeypatch):
+        """변환 도구가 없으면 모두 None"""
+        monkeypatch.setattr(pdf_module, "find_soffice", lambda: None)
+        monkeypatch.setattr(pdf_module, "has_docx2pdf", lambda: False)
+        paths = self.make_docx_files(work_dir, ["a"])
+
+        assert pdf_module.convert_many(paths) == {paths[0]: None}
+
+
+class TestNativePdf:
+    """네이티브 PDF 렌더러 테스트"""
+
+    SAMPLE_LAYOUT = os.path.join(PROJECT_DIR, "receipt_layout.sample.yaml")
+
+    def test_default_layout_is_sample_file(self):
+        """기본 레이아웃은 샘플 레이아웃 파일에서 읽음"""
+        yaml = pytest.importorskip("yaml")
+        from receipt_core.pdf_native import load_layout, check_layout
+
+        with open(self.SAMPLE_LAYOUT, encoding="utf-8") as f:
+            assert load_layout() == yaml.safe_load(f)
+        check_layout(load_layout())
+
+    @pytest.mark.skipif(not os.path.exists(SAMPLE_TEMPLATE), reason="템플릿 파일이 없습니다")
+    def test_renderer_reloaded_when_template_changes(self, work_dir):
+        """템플릿을 고치면 새 렌더러 (내장 글꼴이 바뀔 수 있음)"""
+        pytest.importorskip("reportlab")
+        from receipt_core.pdf_native import get_pdf_renderer
+
+        template_path = os.path.join(work_dir, "template.docx")
+        shutil.copy(SAMPLE_TEMPLATE, template_path)
+        first = get_pdf_renderer(template_path=template_path)
+        assert get_pdf_renderer(template_path=template_path) is first
+
+        stat = os.stat(template_path)
+        os.utime(template_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        assert get_pdf_renderer(template_path=template_path) is not first
+
+    def test_layout_must_cover_receipt_fields(self):
+        """필수 항목이 빠진 레이아웃은 거부"""
+        from receipt_core.pdf_native import check_layout, load_layout
+
+        layout = load_layout()
+        layout["elements"] = [e for e in layout["elements"] if e.get("type") != "table"]
+
+        with pytest.raises(ValueError, match="month_1"):
+            check_layout(layout)
+
+    @pytest.mark.skipif(not os.path.exists(SAMPLE_TEMPLATE), reason="템플릿 파일이 없습니다")
+    def test_render_with_embedded_font(self, work_dir):
+        """템플릿 내장 글꼴로 PDF 생성"""
+        pytest.importorskip("reportlab")
+        from receipt_core.pdf_native import render_pdf
+
+        output_path = os.path.join(work_dir, "receipt.pdf")
+        render_pdf(make_context(), output_path, template_path=SAMPLE_TEMPLATE)
+
+        with open(output_path, "rb") as f:
+            assert f.read(5) == b"%PDF-"
+
+    @pytest.mark.skipif(not os.path.exists(SAMPLE_TEMPLATE), reason="템플릿 파일이 없습니다")
+    def test_render_receipts_native_pdf(self, work_dir):
+        """일괄 렌더링에서 DOCX와 PDF를 함께 생성"""
+        pytest.importorskip("reportlab")
+
+        items = [(make_context(), os.path.join(work_dir, "홍길동.docx"))]
+        result = list(render_receipts(SAMPLE_TEMPLATE, items, native_pdf=True))[0]
+
+        assert result["error"] is None
+        assert os.path.exists(result["pdf_path"])
+
+
+class TestLedger:
+    """발행대장 저널 테스트"""
+
+    def test_append_marks_reissue(self, work_dir):
+        """같은 발급번호는 재발행으로 기록"""
+        from receipt_core.ledger import open_ledger
+
+        with open_ledger(os.path.join(work_dir, "발행대장_2026.xlsx")) as ledger:
+            notes = ledger.append_many([
+                ("26-001", "홍길동", 1200000, "a.docx"),
+                ("26-002", "김영희", 600000, "b.docx"),
+            ])
+            assert notes == ["", ""]
+            assert ledger.append("26-001", "홍길동", 1200000, "a.docx") == "재발행"
+            assert ledger.count() == 3
+
+    def test_export_only_when_stale(self, work_dir):
+        """엑셀 내보내기는 저널이 바뀌었을 때만"""
+        import pandas as pd
+        from receipt_core.ledger import open_ledger, LEDGER_COLUMNS
+
+        xlsx_path = os.path.join(work_dir, "발행대장_2026.xlsx")
+        with open_ledger(xlsx_path) as ledger:
+            ledger.append("26-001", "홍길동", 1200000, "a.docx")
+            assert ledger.is_export_stale()
+            ledger.export_xlsx()
+            assert not ledger.is_export_stale()
+
+        df = pd.read_excel(xlsx_path)
+        assert list(df.columns) == LEDGER_COLUMNS
+        assert df.iloc[0]["발급번호"] == "26-001"
+        assert df.iloc[0]["연간총합"] == 1200000
+
+    def test_imports_existing_xlsx(self, work_dir):
+        """저널이 없으면 기존 엑셀 발행대장을 가져옴"""
+        import pandas as pd
+        from receipt_core.ledger import open_ledger
+
+        xlsx_path = os.path.join(work_dir, "발행대장_2026.xlsx")
+        pd.DataFrame([
+            {"발급번호": "26-001", "이름": "홍길동", "연간총합": 1200000,
+             "발행일시": "2026-01-20 10:00:00", "파일경로": "a.docx", "비고": ""},
+        ]).to_excel(xlsx_path, index=False)
+
+        with open_ledger(xlsx_path) as ledger:
+            assert ledger.count() == 1
+            assert ledger.append("26-001", "홍길동", 1200000, "a.docx") == "재발행"
+
+    def test_touched_xlsx_keeps_unexported_entries(self, work_dir):
+        """내보낸 뒤 추가한 기록은 엑셀이 바뀌어도 사라지지 않음"""
+        from receipt_core.ledger import open_ledger
+
+        xlsx_path = os.path.join(work_dir, "발행대장_2026.xlsx")
+        with open_ledger(xlsx_path) as ledger:
+            ledger.append("26-001", "홍길동", 1200000, "a.docx")
+            ledger.export_xlsx()
+            ledger.append("26-002", "김영희", 600000, "b.docx")
+
+        # Excel에서 열었다 저장하거나 동기화 프로그램이 건드린 경우
+        stat = os.stat(xlsx_path)
+        os.utime(xlsx_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        with open_ledger(xlsx_path) as ledger:
+            assert ledger.count() == 2
+            assert ledger.person("김영희")["issue_count"] == 1
+            assert ledger.is_export_stale()
+
+    def test_import_merges_edits_and_skips_bad_rows(self, work_dir):
+        """엑셀에서 고친 값은 반영하고, 잘못된 행은 건너뛰고 알림"""
+        import pandas as pd
+        from receipt_core.ledger import open_ledger
+
+        xlsx_path = os.path.join(work_dir, "발행대장_2026.xlsx")
+        with open_ledger(xlsx_path) as ledger:
+            ledger.append("26-001", "홍길동", 1200000, "a.docx")
+            ledger.export_xlsx()
+
+        df = pd.read_excel(xlsx_path)
+        df.loc[0, "연간총합"] = 1300000
+        df = pd.concat([df, pd.DataFrame([
+            {"발급번호": "26-002", "이름": "김영희", "연간총합": "1,000원", "발행일시": "2026-01-21 10:00:00"},
+            {"발급번호": None, "이름": "이철수", "연간총합": 1000, "발행일시": "2026-01-21 10:00:00"},
+            {"발급번호": "26-003", "이름": "박민수", "연간총합": None, "발행일시": "2026-01-21 10:00:00"},
+        ])], ignore_index=True)
+        df.to_excel(xlsx_path, index=False)
+
+        with open_ledger(xlsx_path) as ledger:
+            assert [row[:3] for row in ledger.rows()] == [
+                ("26-001", "홍길동", 1300000),
+                ("26-003", "박민수", 0),
+            ]
+            assert ledger.import_warnings() == [
+                "3행: 연간총합이 숫자가 아니어서 가져오지 않았습니다",
+                "4행: 발급번호/이름/발행일시가 비어 있어 가져오지 않았습니다",
+            ]
+
+    def test_import_is_one_transaction(self, work_dir, monkeypatch):
+        """가져오기 중간에 실패하면 기록/통계/메타데이터가 모두 이전 상태로 돌아감"""
+        import sqlite3
+        import pandas as pd
+        from receipt_core.ledger import open_ledger, Ledger, journal_path_for
+
+        xlsx_path = os.path.join(work_dir, "발행대장_2026.xlsx")
+        with open_ledger(xlsx_path) as ledger:
+            ledger.append("26-001", "홍길동", 1200000, "a.docx")
+            ledger.export_xlsx()
+
+        df = pd.read_excel(xlsx_path)
+        pd.concat([df, pd.DataFrame([
+            {"발급번호": "26-002", "이름": "김영희", "연간총합": 600000, "발행일시": "2026-01-21 10:00:00"},
+        ])], ignore_index=True).to_excel(xlsx_path, index=False)
+
+        def fail(self, key, value):
+            raise RuntimeError("중단")
+
+        monkeypatch.setattr(Ledger, "_set_meta", fail)
+        with pytest.raises(RuntimeError):
+            open_ledger(xlsx_path)
+
+        conn = sqlite3.connect(journal_path_for(xlsx_path))
+        assert conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0] == 1
+        assert conn.execute("SELECT total_records FROM stats").fetchone()[0] == 1
+        conn.close()
+
+        monkeypatch.undo()
+        with open_ledger(xlsx_path) as ledger:
+            assert ledger.summary()["total_records"] == 2
+
+    def test_maintained_aggregates(self, work_dir):
+        """전체/사람별 통계가 기록과 함께 갱신"""
+        from receipt_core.ledger import open_ledger
+
+        with open_ledger(os.path.join(work_dir, "발행대장_2026.xlsx")) as ledger:
+            ledger.append_many([
+                ("26-001", "홍길동", 1200000, "a.docx"),
+                ("26-002", "김영희", 600000, "b.docx"),
+                ("26-001", "홍길동", 1200000, "a.docx"),
+            ])
+
+            stats = ledger.summary()
+            assert stats["total_records"] == 3
+            assert stats["unique_recipients"] == 2
+            assert stats["reissue_count"] == 1
+            assert stats["total_amount"] == 3000000
+
+            person = ledger.person("홍길동")
+            assert person["issue_count"] == 2
+            assert person["reissue_count"] == 1
+            assert person["latest_receipt_no"] == "26-001"
+            assert ledger.person("없는사람") is None
+
+    def test_aggregates_rebuilt_for_old_journal(self, work_dir):
+        """집계 테이블이 없는 이전 저널은 열 때 재계산"""
+        from receipt_core.ledger import open_ledger
+
+        xlsx_path = os.path.join(work_dir, "발행대장_2026.xlsx")
+        with open_ledger(xlsx_path) as ledger:
+            ledger.append("26-001", "홍길동", 1200000, "a.docx")
+            ledger.conn.executescript("DROP TABLE people; DROP TABLE stats; PRAGMA user_version = 1;")
+
+        with open_ledger(xlsx_path) as ledger:
+            assert ledger.summary()["total_records"] == 1
+            assert ledger.person("홍길동")["issue_count"] == 1
+
+
+class TestLoadData:
+    """열 단위 데이터 로더 테스트"""
+
+    def make_raw(self):
+        import pandas as pd
+
+        rows = [
+            {"이름": "홍길동", "1월": 10000, "연간 총합": 10000},
+            {"이름": "김영희, 이철수", "1월": None, "연간 총합": 20000},
+            {"이름": "홍길동", "1월": 30000, "연간 총합": 30000},
+            {"이름": "합계", "1월": 40000, "연간 총합": 60000},
+        ]
+        df = pd.DataFrame(rows)
+        for month in range(2, 13):
+            df.insert(month, f"{month}월", 0)
+        return df
+
+    def test_splits_couples_and_drops_summary(self):
+        """부부 분리, 합계 행 제외, 빈 값 0"""
+        from receipt_core.dataset import normalize_donors
+
+        df = normalize_donors(self.make_raw())
+
+        assert df["이름"].tolist() == ["김영희", "이철수", "홍길동", "홍길동"]
+        assert df["1월"].tolist() == [0, 0, 10000, 30000]
+        assert df["연간 총합"].tolist() == [20000, 20000, 10000, 30000]
+
+    def test_stable_sort_keeps_original_order(self):
+        """동명이인은 원본 순서 유지"""
+        from receipt_core.dataset import normalize_donors
+
+        df = normalize_donors(self.make_raw())
+        same_name = df[df["이름"] == "홍길동"]
+
+        assert same_name["연간 총합"].tolist() == [10000, 30000]
+
+
+@pytest.mark.skipif(not os.path.exists(SAMPLE_DATA), reason="샘플 데이터가 없습니다")
+class TestDatasetCache:
+    """헌금 데이터 캐시 테스트"""
+
+    @pytest.fixture
+    def data_file(self, work_dir):
+        path = os.path.join(work_dir, "2025_income_summary.xlsx")
+        shutil.copy(SAMPLE_DATA, path)
+        return path
+
+    def test_reuses_parsed_data(self, data_file):
+        """같은 파일은 한 번만 파싱"""
+        from receipt_core.dataset import get_dataset, clear_dataset_cache
+
+        clear_dataset_cache()
+        first = get_dataset(data_file)
+        assert get_dataset(data_file) is first
+
+    def test_reloads_when_file_changes(self, data_file):
+        """파일이 바뀌면 다시 파싱"""
+        from receipt_core.dataset import get_dataset
+
+        first = get_dataset(data_file)
+        stat = os.stat(data_file)
+        os.utime(data_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        assert get_dataset(data_file) is not first
+
+    def test_lru_eviction(self, work_dir, data_file, monkeypatch):
+        """최근 사용 순으로 오래된 항목 제거"""
+        from receipt_core import dataset as dataset_module
+
+        monkeypatch.setattr(dataset_module, "DATASET_CACHE_SIZE", 1)
+        other = os.path.join(work_dir, "2024_income_summary.xlsx")
+        shutil.copy(SAMPLE_DATA, other)
+
+        first = dataset_module.get_dataset(data_file)
+        dataset_module.get_dataset(other)
+
+        assert dataset_module.get_dataset(data_file) is not first
+
+    def test_receipt_no_map(self, data_file):
+        """발급번호는 이름순 전체 목록 기준"""
+        from receipt_core.dataset import get_dataset
+
+        dataset = get_dataset(data_file)
+        numbers = dataset.receipt_no_map(26, "A")
+        first_name = dataset.df.iloc[0]["이름"]
+
+        assert numbers[first_name] == "A26-001"
+        assert len(set(numbers.values())) == dataset.df["이름"].nunique()
+
+
+@pytest.mark.skipif(not os.path.exists(SAMPLE_DATA), reason="샘플 데이터가 없습니다")
+class TestReceiptIndex:
+    """발급번호 색인 테스트"""
+
+    @pytest.fixture
+    def data_file(self, work_dir):
+        path = os.path.join(work_dir, "2025_income_summary.xlsx")
+        shutil.copy(SAMPLE_DATA, path)
+        return path
+
+    def test_persisted_in_cache_dir(self, data_file):
+        """색인 파일은 숨김 캐시 폴더에 저장되고, 생성 후에는 데이터를 다시 읽지 않음"""
+        from receipt_core.dataset import load_data
+        from receipt_core.receipt_index import load_receipt_index, index_path_for, CACHE_DIR_NAME
+
+        df = load_data(data_file)
+        index = load_receipt_index(data_file, lambda: df)
+        assert os.path.exists(index_path_for(data_file))
+        assert os.path.dirname(index_path_for(data_file)) == os.path.join(os.path.dirname(data_file), CACHE_DIR_NAME)
+        assert sorted(os.listdir(os.path.dirname(data_file))) == [CACHE_DIR_NAME, "2025_income_summary.xlsx"]
+
+        def fail():
+            raise AssertionError("색인을 다시 만들면 안 됩니다")
+
+        reloaded = load_receipt_index(data_file, fail)
+        assert reloaded.sequence == index.sequence
+
+        numbers = reloaded.numbers(26, "A")
+        assert numbers[df.iloc[0]["이름"]] == "A26-001"
+        assert numbers.get("없는사람", "A26-000") == "A26-000"
+        assert len(numbers) == df["이름"].nunique()
+
+    def test_touch_without_change_keeps_index(self, data_file):
+        """내용이 같으면 수정 시각이 바뀌어도 재사용"""
+        from receipt_core.dataset import load_data
+        from receipt_core.receipt_index import load_receipt_index
+
+        df = load_data(data_file)
+        load_receipt_index(data_file, lambda: df)
+        stat = os.stat(data_file)
+        os.utime(data_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        load_receipt_index(data_file, lambda: pytest.fail("색인을 다시 만들면 안 됩니다"))
+
+    def test_rebuild_when_content_changes(self, data_file):
+        """데이터가 바뀌면 다시 생성"""
+        from receipt_core.dataset import load_data
+        from receipt_core.receipt_index import load_receipt_index, build_sequence
+
+        df = load_data(data_file)
+        before = load_receipt_index(data_file, lambda: df)
+
+        changed = df[df["이름"] != df.iloc[0]["이름"]].reset_index(drop=True)
+        changed.to_excel(data_file, index=False)
+
+        index = load_receipt_index(data_file, lambda: changed)
+        assert index.sequence == build_sequence(changed)
+        assert index.sha256 != before.sha256
+
+
+class TestRenderManifest:
+    """증분 발행 매니페스트 테스트"""
+
+    def test_unchanged_outputs(self, work_dir):
+        """입력이 같고 파일이 남아 있으면 건너뜀"""
+        from receipt_core.manifest import RenderManifest, context_hash
+
+        output_path = os.path.join(work_dir, "기부금영수증_홍길동.docx")
+        with open(output_path, "wb") as f:
+            f.write(b"docx")
+        row_hash = context_hash(make_context())
+
+        manifest = RenderManifest(work_dir)
+        manifest.record(output_path, row_hash, "tpl", "26-001")
+        manifest.save()
+
+        reloaded = RenderManifest(work_dir)
+        candidates = [(output_path, row_hash, "26-001")]
+        assert reloaded.unchanged_outputs(candidates, "tpl") == {output_path}
+        assert reloaded.unchanged_outputs(candidates, "other-tpl") == set()
+        assert reloaded.unchanged_outputs([(output_path, row_hash, "26-002")], "tpl") == set()
+        # PDF가 필요한데 없으면 다시 생성
+        assert reloaded.unchanged_outputs(candidates, "tpl", need_pdf=True) == set()
+
+        os.remove(output_path)
+        assert reloaded.unchanged_outputs(candidates, "tpl") == set()
+
+    def test_last_row_decides_shared_file(self, work_dir):
+        """동명이인은 마지막 행 기준으로 판단"""
+        from receipt_core.manifest import RenderManifest
+
+        output_path = os.path.join(work_dir, "기부금영수증_홍길동.docx")
+        with open(output_path, "wb") as f:
+            f.write(b"docx")
+
+        manifest = RenderManifest(work_dir)
+        manifest.record(output_path, "second", "tpl", "26-002")
+        candidates = [(output_path, "first", "26-001"), (output_path, "second", "26-002")]
+        assert manifest.unchanged_outputs(candidates, "tpl") == {output_path}
+
+
+class TestDiffDonors:
+    """데이터 버전 비교 테스트"""
+
+    @staticmethod
+    def make_df(rows):
+        import pandas as pd
+        from receipt_core.dataset import normalize_donors, MONTH_COLUMNS
+
+        records = []
+        for name, months in rows:
+            record = {"이름": name}
+            record.update({col: months.get(col, 0) for col in MONTH_COLUMNS})
+            record["연간 총합"] = sum(months.values())
+            records.append(record)
+        return normalize_donors(pd.DataFrame(records))
+
+    def test_added_removed_changed(self):
+        """추가/삭제/변경 및 바뀐 월"""
+        from receipt_core.diff import diff_donors, reissue_names
+
+        old = self.make_df([("가", {"1월": 100}), ("나", {"1월": 200}), ("다", {"2월": 300})])
+        new = self.make_df([("나", {"1월": 200}), ("다", {"2월": 300, "3월": 50}), ("라", {"1월": 10})])
+
+        diff = diff_donors(old, new)
+
+        assert diff["added"] == [{"name": "라", "total": 10}]
+        assert diff["removed"] == [{"name": "가", "total": 100}]
+        assert diff["changed"] == [{
+            "name": "다", "total_before": 300, "total_after": 350,
+            "months": [{"month": "3월", "before": 0, "after": 50}],
+        }]
+        assert diff["renumbered"] == ["나"]
+        assert diff["unchanged"] == 1
+        assert reissue_names(diff) == ["라", "다"]
+
+    def test_duplicate_names_match_in_order(self):
+        """동명이인은 순서대로 짝지음"""
+        from receipt_core.diff import diff_donors
+
+        old = self.make_df([("가, 나", {"1월": 100}), ("가", {"1월": 50})])
+        new = self.make_df([("가, 나", {"1월": 100}), ("가", {"1월": 70})])
+
+        diff = diff_donors(old, new)
+
+        assert [d["name"] for d in diff["changed"]] == ["가"]
+        assert diff["changed"][0]["total_after"] == 70
+        assert diff["unchanged"] == 2
+
+
+class TestPollingWatcher:
+    """파일 변경 감시 테스트"""
+
+    def test_reports_after_debounce(self, work_dir):
+        """변경이 멈춘 뒤 한 번에 알림"""
+        import threading
+        from receipt_core.watch import PollingWatcher
+
+        data_path = os.path.join(work_dir, "2025_income_summary.xlsx")
+        with open(data_path, "wb") as f:
+            f.write(b"v1")
+        watcher = PollingWatcher([os.path.join(work_dir, "*_income_summary.xlsx")],
+                                 interval=0.05, debounce=0.2)
+
+        def save_twice():
+            with open(data_path, "wb") as f:
+                f.write(b"v2-longer")
+            # Excel 잠금 파일은 무시
+            with open(os.path.join(work_dir, "~$2025_income_summary.xlsx"), "wb") as f:
+                f.write(b"lock")
+
+        threading.Timer(0.1, save_twice).start()
+        assert watcher.wait() == {data_path}
+
+    def test_stop_event(self, work_dir):
+        """중지되면 None 반환"""
+        import threading
+        from receipt_core.watch import PollingWatcher
+
+        stop_event = threading.Event()
+        stop_event.set()
+        watcher = PollingWatcher([os.path.join(work_dir, "*.xlsx")], interval=0.01)
+        assert watcher.wait(stop_event) is None
+
+
+@pytest.mark.skipif(not os.path.exists(SAMPLE_DATA), reason="샘플 데이터가 없습니다")
+class TestStreamReceipts:
+    """스트리밍 발행 테스트"""
+
+    def test_iter_donors_matches_load_data(self):
+        """스트리밍 리더와 DataFrame 로더의 대상자가 같음"""
+        from receipt_core.dataset import load_data
+        from receipt_core.stream import iter_donors
+
+        df = load_data(SAMPLE_DATA)
+        streamed = sorted((name, total) for name, _, total in iter_donors(SAMPLE_DATA))
+
+        assert streamed == sorted(zip(df["이름"], df["연간 총합"]))
+
+    @pytest.mark.skipif(not os.path.exists(SAMPLE_TEMPLATE), reason="템플릿 파일이 없습니다")
+    def test_stream_receipts(self, work_dir):
+        """발급번호는 일반 발행과 같고, 발행대장에 모두 기록"""
+        from receipt_core.dataset import DonorDataset
+        from receipt_core.ledger import open_ledger
+        from receipt_core.stream import stream_receipts
+
+        data_path = os.path.join(work_dir, "2025_income_summary.xlsx")
+        shutil.copy(SAMPLE_DATA, data_path)
+        ledger_path = os.path.join(work_dir, "발행대장_2026.xlsx")
+        numbers = DonorDataset.load(data_path).receipt_no_map(26)
+
+        events = list(stream_receipts(data_path, SAMPLE_TEMPLATE, os.path.join(work_dir, "receipts"),
+                                      ledger_path, 26, batch_size=4))
+
+        assert all(event["error"] is None for event in events)
+        assert all(event["receipt_no"] == numbers[event["name"]] for event in events)
+        assert all(os.path.exists(event["output_path"]) for event in events)
+        with open_ledger(ledger_path) as ledger:
+            assert ledger.count() == len(events)
+        assert os.path.exists(ledger_path)
+
+    def test_iter_donors_ignores_wrong_dimension(self, work_dir):
+        """시트 범위가 실제보다 작게 적혀 있어도 모든 대상자를 읽음"""
+        from receipt_core.dataset import load_data
+        from receipt_core.stream import iter_donors
+
+        path = os.path.join(work_dir, "data.xlsx")
+        write_wrong_dimension(path)
+
+        assert sorted(name for name, _, _ in iter_donors(path)) == sorted(load_data(SAMPLE_DATA)["이름"])
+
+    @pytest.mark.skipif(not os.path.exists(SAMPLE_TEMPLATE), reason="템플릿 파일이 없습니다")
+    def test_bad_amount_row_reported_and_stream_continues(self, work_dir):
+        """금액이 숫자가 아닌 행은 실패로 보고하고 나머지는 발행/기록"""
+        from openpyxl import load_workbook
+        from receipt_core.ledger import open_ledger
+        from receipt_core.stream import stream_receipts
+
+        data_path = os.path.join(work_dir, "2025_income_summary.xlsx")
+        workbook = load_workbook(SAMPLE_DATA)
+        sheet = workbook.worksheets[0]
+        header = [cell.value for cell in sheet[1]]
+        sheet.cell(row=5, column=header.index("3월") + 1, value="삼만원")
+        bad_name = sheet.cell(row=5, column=header.index("이름") + 1).value
+        workbook.save(data_path)
+        ledger_path = os.path.join(work_dir, "발행대장_2026.xlsx")
+
+        events = list(stream_receipts(data_path, SAMPLE_TEMPLATE, os.path.join(work_dir, "receipts"),
+                                      ledger_path, 26, batch_size=4))
+
+        failed = [event for event in events if event["error"]]
+        assert [event["name"] for event in failed] == [name.strip() for name in bad_name.split(",")]
+        assert all(event["error"] == "행 5: '3월' 컬럼에 숫자가 아닌 값" for event in failed)
+        with open_ledger(ledger_path) as ledger:
+            assert ledger.count() == len(events) - len(failed) > 0
+
+    @pytest.mark.skipif(not os.path.exists(SAMPLE_TEMPLATE), reason="템플릿 파일이 없습니다")
+    def test_ledger_flushed_when_stream_fails(self, work_dir, monkeypatch):
+        """읽기가 중간에 실패해도 이미 만든 영수증은 발행대장에 기록"""
+        from receipt_core import stream
+        from receipt_core.ledger import open_ledger
+
+        data_path = os.path.join(work_dir, "2025_income_summary.xlsx")
+        shutil.copy(SAMPLE_DATA, data_path)
+        ledger_path = os.path.join(work_dir, "발행대장_2026.xlsx")
+        stream.receipt_numbers(data_path, 26)  # 발급번호 색인은 미리 저장
+
+        iter_rows = stream._iter_rows
+
+        def failing_rows(path):
+            for row_no, row in enumerate(iter_rows(path)):
+                if row_no == 6:
+                    raise OSError("읽기 실패")
+                yield row
+
+        monkeypatch.setattr(stream, "_iter_rows", failing_rows)
+        events = []
+        with pytest.raises(OSError):
+            for event in stream.stream_receipts(data_path, SAMPLE_TEMPLATE, os.path.join(work_dir, "receipts"),
+                                                ledger_path, 26, batch_size=4):
+                events.append(event)
+
+        rendered = os.listdir(os.path.join(work_dir, "receipts"))
+        assert len(events) == 4
+        with open_ledger(ledger_path) as ledger:
+            assert ledger.count() == 6 == len(rendered)
+
+
+class TestExcelReader:
+    """Excel 읽기 백엔드 테스트"""
+
+    @pytest.mark.skipif(not os.path.exists(SAMPLE_DATA), reason="샘플 데이터가 없습니다")
+    def test_openpyxl_matches_read_excel(self):
+        """필요한 컬럼만 pd.read_excel과 같은 값으로 읽음"""
+        import pandas as pd
+        from receipt_core.dataset import REQUIRED_COLUMNS
+        from receipt_core.reader import read_income_summary
+
+        expected = pd.read_excel(SAMPLE_DATA)[REQUIRED_COLUMNS]
+        actual = read_income_summary(SAMPLE_DATA, REQUIRED_COLUMNS, reader="openpyxl")
+
+        pd.testing.assert_frame_equal(actual, expected)
+
+    @pytest.mark.skipif(not os.path.exists(SAMPLE_DATA), reason="샘플 데이터가 없습니다")
+    def test_openpyxl_ignores_wrong_dimension(self, work_dir):
+        """시트 범위가 실제보다 작게 적혀 있어도 모든 행을 읽음"""
+        import pandas as pd
+        from receipt_core.dataset import REQUIRED_COLUMNS
+        from receipt_core.reader import read_income_summary
+
+        path = os.path.join(work_dir, "data.xlsx")
+        write_wrong_dimension(path)
+
+        expected = pd.read_excel(SAMPLE_DATA)[REQUIRED_COLUMNS]
+        actual = read_income_summary(path, REQUIRED_COLUMNS, reader="openpyxl")
+
+        pd.testing.assert_frame_equal(actual, expected)
+
+    def test_missing_and_extra_columns(self, work_dir):
+        """없는 컬럼은 빠지고, 필요 없는 컬럼은 읽지 않음"""
+        import pandas as pd
+        from receipt_core.reader import read_income_summary
+
+        path = os.path.join(work_dir, "data.xlsx")
+        pd.DataFrame({"비고": ["a", "b"], "이름": ["홍길동", "김영희"], "1월": [100, None]}).to_excel(
+            path, index=False)
+
+        df = read_income_summary(path, ["이름", "1월", "2월"], reader="openpyxl")
+
+        assert list(df.columns) == ["이름", "1월"]
+        assert df["이름"].tolist() == ["홍길동", "김영희"]
+        assert pd.isna(df["1월"].iloc[1])
+
+    def test_unknown_reader(self, monkeypatch):
+        """알 수 없는 백엔드 이름은 오류"""
+        from receipt_core.reader import resolve_reader, READER_ENV
+
+        monkeypatch.setenv(READER_ENV, "xlrd")
+        with pytest.raises(ValueError):
+            resolve_reader()
+
+
+@pytest.mark.skipif(not os.path.exists(SAMPLE_DATA), reason="샘플 데이터가 없습니다")
+class TestColumnarCache:
+    """열 단위 캐시 테스트"""
+
+    @pytest.fixture
+    def data_file(self, work_dir):
+        path = os.path.join(work_dir, "2025_income_summary.xlsx")
+        shutil.copy(SAMPLE_DATA, path)
+        return path
+
+    def test_second_load_uses_cache(self, data_file):
+        """두 번째 로드는 xlsx를 읽지 않고 같은 표를 반환"""
+        import pandas as pd
+        from receipt_core.dataset import DonorDataset
+
+        first = DonorDataset.load(data_file)
+        expected = first.df
+        second = DonorDataset.load(data_file)
+
+        assert first.raw is not None
+        assert second.raw is None
+        pd.testing.assert_frame_equal(second.df, expected)
+
+    def test_stale_cache_replaced(self, data_file):
+        """데이터가 바뀌면 새 캐시를 만들고 이전 캐시는 삭제"""
+        import glob
+        import pandas as pd
+        from receipt_core.dataset import DonorDataset
+
+        def caches():
+            return glob.glob(os.path.join(os.path.dirname(data_file), ".receipt_cache", "*.donors.npy"))
+
+        DonorDataset.load(data_file).df
+        old_caches = caches()
+
+        raw = pd.read_excel(data_file)
+        raw.loc[0, "연간 총합"] = raw.loc[0, "연간 총합"] + 1
+        raw.to_excel(data_file, index=False)
+
+        reloaded = DonorDataset.load(data_file)
+        assert reloaded.raw is not None
+        reloaded.df
+        new_caches = caches()
+
+        assert len(old_caches) == 1 and len(new_caches) == 1
+        assert old_caches != new_caches
+
+
+    def test_cache_version_in_key(self, data_file, monkeypatch):
+        """캐시 버전이 바뀌면 이전 캐시를 쓰지 않고 새로 만듦"""
+        import receipt_core.columnar as columnar
+        from receipt_core.dataset import DonorDataset
+
+        DonorDataset.load(data_file).df
+        monkeypatch.setattr(columnar, "CACHE_VERSION", columnar.CACHE_VERSION + 1)
+
+        reloaded = DonorDataset.load(data_file)
+        assert reloaded.raw is not None
+        reloaded.df
+        cache_path = columnar.cache_path_for(data_file, reloaded.sha256)
+        meta_path = columnar.meta_path_for(data_file, reloaded.sha256)
+        assert sorted(os.listdir(os.path.dirname(cache_path))) == sorted(
+            [os.path.basename(cache_path), os.path.basename(meta_path)])
+        assert sorted(os.listdir(os.path.dirname(data_file))) == [".receipt_cache", os.path.basename(data_file)]
+
+    def test_amount_warnings_kept_on_cache_hit(self, data_file, capsys):
+        """캐시에서 읽어도 원본 표의 금액 경고가 그대로 출력됨"""
+        import pandas as pd
+        import generate_receipts
+
+        # 텍스트로 저장된 숫자는 정규화 후에는 정수가 되므로 원본 표에서만 경고할 수 있음
+        raw = pd.read_excel(data_file)
+        raw["1월"] = raw["1월"].astype(object)
+        raw.loc[0, "1월"] = "1000"
+        raw.to_excel(data_file, index=False)
+
+        outputs = []
+        for _ in range(2):
+            dataset = generate_receipts.validate_data_file(data_file)
+            dataset.df
+            outputs.append((dataset.raw is None, capsys.readouterr().out))
+
+        assert outputs[0][0] is False and outputs[1][0] is True
+        for _, out in outputs:
+            assert "'1월' 컬럼에 숫자가 아닌 값이 있습니다" in out
+
+
+class TestDonorTable:
+    """배열 기반 대상자 표 테스트"""
+
+    def test_format_amounts(self):
+        """format_amount와 같은 규칙으로 한 번에 포맷"""
+        from receipt_core.table import format_amounts
+
+        values = [[0, 1000, 1234567], [1000, -500, 0]]
+        assert format_amounts(values).tolist() == [["", "1,000", "1,234,567"], ["1,000", "-500", ""]]
+
+    @pytest.mark.skipif(not os.path.exists(SAMPLE_DATA), reason="샘플 데이터가 없습니다")
+    def test_context_matches_build_context(self):
+        """행 단위 build_context와 같은 값"""
+        from receipt_core.dataset import load_data, MONTH_COLUMNS
+        from receipt_core.table import DonorTable
+        from receipt_core.template import build_context
+
+        df = load_data(SAMPLE_DATA)
+        table = DonorTable.from_frame(df)
+
+        for position, row in df.iterrows():
+            expected = build_context(row["이름"], {col: row[col] for col in MONTH_COLUMNS},
+                                     row["연간 총합"], "26-001")
+            assert table.context(position, "26-001") == expected
+
+    def test_find_first_duplicate(self):
+        """동명이인은 첫 번째 행"""
+        from receipt_core.table import DonorTable
+
+        table = DonorTable(["가", "나", "나"], [[0] * 12] * 3, [1, 2, 3])
+
+        assert table.find("나") == 1
+        assert table.find("없음") is None
+        assert table.monthly_amounts(0)["1월"] == 0
+
+
+class TestDataValidation:
+    """컬럼 단위 데이터 검증 규칙 테스트"""
+
+    def make_raw(self):
+        import pandas as pd
+        from receipt_core.dataset import MONTH_COLUMNS
+
+        data = {"이름": ["가", "나, 다", "다", "라", "합계"]}
+        for col in MONTH_COLUMNS:
+            data[col] = [1000, 1000, None, 1000, 3000]
+        data["1월"] = [1000, "천원", None, -500, 1500]
+        data["연간 총합"] = [12000, 11000, None, 10000, 34500]
+        return pd.DataFrame(data)
+
+    def test_row_warnings(self):
+        """행 번호(헤더 포함)와 기존 메시지 형식 유지"""
+        from receipt_core.validation import data_warnings
+
+        assert data_warnings(self.make_raw()) == [
+            "행 3: '1월' 컬럼에 숫자가 아닌 값",
+            "행 5: '1월' 컬럼에 음수 값",
+            "행 5: 월별 합계(10500)와 연간 총합(10000)이 다름",
+            "중복된 이름 1건 (상세 내용은 파일에서 확인)",
+        ]
+
+    def test_amount_flags_numeric_column(self):
+        """숫자 컬럼은 빈 칸을 경고하지 않음"""
+        import pandas as pd
+        from receipt_core.validation import amount_flags
+
+        df = pd.DataFrame({"1월": [1000.0, None, -1.0]})
+        non_numeric, negative = amount_flags(df)["1월"]
+
+        assert non_numeric.tolist() == [False, False, False]
+        assert negative.tolist() == [False, False, True]
+
+
+@pytest.mark.skipif(not os.path.exists(SAMPLE_DATA), reason="샘플 데이터 파일이 없습니다")
+class TestCliDataFile:
+    """CLI 데이터 파일 검사 결과(DonorDataset) 재사용 테스트"""
+
+    @pytest.fixture
+    def data_file(self, work_dir):
+        path = os.path.join(work_dir, "2025_income_summary.xlsx")
+        shutil.copy(SAMPLE_DATA, path)
+        return path
+
+    def test_returns_dataset_for_valid_data(self, data_file):
+        """통과하면 파싱된 DonorDataset 반환"""
+        from generate_receipts import validate_data_file
+        from receipt_core.dataset import DonorDataset
+
+        dataset = validate_data_file(data_file)
+
+        assert isinstance(dataset, DonorDataset)
+        assert dataset.file_path == data_file
+        assert len(dataset.df) > 0
+
+    def test_returns_none_for_invalid_data(self, work_dir):
+        """파일이 없거나 필수 컬럼이 없으면 None"""
+        import pandas as pd
+        from generate_receipts import validate_data_file
+
+        missing_columns = os.path.join(work_dir, "2025_income_summary.xlsx")
+        pd.DataFrame({"이름": ["홍길동"], "1월": [1000]}).to_excel(missing_columns, index=False)
+
+        assert validate_data_file(os.path.join(work_dir, "없는파일.xlsx")) is None
+        assert validate_data_file(missing_columns) is None
+
+    def test_main_reads_file_once(self, data_file, work_dir, monkeypatch, capsys):
+        """검사에서 읽은 데이터를 목록 출력에 그대로 사용 (xlsx를 다시 읽지 않음)"""
+        import generate_receipts
+        from receipt_core import dataset as dataset_module
+
+        reads, loads = [], []
+        read_income_summary = dataset_module.read_income_summary
+        load = dataset_module.DonorDataset.load.__func__
+
+        def counting_read(*args, **kwargs):
+            reads.append(args[0])
+            return read_income_summary(*args, **kwargs)
+
+        def counting_load(cls, file_path):
+            loads.append(file_path)
+            return load(cls, file_path)
+
+        monkeypatch.setattr(dataset_module, "read_income_summary", counting_read)
+        monkeypatch.setattr(dataset_module.DonorDataset, "load", classmethod(counting_load))
+        monkeypatch.chdir(work_dir)
+        monkeypatch.setattr(sys, "argv", ["generate_receipts.py", "--data", data_file, "--list"])
+
+        generate_receipts.main()
+
+        assert loads == [data_file]
+        assert reads == [data_file]
+        assert "홍길동" in capsys.readouterr().out
+
+
+def rewrite_template(target_path, replacements):
+    """샘플 템플릿의 document.xml 일부를 바꿔 저장"""
+    with zipfile.ZipFile(SAMPLE_TEMPLATE) as src, zipfile.ZipFile(target_path, "w") as dst:
+        for info in src.infolist():
+            data = src.read(info.filename)
+            if info.filename == "word/document.xml":
+                xml = data.decode("utf-8")
+                for old, new in replacements.items():
+                    xml = xml.replace(old, new)
+                data = xml.encode("utf-8")
+            dst.writestr(info, data)
+
+
+@pytest.mark.skipif(not os.path.exists(SAMPLE_TEMPLATE), reason="템플릿 파일이 없습니다")
+class TestPlaceholderAnalysis:
+    """템플릿 placeholder 정적 분석 테스트"""
+
+    # Word가 중괄호와 변수 이름을 여러 런으로 나눈 경우
+    SPLIT_TOTAL = "{</w:t></w:r><w:r><w:t>{ total </w:t></w:r><w:r><w:t>}}"
+
+    def test_sample_template_complete(self):
+        from receipt_core.template import analyze_placeholders, RECEIPT_FIELDS
+
+        analysis = analyze_placeholders(SAMPLE_TEMPLATE)
+
+        assert analysis["missing"] == [] and analysis["extra"] == []
+        assert sorted(analysis["variables"]) == sorted(RECEIPT_FIELDS)
+
+    def test_missing_extra_and_split_runs(self, work_dir):
+        """나뉜 런의 변수도 찾고, 누락/추가 변수를 정확히 보고"""
+        from receipt_core.template import analyze_placeholders
+
+        template_path = os.path.join(work_dir, "template.docx")
+        rewrite_template(template_path, {"{{total}}": self.SPLIT_TOTAL, "{{month_12}}": "{{memo}}"})
+
+        analysis = analyze_placeholders(template_path)
+
+        assert analysis["missing"] == ["month_12"]
+        assert analysis["extra"] == ["memo"]
+        assert "total" in analysis["variables"]
+
+        # 컴파일된 템플릿도 나뉜 런의 변수를 치환
+        output_path = os.path.join(work_dir, "out.docx")
+        get_compiled_template(template_path).save(make_context(), output_path)
+        assert "1,200,000" in "".join(document_text(output_path))
+
+    def test_cached_by_content_hash(self, work_dir, monkeypatch):
+        """같은 내용의 템플릿은 다시 분석하지 않음"""
+        from receipt_core import template as template_module
+
+        clear_template_cache()
+        copy_path = os.path.join(work_dir, "copy.docx")
+        shutil.copy(SAMPLE_TEMPLATE, copy_path)
+        first = template_module.analyze_placeholders(SAMPLE_TEMPLATE)
+
+        def fail(path):
+            raise AssertionError("다시 분석함")
+
+        monkeypatch.setattr(template_module, "template_variables", fail)
+        assert template_module.analyze_placeholders(copy_path) == first
+
+
+class TestZipCopy:
+    """압축 항목 복사 zip 쓰기 테스트"""
+
+    def test_roundtrip_stored_and_unicode_names(self, work_dir):
+        """저장 방식/한글 이름 항목도 zipfile로 그대로 읽힘"""
+        from receipt_core.zipcopy import read_raw_entries, compress_entry, write_zip
+
+        source = os.path.join(work_dir, "source.zip")
+        with zipfile.ZipFile(source, "w") as zf:
+            zf.writestr("a.xml", "<a>{{ name }}</a>" * 100, compress_type=zipfile.ZIP_DEFLATED)
+            zf.writestr("media/도장.png", b"\x89PNG" + bytes(range(256)) * 10, compress_type=zipfile.ZIP_STORED)
+
+        entries = read_raw_entries(source)
+        entries[0] = compress_entry(entries[0][0], "<a>홍길동</a>".encode("utf-8"))
+        target = os.path.join(work_dir, "target.zip")
+        write_zip(target, entries)
+
+        with zipfile.ZipFile(target) as zf, zipfile.ZipFile(source) as src:
+            assert zf.testzip() is None
+            assert zf.namelist() == src.namelist()
+            assert zf.read("a.xml").decode("utf-8") == "<a>홍길동</a>"
+            assert zf.read("media/도장.png") == src.read("media/도장.png")
+            assert zf.getinfo("media/도장.png").compress_type == zipfile.ZIP_STORED
+
+    @pytest.mark.skipif(not os.path.exists(SAMPLE_TEMPLATE), reason="템플릿 파일이 없습니다")
+    def test_unchanged_parts_copied_verbatim(self, work_dir):
+        """치환되지 않은 파트는 압축된 바이트까지 템플릿과 같음"""
+        from receipt_core.zipcopy import read_raw_entries
+
+        output_path = os.path.join(work_dir, "out.docx")
+        get_compiled_template(SAMPLE_TEMPLATE).save(make_context(), output_path)
+
+        template_entries = dict((info.filename, raw) for info, raw in read_raw_entries(SAMPLE_TEMPLATE))
+        for info, raw in read_raw_entries(output_path):
+            if info.filename == "word/document.xml":
+                assert raw != template_entries[info.filename]
+            else:
+                assert raw == template_entries[info.filename]
+
+
+# 다른 프로세스에서 발행대장에 기록하고 내보내기 (동시 실행 테스트용)
+LEDGER_WRITER = """
+import sys
+from receipt_core.ledger import open_ledger
+xlsx_path, worker = sys.argv[1], sys.argv[2]
+for i in range(15):
+    with open_ledger(xlsx_path) as ledger:
+        ledger.append(f"26-{worker}{i:02d}", f"교인{worker}{i:02d}", 1000, "")
+        ledger.export_xlsx()
+"""
+
+
+class TestLocking:
+    """데이터 폴더 잠금과 원자적 쓰기 테스트"""
+
+    def test_atomic_write_keeps_old_file_on_error(self, work_dir):
+        """쓰다가 실패하면 기존 파일 유지, 임시 파일 삭제"""
+        from receipt_core.locking import atomic_write
+
+        path = os.path.join(work_dir, "out.docx")
+        with atomic_write(path) as f:
+            f.write(b"old")
+        with pytest.raises(ValueError):
+            with atomic_write(path) as f:
+                f.write(b"partial")
+                raise ValueError("중단")
+
+        with open(path, "rb") as f:
+            assert f.read() == b"old"
+        assert os.listdir(work_dir) == ["out.docx"]
+
+    def test_write_lock_reentrant_and_exclusive(self, work_dir):
+        """같은 스레드는 다시 잡을 수 있고, 다른 스레드는 기다림"""
+        import threading
+        from receipt_core.locking import directory_lock
+
+        lock = directory_lock(work_dir)
+        order = []
+
+        def other():
+            with lock.read():
+                order.append("reader")
+
+        with lock.write():
+            with lock.write(), lock.read():
+                thread = threading.Thread(target=other)
+                thread.start()
+                thread.join(0.2)
+                order.append("writer")
+        thread.join()
+
+        assert order == ["writer", "reader"]
+        with lock.read():
+            with pytest.raises(RuntimeError):
+                with lock.write():
+                    pass
+
+    def test_concurrent_processes_keep_all_ledger_rows(self, work_dir):
+        """여러 프로세스가 동시에 기록/내보내기해도 기록이 사라지지 않음"""
+        import subprocess
+        import pandas as pd
+        from receipt_core.ledger import open_ledger
+
+        xlsx_path = os.path.join(work_dir, "발행대장_2026.xlsx")
+        processes = [
+            subprocess.Popen([sys.executable, "-c", LEDGER_WRITER, xlsx_path, str(worker)], cwd=PROJECT_DIR)
+            for worker in range(4)
+        ]
+        assert all(process.wait(timeout=120) == 0 for process in processes)
+
+        with open_ledger(xlsx_path) as ledger:
+            assert ledger.count() == 60
+            ledger.export_xlsx()
+        assert len(pd.read_excel(xlsx_path)) == 60
+
+    def test_manifest_saves_merge(self, work_dir):
+        """두 실행이 같은 매니페스트에 저장하면 양쪽 기록이 모두 남음"""
+        from receipt_core.manifest import RenderManifest
+
+        output_dir = os.path.join(work_dir, "receipts")
+        os.makedirs(output_dir)
+        first = RenderManifest(output_dir)
+        second = RenderManifest(output_dir)
+        first.record(os.path.join(output_dir, "a.docx"), "r1", "t", "26-001")
+        second.record(os.path.join(output_dir, "b.docx"), "r2", "t", "26-002")
+        first.save()
+        second.save()
+
+        assert set(RenderManifest(output_dir).entries) == {"a.docx", "b.docx"}